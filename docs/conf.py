@@ -17,7 +17,7 @@ from json import load
 from os import environ
 from pathlib import Path
 from shutil import copyfile
-from typing import Any, Dict, List, Optional, Tuple, Union, Set, Type
+from typing import Any, Dict, List, Optional, Tuple, Union, Sequence
 
 from tomli import load as load_toml
 
@@ -77,12 +77,10 @@ subprocess.run(
 
 from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler  # noqa
 
-transpilers: Set[Type[CircuitTranspiler]] = set()
-for f in CircuitTranspiler.get_known_formats():
-    transpilers.update(type(t) for t in CircuitTranspiler.get_transpilers(f))
+transpilers: Sequence[CircuitTranspiler] = CircuitTranspiler.get_all_transpilers()
 
 
-def get_edge_attrs(transpiler: Type[CircuitTranspiler]) -> str:
+def get_edge_attrs(transpiler: CircuitTranspiler) -> str:
     if transpiler.unsafe:
         return f'[label="{transpiler.cost}; unsafe", style="dashed", color="#555555", fontcolor="#555555"]'
     else:
@@ -37,6 +37,7 @@ __all__ = [
     "JobExecutePythonFileDto",
     "JobExecutionDtoSchema",
     "JobFilterParamsSchema",
+    "JobResultFilterParamsSchema",
     "QueuedJobsDtoSchema",
     "JobCommandSchema",
 ]
@@ -46,6 +47,7 @@ from ...static.enums.error_mitigation import ErrorMitigationMethod
 from ...static.enums.job_state import JobState
 from ...static.enums.job_type import JobType
 from ...static.enums.provider_name import ProviderName
+from ...static.enums.result_type import ResultType
 
 
 @dataclass
@@ -167,6 +169,36 @@ class JobFilterParamsSchema(MaBaseSchema):
     )
 
 
+class JobResultFilterParamsSchema(MaBaseSchema):
+    program = ma.fields.Integer(
+        required=False, missing=None, load_only=True, description="Only results of this program."
+    )
+    result_type = ma.fields.String(
+        data_key="result-type",
+        required=False,
+        missing=None,
+        load_only=True,
+        validate=OneOf([t.value for t in ResultType]),
+        description="Only results of this type.",
+    )
+    cursor = ma.fields.Integer(
+        required=False,
+        missing=None,
+        load_only=True,
+        description="Only results after the result with this id (the cursor of the next page is in the Link header).",
+        metadata={"example": None},
+    )
+    item_count = ma.fields.Integer(
+        data_key="item-count",
+        required=False,
+        missing=None,
+        load_only=True,
+        validate=Range(min=1, max=1000, min_inclusive=True, max_inclusive=True),
+        description="The number of results per page (can be set between 1 and 1000, defaults to all results).",
+        metadata={"example": 100},
+    )
+
+
 class TokenSchema(MaBaseSchema):
     token = ma.fields.String(required=True, metadata={"example": ""})
 
@@ -0,0 +1,57 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module containing all Dtos and their Schemas for the Transpiler API."""
+from dataclasses import dataclass
+from typing import Optional
+
+import marshmallow as ma
+
+from ..flask_api_utils import MaBaseSchema
+
+__all__ = ["TranspilerCostDto", "TranspilerCostDtoSchema"]
+
+
+@dataclass
+class TranspilerCostDto:
+    transpiler: str
+    source: str
+    target: str
+    cost: int
+    unsafe: bool
+    measured_cost: Optional[float]
+    samples: int
+
+
+class TranspilerCostDtoSchema(MaBaseSchema):
+    transpiler = ma.fields.String(
+        required=True, allow_none=False, metadata={"description": "The qualified name of the transpiler."}
+    )
+    source = ma.fields.String(required=True, allow_none=False)
+    target = ma.fields.String(required=True, allow_none=False)
+    cost = ma.fields.Integer(
+        required=True, allow_none=False, metadata={"description": "The static cost declared by the transpiler."}
+    )
+    unsafe = ma.fields.Boolean(required=True, allow_none=False)
+    measured_cost = ma.fields.Float(
+        required=True,
+        allow_none=True,
+        metadata={
+            "description": "The moving average of the measured transpilation time in seconds per line "
+            "(or instruction) of the source circuit. Null if the transpiler was not measured yet."
+        },
+    )
+    samples = ma.fields.Integer(
+        required=True, allow_none=False, metadata={"description": "The number of measured transpilations."}
+    )
@@ -15,8 +15,9 @@
 
 """Module containing the routes of the job manager API."""
 from http import HTTPStatus
-from typing import Optional
+from typing import Iterator, Optional
 
+from flask import Response, stream_with_context, url_for
 from flask.globals import current_app
 from flask.views import MethodView
 
@@ -29,6 +30,7 @@ from ..api_models.job_dtos import (
     JobResponseDto,
     JobResponseDtoSchema,
     JobFilterParamsSchema,
+    JobResultFilterParamsSchema,
     QueuedJobsDtoSchema,
     SimpleJobDto,
     SimpleJobDtoSchema,
@@ -147,13 +149,46 @@ class JobDetailView(MethodView):
 class JobResultsView(MethodView):
     """Results endpoint of a single job."""
 
+    @JOBMANAGER_API.arguments(JobResultFilterParamsSchema(), location="query", as_kwargs=True)
     @JOBMANAGER_API.response(HTTPStatus.OK, ResultDtoSchema(many=True))
     @JOBMANAGER_API.require_jwt(optional=True)
-    def get(self, job_id: int, jwt_subject: Optional[str]):
-        """Get the results of a job."""
+    def get(
+        self,
+        job_id: int,
+        jwt_subject: Optional[str],
+        program: Optional[int] = None,
+        result_type: Optional[str] = None,
+        cursor: Optional[int] = None,
+        item_count: Optional[int] = None,
+    ):
+        """Get the results of a job ordered by their id.
+
+        The results are streamed. If `item-count` is set, the `Link` header contains the url of the next page.
+        """
         current_app.logger.info(f"Request: get results list of job with id: {job_id}")
-        job_response_dto: JobResponseDto = job_service.get_job_by_id(job_id, user_id=jwt_subject)
-        return job_response_dto.results
+        results, next_cursor = job_service.get_job_results(
+            job_id,
+            user_id=jwt_subject,
+            program_id=program,
+            result_type=result_type,
+            cursor=cursor,
+            item_count=item_count,
+        )
+        schema = ResultDtoSchema()
+
+        def generate_json() -> Iterator[str]:
+            yield "["
+            for index, result in enumerate(results):
+                yield ("," if index else "") + current_app.json.dumps(schema.dump(result))
+            yield "]"
+
+        response = Response(stream_with_context(generate_json()), mimetype="application/json")
+        if next_cursor is not None:
+            query = {"program": program, "result-type": result_type, "cursor": next_cursor, "item-count": item_count}
+            query = {key: value for key, value in query.items() if value is not None}
+            next_url = url_for("job-api.JobResultsView", job_id=job_id, **query)
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return response
 
 
 @JOBMANAGER_API.route("/<int:job_id>/results/<int:result_id>/")
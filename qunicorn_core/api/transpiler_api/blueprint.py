@@ -0,0 +1,25 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Module containing the root endpoint of the TRANSPILER API."""
+
+from ..flask_api_utils import SecurityBlueprint as SmorestBlueprint
+
+TRANSPILER_API = SmorestBlueprint(
+    "transpiler-api",
+    "TRANSPILER API",
+    description="Transpiler API to inspect the registered transpilers and their costs.",
+    url_prefix="/transpilers/",
+)
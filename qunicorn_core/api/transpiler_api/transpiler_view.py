@@ -0,0 +1,36 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Module containing the routes of the Transpiler API."""
+from http import HTTPStatus
+
+from flask.globals import current_app
+from flask.views import MethodView
+
+from .blueprint import TRANSPILER_API
+from ..api_models.transpiler_dtos import TranspilerCostDtoSchema
+from ...core import transpiler_costs
+
+
+@TRANSPILER_API.route("/costs/")
+class TranspilerCostView(MethodView):
+    """Endpoint listing the static and the measured costs used to choose transpiler chains."""
+
+    @TRANSPILER_API.response(HTTPStatus.OK, TranspilerCostDtoSchema(many=True))
+    @TRANSPILER_API.require_jwt(optional=True)
+    def get(self):
+        """Get the costs of all registered transpilers (measured costs are shared by all workers)."""
+        current_app.logger.info("Request: get the costs of all transpilers")
+        return transpiler_costs.get_transpiler_costs()
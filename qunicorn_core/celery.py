@@ -34,8 +34,18 @@ CELERY = Celery(
 
 def register_celery(app: Flask):
     """Load the celery config from the app instance."""
+    beat_schedule = {}
+
+    result_poll_interval = app.config.get("RESULT_POLL_INTERVAL", 0)
+    if result_poll_interval:
+        beat_schedule["poll-running-jobs"] = {
+            "task": "qunicorn_core.core.job_manager_service.poll_running_jobs",
+            "schedule": result_poll_interval,
+            "options": {"expires": result_poll_interval},  # skip polls that could not start in time
+        }
+
     CELERY.conf.update(
         app.config.get("CELERY", {}),
-        beat_schedule={},
+        beat_schedule=beat_schedule,
     )
     CELERY.flask_app = app
@@ -13,9 +13,34 @@
 # limitations under the License.
 
 """Module preparing the celery instance to be started as a worker. DO NOT IMPORT NORMALLY!"""
+from celery.signals import worker_init, worker_process_init
+from flask import current_app
+
 from . import create_app
 
 from .celery import CELERY  # noqa
+from .core.transpiler.sandbox import get_sandbox, is_sandbox_enabled
 
 # create an app instance to load the celery config from the flask app
 create_app()
+
+
+def _start_transpiler_sandbox():
+    """Pre-warm the sandbox for unsafe transpilers so that the first job does not pay the startup cost."""
+    with CELERY.flask_app.app_context():
+        if not current_app.config.get("EXCLUDE_UNSAFE_TRANSPILERS", True) and is_sandbox_enabled():
+            get_sandbox().start()
+
+
+@worker_init.connect
+def _start_transpiler_sandbox_in_worker(sender, **kwargs):
+    # prefork pools fork their child processes after this signal, they start the sandbox themselves
+    pool = sender.pool_cls
+    pool_name = pool if isinstance(pool, str) else pool.__module__
+    if pool_name.rsplit(".", 1)[-1] not in ("prefork", "processes"):
+        _start_transpiler_sandbox()
+
+
+@worker_process_init.connect
+def _start_transpiler_sandbox_in_child_process(**kwargs):
+    _start_transpiler_sandbox()
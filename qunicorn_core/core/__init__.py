@@ -20,5 +20,6 @@ from . import (
     mapper,
     pilotmanager,
     provider_service,
+    translation_cache,
     transpiler,
 )
@@ -17,11 +17,11 @@ from urllib.parse import urljoin
 from typing import Optional, List, Dict, Sequence, Tuple
 
 from flask.globals import current_app
-from requests import post
 
 from qunicorn_core.static.enums.result_type import ResultType
 from qunicorn_core.static.qunicorn_exception import QunicornError
 from qunicorn_core.util import utils
+from qunicorn_core.util.http_client import get_http_client
 
 
 def cut_circuit(cutting_params: dict, circuit_cutting_service: Optional[str] = None) -> dict:
@@ -30,7 +30,9 @@ def cut_circuit(cutting_params: dict, circuit_cutting_service: Optional[str] = N
     if circuit_cutting_service is None:
         raise ValueError("URL for circuit cutting service must not be None!")
 
-    cut_result = post(urljoin(circuit_cutting_service, "/cutCircuits"), json=cutting_params, timeout=300)
+    cut_result = get_http_client().post(
+        urljoin(circuit_cutting_service, "/cutCircuits"), json=cutting_params, timeout=300
+    )
     cut_result.raise_for_status()
     return cut_result.json()
 
@@ -119,7 +121,9 @@ def combine_results(
         # "unnormalized_results": "True",
         # "shot_scaling_factor": 100,
     }
-    combined_result = post(urljoin(circuit_cutting_service, "/combineResults"), json=data)
+    combined_result = get_http_client().post(
+        urljoin(circuit_cutting_service, "/combineResults"), json=data, timeout=300
+    )
     combined_result.raise_for_status()
     return combined_result.json()["result"]
 
@@ -0,0 +1,96 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache for circuits transpiled for a specific backend (ISA circuits) shared by all jobs."""
+
+from hashlib import sha256
+from io import BytesIO
+from typing import Optional, Sequence
+
+import qiskit
+from flask.globals import current_app
+from qiskit import QuantumCircuit, qpy, transpile
+from qiskit.providers import BackendV2
+from sqlalchemy.exc import IntegrityError
+
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.isa_circuit_cache import CachedISACircuitDataclass
+
+
+def _dump_qpy(circuit: QuantumCircuit) -> bytes:
+    buffer = BytesIO()
+    qpy.dump(circuit, buffer)
+    return buffer.getvalue()
+
+
+def _load_qpy(circuit: bytes) -> QuantumCircuit:
+    programs = qpy.load(BytesIO(circuit))
+    assert len(programs) == 1 and isinstance(programs[0], QuantumCircuit)
+    return programs[0]
+
+
+def get_backend_version(backend: BackendV2) -> str:
+    """Get a version string that changes when the backend is updated or recalibrated."""
+    version = [qiskit.__version__, str(getattr(backend, "backend_version", ""))]
+    properties = getattr(backend, "properties", None)
+    if callable(properties):
+        try:
+            calibration = properties()
+        except Exception:
+            calibration = None  # calibration data is not available for all backends
+        if calibration is not None:
+            version.append(str(getattr(calibration, "last_update_date", "")))
+    return "\n".join(version)
+
+
+def get_isa_circuit_key(circuit: QuantumCircuit, backend: BackendV2, optimization_level: Optional[int]) -> str:
+    """Get the cache key of the ISA circuit of a circuit for a specific backend and optimization level."""
+    # the generated names of circuits differ between otherwise identical circuits
+    circuit_hash = sha256(_dump_qpy(circuit.copy(name="circuit"))).hexdigest()
+    return sha256(
+        "\n".join((circuit_hash, backend.name, get_backend_version(backend), str(optimization_level))).encode()
+    ).hexdigest()
+
+
+def get_isa_circuits(circuits: Sequence[QuantumCircuit], backend: BackendV2) -> list[QuantumCircuit]:
+    """Transpile the circuits for the backend, reusing ISA circuits transpiled for earlier jobs.
+
+    New ISA circuits are added to the current database session, but the session is not committed.
+    """
+    config = current_app.config
+    optimization_level: Optional[int] = config.get("IBM_TRANSPILER_OPTIMIZATION_LEVEL", None)
+    if not config.get("ISA_CIRCUIT_CACHE", True):
+        return transpile(list(circuits), backend, optimization_level=optimization_level)
+
+    keys = [get_isa_circuit_key(circuit, backend, optimization_level) for circuit in circuits]
+    cached = {c.cache_key: c.quantum_circuit for c in CachedISACircuitDataclass.get_by_cache_keys(list(set(keys)))}
+
+    # transpile every missing circuit only once, even if it is part of the batch multiple times
+    missing = {key: circuit for key, circuit in zip(keys, circuits) if key not in cached}
+    if missing:
+        transpiled = transpile(list(missing.values()), backend, optimization_level=optimization_level)
+        for key, isa_circuit in zip(missing.keys(), transpiled):
+            cached[key] = _dump_qpy(isa_circuit)
+            try:
+                with DB.session.begin_nested():
+                    CachedISACircuitDataclass(cache_key=key, backend=backend.name, quantum_circuit=cached[key]).save()
+            except IntegrityError:
+                pass  # another worker cached the same circuit concurrently
+
+    isa_circuits = []
+    for key, circuit in zip(keys, circuits):
+        isa_circuit = _load_qpy(cached[key])
+        isa_circuit.name = circuit.name
+        isa_circuits.append(isa_circuit)
+    return isa_circuits
@@ -12,18 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from functools import partial
+from itertools import groupby
 from math import ceil
-from typing import Any, List, Optional, Sequence, Tuple, Dict
+from multiprocessing import get_all_start_methods, get_context
+from threading import Lock
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Dict, cast
 
-from flask import current_app
+from celery.result import AsyncResult
+from celery.utils import uuid
+from flask import Flask, current_app
 
 from qunicorn_core.celery import CELERY
 from qunicorn_core.core.circuit_cutting_service import cut_circuit
 from qunicorn_core.core.mapper import result_mapper
 from qunicorn_core.core.pilotmanager import pilot_manager
-from qunicorn_core.core.pilotmanager.base_pilot import Pilot, PilotJob
-from qunicorn_core.core.transpiler import transpile_circuit, TranspilationError
+from qunicorn_core.core.pilotmanager.base_pilot import Pilot, PilotJob, PilotResultsPending
+from qunicorn_core.core.result_cache import cache_job_results, is_result_cache_enabled, reuse_cached_results
+from qunicorn_core.core.translation_cache import cache_translation, get_cached_translations
+from qunicorn_core.core.transpiler import transpile_circuit, transpile_circuits, TranspilationError
+from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler, MeasuredCost
+from qunicorn_core.core.transpiler.sandbox import (
+    SandboxConfig,
+    get_sandbox_config,
+    is_sandbox_enabled,
+    limit_memory,
+    run_with_limits,
+)
+from qunicorn_core.core.transpiler_costs import publish_measured_costs
 from qunicorn_core.db.db import DB
 from qunicorn_core.db.models.job import JobDataclass
 from qunicorn_core.db.models.job_state import TransientJobStateDataclass
@@ -34,6 +53,23 @@ from qunicorn_core.static.qunicorn_exception import QunicornError
 
 """This Class is responsible for running a job on a pilot and scheduling them with celery"""
 
+DEFAULT_JOB_BATCH_MAX_SIZE = 50
+
+
+class TranspilationTask(NamedTuple):
+    """A circuit of a program (or of a circuit fragment) that needs to be transpiled."""
+
+    program: QuantumProgramDataclass
+    circuit: Tuple[str, Any, int]
+    circuit_fragment_id: Optional[int]
+    existing_translations: List[Tuple[str, Any, int]]
+
+
+_TRANSPILATION_POOL: Optional[ProcessPoolExecutor] = None
+_TRANSPILATION_POOL_LOCK = Lock()
+# resource limits for unsafe transpilers (only set in the worker processes of the transpilation pool)
+_TRANSPILATION_WORKER_LIMITS: Optional[SandboxConfig] = None
+
 
 @CELERY.task()
 def run_job(job_id: int):
@@ -44,6 +80,10 @@ def run_job(job_id: int):
     job.state = JobState.RUNNING.value
     job.save(commit=True)
 
+    use_result_cache = is_result_cache_enabled(job)
+    if use_result_cache and reuse_cached_results(job):
+        return
+
     try:
         device = job.executed_on
 
@@ -62,14 +102,135 @@ def run_job(job_id: int):
         pilot.execute(pilot_jobs, token=token)
 
     except Exception as err:
-        if isinstance(err, QunicornError) and err.data.get("message", "").startswith("Transpilation Error"):
-            # transpilation has already saved the errors for the job, nothing to do
-            raise err
-        for transient_state in job._transient:
-            transient_state.delete()
-        job.save_error(err)
+        _save_run_error(job, err)
         raise err
 
+    if use_result_cache and job.state == JobState.FINISHED:
+        cache_job_results(job)
+
+
+def _save_run_error(job: JobDataclass, err: Exception):
+    if isinstance(err, QunicornError) and err.data.get("message", "").startswith("Transpilation Error"):
+        return  # transpilation has already saved the errors for the job, nothing to do
+    for transient_state in job._transient:
+        transient_state.delete()
+    job.save_error(err)
+
+
+def is_job_batching_enabled(job: JobDataclass) -> bool:
+    """Check if the job is executed together with other jobs waiting on the same local device"""
+    device = job.executed_on
+    return current_app.config.get("JOB_BATCH_WINDOW", 0) > 0 and device is not None and device.is_local
+
+
+def schedule_job_batch(job: JobDataclass) -> AsyncResult:
+    """Run the jobs waiting on the device of the job after the batch window or immediately if the batch is full"""
+    # the job only counts as waiting once its task id is stored, so the id must be stored before the task can run
+    task_id = uuid()
+    job.celery_id = task_id
+    job.save(commit=True)
+
+    countdown = current_app.config.get("JOB_BATCH_WINDOW", 0)
+    if JobDataclass.count_waiting_for_batch(job.executed_on_id) >= _get_job_batch_max_size():
+        countdown = 0
+    return run_job_batch.apply_async(kwargs={"device_id": job.executed_on_id}, countdown=countdown, task_id=task_id)
+
+
+def _get_job_batch_max_size() -> int:
+    return max(1, current_app.config.get("JOB_BATCH_MAX_SIZE", DEFAULT_JOB_BATCH_MAX_SIZE))
+
+
+@CELERY.task(ignore_result=True)
+def run_job_batch(device_id: int):  # noqa: C901
+    """Execute the jobs waiting on a local device together, the pilot gets the circuits of all jobs at once"""
+    # only one task may take a job, every job has its own task so jobs exceeding the batch size are taken by later tasks
+    jobs = JobDataclass.get_waiting_for_batch_for_update(device_id, _get_job_batch_max_size())
+    if not jobs:
+        return  # the jobs were already executed by the tasks of earlier jobs
+    for job in jobs:
+        job.state = JobState.RUNNING.value
+        job.save()
+    DB.session.commit()
+
+    device = jobs[0].executed_on
+    if not device or not device.provider:
+        for job in jobs:
+            _save_run_error(job, QunicornError(f"Job '{job.id}' has no valid device specified."))
+        return
+
+    pilot: Pilot = pilot_manager.get_matching_pilot(device.provider.name)
+    # pilots execute jobs of one type with one token at a time
+    batches: Dict[Tuple[str, Optional[str]], Tuple[List[JobDataclass], List[PilotJob]]] = {}
+
+    for job in jobs:
+        if is_result_cache_enabled(job) and reuse_cached_results(job):
+            continue
+        try:
+            pilot_jobs = _prepare_pilot_jobs(job, pilot.supported_languages)
+        except Exception as err:
+            current_app.logger.exception(f"Could not prepare job with id {job.id} for batch execution.")
+            _save_run_error(job, err)
+            continue
+        batch_jobs, batch_pilot_jobs = batches.setdefault(
+            (job.type, job.get_transient_state_key("token", None)), ([], [])
+        )
+        batch_jobs.append(job)
+        batch_pilot_jobs.extend(pilot_jobs)
+
+    for (_, token), (batch_jobs, batch_pilot_jobs) in batches.items():
+        current_app.logger.info(f"Run jobs with ids {[j.id for j in batch_jobs]} on {pilot.__class__} as one batch")
+        try:
+            pilot.execute(batch_pilot_jobs, token=token)
+        except Exception as err:
+            current_app.logger.exception(f"Batch of jobs with ids {[j.id for j in batch_jobs]} failed.")
+            for job in batch_jobs:
+                if job.state not in (JobState.FINISHED, JobState.ERROR):
+                    _save_run_error(job, err)
+            continue
+
+        for job in batch_jobs:
+            if is_result_cache_enabled(job) and job.state == JobState.FINISHED:
+                cache_job_results(job)
+
+
+def _get_provider_name(job: JobDataclass) -> str:
+    device = job.executed_on
+    return device.provider.name if device is not None and device.provider is not None else ""
+
+
+@CELERY.task(ignore_result=True)
+def poll_running_jobs():
+    """Check the status of all running remote jobs in bulk and collect the results of the completed jobs"""
+    jobs = sorted(JobDataclass.get_running_with_transient_state(), key=_get_provider_name)
+
+    for provider_name, provider_jobs in groupby(jobs, key=_get_provider_name):
+        if not provider_name:
+            continue
+
+        try:
+            pilot: Pilot = pilot_manager.get_matching_pilot(provider_name)
+            completed_jobs = pilot.get_completed_jobs(list(provider_jobs))
+        except Exception:
+            # one provider failing should not affect the jobs of other providers
+            current_app.logger.exception(f"Could not check the status of running jobs of provider {provider_name}.")
+            continue
+
+        for job in completed_jobs:
+            collect_job_results.delay(job.id)
+
+
+@CELERY.task(ignore_result=True)
+def collect_job_results(job_id: int):
+    """Save the results of the completed remote jobs of a job"""
+    job = JobDataclass.get_by_id_for_update(job_id)  # only one task may collect the results of a job at a time
+    if job is None or job.state != JobState.RUNNING.value:
+        return
+    pilot: Pilot = pilot_manager.get_matching_pilot(_get_provider_name(job))
+    try:
+        pilot.collect_job_results(job.id)
+    except PilotResultsPending:
+        pass  # the remaining results are collected by the next poll
+
 
 def _prepare_pilot_jobs(job: JobDataclass, dest_languages: Sequence[str]) -> Sequence[PilotJob]:
     max_qubits = job.cut_to_width
@@ -78,7 +239,10 @@ def _prepare_pilot_jobs(job: JobDataclass, dest_languages: Sequence[str]) -> Seq
     if try_circuit_cutting and not isinstance(circuit_cutting_service, str):
         raise QunicornError("This Qunicorn instance is not configured to support circuit cutting!")
 
-    pilot_jobs: List[PilotJob] = []
+    # circuits that need to be transpiled
+    tasks: List[TranspilationTask] = []
+    # pilot jobs that need no transpilation and indices into tasks (in program order)
+    prepared_jobs: List[PilotJob | int] = []
 
     programs = job.deployment.programs if job.deployment else []
 
@@ -93,11 +257,9 @@ def _prepare_pilot_jobs(job: JobDataclass, dest_languages: Sequence[str]) -> Seq
 
         if cutting_params is not None:
             assert isinstance(circuit_cutting_service, str)
-            pilot_jobs.extend(
-                _cut_circuit(
-                    job, program, circuit_cutting_service, cutting_params[0], cutting_params[1], dest_languages
-                )
-            )
+            fragment_tasks = _cut_circuit(job, program, circuit_cutting_service, cutting_params[0], cutting_params[1])
+            prepared_jobs.extend(range(len(tasks), len(tasks) + len(fragment_tasks)))
+            tasks.extend(fragment_tasks)
         else:
             circuit = program.quantum_circuit
             source_format = program.assembler_language
@@ -105,22 +267,35 @@ def _prepare_pilot_jobs(job: JobDataclass, dest_languages: Sequence[str]) -> Seq
                 continue  # skip empty programs
             if not source_format:
                 # no sourceformat specified, try circuit as is
-                pilot_jobs.append(PilotJob(circuit, job, program, None))
+                prepared_jobs.append(PilotJob(circuit, job, program, None))
                 continue
-            pilot_jobs.extend(
-                _transpile_circuit(
-                    job=job, program=program, circuit=(source_format, circuit, 0), dest_languages=dest_languages
+            prepared_jobs.append(len(tasks))
+            tasks.append(
+                TranspilationTask(
+                    program=program,
+                    circuit=(source_format, circuit, 0),
+                    circuit_fragment_id=None,
+                    existing_translations=_get_existing_translations(program, (source_format, circuit, 0)),
                 )
             )
 
+    transpiled_jobs = _transpile_circuits(job=job, tasks=tasks, dest_languages=dest_languages)
+
     DB.session.commit()
 
-    return pilot_jobs
+    return [transpiled_jobs[j] if isinstance(j, int) else j for j in prepared_jobs]
 
 
 def _persist_translation(
-    assembler_language: str, quantum_circuit: Any, translation_distance: int, program: QuantumProgramDataclass
+    assembler_language: str,
+    quantum_circuit: Any,
+    translation_distance: int,
+    program: QuantumProgramDataclass,
+    source: Optional[Tuple[str, Any]] = None,
 ):
+    if source is not None:
+        # also store the translation in the cache shared by all deployments
+        cache_translation(source[0], source[1], assembler_language, quantum_circuit, translation_distance)
     if isinstance(quantum_circuit, (str, bytes)):
         # circuit is in a format that can be safely stored in the database
         if any(t.assembler_language == assembler_language for t in program.translations):
@@ -135,7 +310,19 @@ def _persist_translation(
             translation_distance=translation_distance,
             program=program,
         )
-        translated.save(commit=True)
+        translated.save()  # committed together with all other translations of the job
+
+
+def _get_existing_translations(
+    program: QuantumProgramDataclass, circuit: Tuple[str, Any, int]
+) -> List[Tuple[str, Any, int]]:
+    """Get all known translations of the circuit from the program and from the shared translation cache."""
+    existing_translations = [(t.assembler_language, t.circuit, t.translation_distance) for t in program.translations]
+    known_formats = {t[0] for t in existing_translations}
+    for translation in get_cached_translations(circuit[0], circuit[1]):
+        if translation[0] not in known_formats:
+            existing_translations.append(translation)
+    return existing_translations
 
 
 def _get_circuit_cutting_params(  # noqa: C901
@@ -152,7 +339,8 @@ def _get_circuit_cutting_params(  # noqa: C901
 
     config = current_app.config
 
-    existing_translations = [(t.assembler_language, t.circuit, t.translation_distance) for t in program.translations]
+    source_circuit = (src_language, program.quantum_circuit)
+    existing_translations = _get_existing_translations(program, (*source_circuit, 0))
 
     try:
         transpiled_qiskit = transpile_circuit(
@@ -162,7 +350,8 @@ def _get_circuit_cutting_params(  # noqa: C901
             exclude=config.get("EXCLUDE_TRANSPILERS", None),
             exclude_formats=config.get("EXCLUDE_FORMATS", None),
             exclude_unsafe=config.get("EXCLUDE_UNSAFE_TRANSPILERS", True),
-            visitor=partial(_persist_translation, program=program),
+            visitor=partial(_persist_translation, program=program, source=source_circuit),
+            routing=config.get("TRANSPILER_ROUTING", "depth"),
         )
     except (KeyError, TranspilationError):
         raise QunicornError(
@@ -181,7 +370,7 @@ def _get_circuit_cutting_params(  # noqa: C901
     if max_circuits > 4:
         raise QunicornError("Qunicorn only supports cutting circuits into at most 4 smaller circuits!")
 
-    existing_translations = [(t.assembler_language, t.circuit, t.translation_distance) for t in program.translations]
+    existing_translations = _get_existing_translations(program, (*source_circuit, 0))
 
     target_formats = ("QASM2", "QASM3")
 
@@ -198,7 +387,8 @@ def _get_circuit_cutting_params(  # noqa: C901
                 exclude=config.get("EXCLUDE_TRANSPILERS", None),
                 exclude_formats=config.get("EXCLUDE_FORMATS", None),
                 exclude_unsafe=config.get("EXCLUDE_UNSAFE_TRANSPILERS", True),
-                visitor=partial(_persist_translation, program=program),
+                visitor=partial(_persist_translation, program=program, source=source_circuit),
+                routing=config.get("TRANSPILER_ROUTING", "depth"),
             )
             return {
                 "circuit": transpiled_circuit,
@@ -224,10 +414,7 @@ def _cut_circuit(
     circuit_cutting_service: str,
     cutting_params: dict,
     circuit: Any,
-    dest_languages: Sequence[str],
-) -> Sequence[PilotJob]:
-    pilot_jobs: List[PilotJob] = []
-
+) -> Sequence[TranspilationTask]:
     try:
         cut_data = cut_circuit(cutting_params, circuit_cutting_service)
     except Exception as err:
@@ -249,79 +436,306 @@ def _cut_circuit(
 
     source_format = "QASM2" if cutting_params["circuit_format"] == "openqasm2" else "QASM3"
 
-    for circuit_fragment_id, circuit in enumerate(cut_data["individual_subcircuits"]):
-        pilot_jobs.extend(
-            _transpile_circuit(
-                job=job,
-                program=program,
-                circuit_fragment_id=circuit_fragment_id,
-                circuit=(source_format, circuit, 0),
-                dest_languages=dest_languages,
+    return [
+        TranspilationTask(
+            program=program,
+            circuit=(source_format, fragment, 0),
+            circuit_fragment_id=circuit_fragment_id,
+            existing_translations=_get_existing_translations(program, (source_format, fragment, 0)),
+        )
+        for circuit_fragment_id, fragment in enumerate(cut_data["individual_subcircuits"])
+    ]
+
+
+def _transpile_to_any(
+    circuit: Tuple[str, Any, int],
+    existing_translations: Sequence[Tuple[str, Any, int]],
+    dest_languages: Sequence[str],
+    exclude: Optional[Sequence[str]],
+    exclude_formats: Optional[Sequence[str]],
+    exclude_unsafe: bool,
+    routing: str = "depth",
+) -> Tuple[Any, List[Tuple[str, Any, int]]]:
+    """Transpile the circuit into the first destination language that can be reached.
+
+    Returns:
+        the transpiled circuit and all translations that can be stored in the database
+    """
+    translations: List[Tuple[str, Any, int]] = []
+
+    def collect_translation(assembler_language: str, quantum_circuit: Any, translation_distance: int):
+        if isinstance(quantum_circuit, (str, bytes)):
+            translations.append((assembler_language, quantum_circuit, translation_distance))
+
+    last_error = None
+    for target in dest_languages:
+        try:
+            transpiled_circuit = transpile_circuit(
+                target,
+                circuit,
+                *existing_translations,
+                exclude=exclude,
+                exclude_formats=exclude_formats,
+                exclude_unsafe=exclude_unsafe,
+                visitor=collect_translation,
+                routing=routing,
             )
+            return transpiled_circuit, translations  # return after first successfull transpilation
+        except KeyError:
+            pass  # did not find a valid transpiler chain
+        except TranspilationError as err:
+            last_error = err.__cause__ if err.__cause__ else err
+    if last_error:
+        raise last_error
+    raise Exception(f"No transpiler chain found from {circuit[0]} to any of {dest_languages}")
+
+
+def _collect_translation(
+    translations: List[List[Tuple[str, Any, int]]],
+    index: int,
+    assembler_language: str,
+    quantum_circuit: Any,
+    translation_distance: int,
+):
+    if isinstance(quantum_circuit, (str, bytes)):
+        translations[index].append((assembler_language, quantum_circuit, translation_distance))
+
+
+def _transpile_batch_to_any(
+    tasks: Sequence[TranspilationTask],
+    dest_languages: Sequence[str],
+    exclude: Optional[Sequence[str]],
+    exclude_formats: Optional[Sequence[str]],
+    exclude_unsafe: bool,
+    routing: str = "depth",
+) -> List[Tuple[Any, List[Tuple[str, Any, int]]] | Exception]:
+    """Transpile the circuits of all tasks like :py:func:`_transpile_to_any`, but stage by stage for the whole batch.
+
+    Returns:
+        the transpiled circuit and the translations that can be stored in the database or the error for every task
+    """
+    results: List[Optional[Tuple[Any, List[Tuple[str, Any, int]]] | Exception]] = [None] * len(tasks)
+    translations: List[List[Tuple[str, Any, int]]] = [[] for _ in tasks]
+    last_errors: List[Optional[BaseException]] = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+
+    for target in dest_languages:
+        if not pending:
+            break
+        batch_translations: List[List[Tuple[str, Any, int]]] = [[] for _ in pending]
+        batch_results = transpile_circuits(
+            target,
+            [(tasks[i].circuit, *tasks[i].existing_translations) for i in pending],
+            exclude=exclude,
+            exclude_formats=exclude_formats,
+            exclude_unsafe=exclude_unsafe,
+            visitor=partial(_collect_translation, batch_translations),
+            routing=routing,
         )
+        still_pending = []
+        for i, result, collected in zip(pending, batch_results, batch_translations):
+            translations[i].extend(collected)
+            if result.error is None:
+                results[i] = (result.circuit, translations[i])
+            elif isinstance(result.error, KeyError):
+                still_pending.append(i)  # did not find a valid transpiler chain
+            elif isinstance(result.error, TranspilationError):
+                last_errors[i] = result.error.__cause__ if result.error.__cause__ else result.error
+                still_pending.append(i)
+            else:
+                results[i] = result.error
+        pending = still_pending
 
-    return pilot_jobs
+    for i in pending:
+        error = last_errors[i]
+        if not isinstance(error, Exception):
+            error = Exception(f"No transpiler chain found from {tasks[i].circuit[0]} to any of {dest_languages}")
+        results[i] = error
+    return cast(List[Tuple[Any, List[Tuple[str, Any, int]]] | Exception], results)
+
+
+def _transpile_unpacked(args: Tuple) -> Tuple[Any, List[Tuple[str, Any, int]]]:
+    return _transpile_to_any(*args)
 
 
-def _transpile_circuit(  # noqa: C901
+def _transpile_in_worker(
+    measured_costs: Dict[str, MeasuredCost], *args
+) -> Tuple[Any, List[Tuple[str, Any, int]], List[Tuple[str, float]]]:
+    """Run :py:func:`_transpile_to_any` in a worker process of the transpilation pool.
+
+    The transpiled circuit must be picklable to be sent back to the celery worker.
+    The measured costs of the celery worker are used for routing and the new cost samples are sent back.
+    """
+    CircuitTranspiler.set_measured_costs(measured_costs)
+    try:
+        if _TRANSPILATION_WORKER_LIMITS is not None:
+            # unsafe transpilers run directly in this process, enforce the limits of the sandbox for the whole call
+            transpiled_circuit, translations = run_with_limits(_transpile_unpacked, args, _TRANSPILATION_WORKER_LIMITS)
+        else:
+            transpiled_circuit, translations = _transpile_to_any(*args)
+    except Exception:
+        CircuitTranspiler.pop_measured_cost_samples()  # samples of failed calls are not sent back
+        raise
+    return transpiled_circuit, translations, CircuitTranspiler.pop_measured_cost_samples()
+
+
+def _init_transpilation_worker(config: Dict[str, Any], limits: Optional[SandboxConfig]):
+    global _TRANSPILATION_WORKER_LIMITS
+    # the transpilers read their settings from the app config
+    app = Flask(__name__)
+    app.config.update(config)
+    # the worker process is already separated from the celery worker, do not start a nested sandbox
+    app.config["UNSAFE_TRANSPILER_SANDBOX"] = False
+    app.app_context().push()
+    if limits is not None:
+        limit_memory(limits.memory_limit)
+    _TRANSPILATION_WORKER_LIMITS = limits
+
+
+def _get_transpilation_pool(pool_size: int) -> ProcessPoolExecutor:
+    global _TRANSPILATION_POOL
+    with _TRANSPILATION_POOL_LOCK:
+        if _TRANSPILATION_POOL is None:
+            config = {key: value for key, value in current_app.config.items() if key.startswith("EXCLUDE_")}
+            limits = None
+            if not config.get("EXCLUDE_UNSAFE_TRANSPILERS", True) and is_sandbox_enabled():
+                limits = get_sandbox_config()
+            start_method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+            _TRANSPILATION_POOL = ProcessPoolExecutor(
+                max_workers=pool_size,
+                mp_context=get_context(start_method),
+                initializer=_init_transpilation_worker,
+                initargs=(config, limits),
+            )
+        return _TRANSPILATION_POOL
+
+
+def _reset_transpilation_pool(pool: ProcessPoolExecutor):
+    """Replace a broken transpilation pool (e.g., if a worker exceeded its limits and was killed)."""
+    global _TRANSPILATION_POOL
+    with _TRANSPILATION_POOL_LOCK:
+        if _TRANSPILATION_POOL is pool:
+            _TRANSPILATION_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown_transpilation_pool():
+    """Stop the worker processes of the transpilation pool."""
+    global _TRANSPILATION_POOL
+    with _TRANSPILATION_POOL_LOCK:
+        pool, _TRANSPILATION_POOL = _TRANSPILATION_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit_transpilation_tasks(
+    pool_size: int, tasks: Sequence[TranspilationTask], transpiler_options: Tuple
+) -> List[Optional[Future]]:
+    if pool_size <= 1 or len(tasks) <= 1:
+        return [None] * len(tasks)
+    pool = _get_transpilation_pool(pool_size)
+    measured_costs = CircuitTranspiler.get_measured_costs()
+    try:
+        return [
+            pool.submit(
+                _transpile_in_worker, measured_costs, task.circuit, task.existing_translations, *transpiler_options
+            )
+            for task in tasks
+        ]
+    except BrokenProcessPool:
+        _reset_transpilation_pool(pool)
+        return [None] * len(tasks)  # transpile in the celery worker instead
+
+
+def _transpile_circuits(  # noqa: C901
     job: JobDataclass,
-    program: QuantumProgramDataclass,
-    circuit: Tuple[str, Any, int],
+    tasks: Sequence[TranspilationTask],
     dest_languages: Sequence[str],
-    circuit_fragment_id: Optional[int] = None,
 ) -> Sequence[PilotJob]:
-    """Transforms all circuits of the deployment into the circuits in the destination language"""
+    """Transpile all circuits of the job into one of the destination languages.
+
+    Circuits are transpiled in a process pool if ``TRANSPILATION_POOL_SIZE`` is configured.
+    Otherwise, all circuits are transpiled as one batch (see :py:func:`transpile_circuits`).
+
+    Returns:
+        one pilot job per task (in the order of the tasks)
+
+    Raises:
+        QunicornError: if any circuit could not be transpiled (after saving error results for the failed programs)
+    """
     current_app.logger.info(f"Transpile all circuits of job with id {job.id}")
-    error_results: list[ResultDataclass] = []
 
-    if job.deployment is None:
+    if job.deployment is None or not tasks:
         return []
 
     config = current_app.config
+    transpiler_options = (
+        dest_languages,
+        config.get("EXCLUDE_TRANSPILERS", None),
+        config.get("EXCLUDE_FORMATS", None),
+        config.get("EXCLUDE_UNSAFE_TRANSPILERS", True),
+        config.get("TRANSPILER_ROUTING", "depth"),
+    )
 
-    pilot_jobs: List[PilotJob] = []
+    futures = _submit_transpilation_tasks(config.get("TRANSPILATION_POOL_SIZE", 0), tasks, transpiler_options)
 
-    existing_translations = [(t.assembler_language, t.circuit, t.translation_distance) for t in program.translations]
+    # circuits that are not transpiled in the pool are transpiled together in the celery worker
+    in_process_results = iter(
+        _transpile_batch_to_any([task for task, future in zip(tasks, futures) if future is None], *transpiler_options)
+    )
 
-    try:
-        # Preprocess a string to a circuit object if necessary
-        last_error = None
-        for target in dest_languages:
-            try:
-                transpiled_circuit = transpile_circuit(
-                    target,
-                    circuit,
-                    *existing_translations,
-                    exclude=config.get("EXCLUDE_TRANSPILERS", None),
-                    exclude_formats=config.get("EXCLUDE_FORMATS", None),
-                    exclude_unsafe=config.get("EXCLUDE_UNSAFE_TRANSPILERS", True),
-                    visitor=partial(_persist_translation, program=program),
-                )
-                pilot_jobs.append(
-                    PilotJob(
-                        circuit=transpiled_circuit, job=job, program=program, circuit_fragment_id=circuit_fragment_id
-                    )
-                )
-                break  # break inner loop after first successfull transpilation
-            except KeyError:
-                pass  # did not find a valid transpiler chain
-            except TranspilationError as err:
-                last_error = err.__cause__ if err.__cause__ else err
-        else:
-            if last_error:
-                raise last_error
+    pilot_jobs: List[PilotJob] = []
+    error_results: List[ResultDataclass] = []
+
+    for task, future in zip(tasks, futures):
+        try:
+            result: Optional[Tuple[Any, List[Tuple[str, Any, int]]]] = None
+            if future is None:
+                in_process_result = next(in_process_results)
+                if isinstance(in_process_result, Exception):
+                    raise in_process_result
+                result = in_process_result
             else:
-                raise Exception(f"No transpiler chain found from {circuit[0]} to any of {dest_languages}")
-    except Exception as exception:
-        error_results.extend(result_mapper.exception_to_error_results(exception, program))
+                try:
+                    transpiled_circuit, translations, samples = future.result()
+                    result = (transpiled_circuit, translations)
+                    for transpiler, sample in samples:
+                        CircuitTranspiler.record_measured_cost_sample(transpiler, sample)
+                except BrokenProcessPool:
+                    # a worker was killed (e.g., because it exceeded its limits), retry in the celery worker
+                    if _TRANSPILATION_POOL is not None:
+                        _reset_transpilation_pool(_TRANSPILATION_POOL)
+            if result is None:
+                result = _transpile_to_any(task.circuit, task.existing_translations, *transpiler_options)
+            transpiled_circuit, translations = result
+        except Exception as exception:
+            error_results.extend(result_mapper.exception_to_error_results(exception, task.program))
+            continue
+
+        for assembler_language, quantum_circuit, translation_distance in translations:
+            _persist_translation(
+                assembler_language, quantum_circuit, translation_distance, task.program, source=task.circuit[:2]
+            )
+        pilot_jobs.append(
+            PilotJob(
+                circuit=transpiled_circuit,
+                job=job,
+                program=task.program,
+                circuit_fragment_id=task.circuit_fragment_id,
+            )
+        )
+
+    # share the measured transpiler costs with the other workers (committed together with the translations)
+    publish_measured_costs()
 
     # If an error was caught -> Update the job and raise it again
     if len(error_results) > 0:
         job.save_results(error_results, JobState.ERROR)
         string_errors = " ".join(str(error.data.get("exception_message", "")) for error in error_results)
-        if string_errors:
-            raise QunicornError("Transpilation Error: " + string_errors)
+        raise QunicornError("Transpilation Error: " + string_errors)
 
+    assert len(pilot_jobs) == len(tasks)
     return pilot_jobs
 
 
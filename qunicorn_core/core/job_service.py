@@ -14,9 +14,10 @@
 from datetime import datetime, timezone
 from os import environ
 from http import HTTPStatus
-from typing import Optional, Sequence
+from typing import Iterator, Optional, Sequence, Tuple
 
 from flask.globals import current_app
+from sqlalchemy.orm import lazyload, noload
 
 from qunicorn_core.api.api_models.job_dtos import (
     JobExecutePythonFileDto,
@@ -48,6 +49,9 @@ It calls the job_manager_service to run the jobs with celery.
 # TODO: make this an option that is managed in the app config
 ASYNCHRONOUS: bool = environ.get("EXECUTE_CELERY_TASK_ASYNCHRONOUS") == "True"
 
+# number of results fetched from the database at once when streaming results
+RESULT_STREAM_BATCH_SIZE = 100
+
 
 def create_and_run_job(
     job_request_dto: JobRequestDto, is_asynchronous: bool = ASYNCHRONOUS, user_id: Optional[str] = None
@@ -94,7 +98,10 @@ def run_job_with_celery(job: JobDataclass, is_asynchronous: bool, token: Optiona
         state.save(commit=True)  # make sure token is immediately available in DB
 
     if is_asynchronous:
-        task = job_manager_service.run_job.delay(job.id)
+        if job_manager_service.is_job_batching_enabled(job):
+            task = job_manager_service.schedule_job_batch(job)
+        else:
+            task = job_manager_service.run_job.delay(job.id)
         job.celery_id = task.id
         job.save(commit=True)
     else:
@@ -138,6 +145,47 @@ def get_job_by_id(job_id: int, user_id: Optional[str]) -> JobResponseDto:
     return job_mapper.dataclass_to_response(db_job)
 
 
+def get_job_results(
+    job_id: int,
+    user_id: Optional[str],
+    program_id: Optional[int] = None,
+    result_type: Optional[str] = None,
+    cursor: Optional[int] = None,
+    item_count: Optional[int] = None,
+) -> Tuple[Iterator[ResultDto], Optional[int]]:
+    """Get the results of a job ordered by their id, the results are only loaded while iterating over them.
+
+    Returns:
+        Tuple[Iterator[ResultDto], Optional[int]]: the results and the cursor of the next page (None for the last page)
+    """
+    # the results are loaded separately, load neither the results nor the programs of the job
+    q = JobDataclass.get_by_id_query(job_id).options(
+        noload(JobDataclass.results), noload(JobDataclass._transient), lazyload(JobDataclass.deployment)
+    )
+    job: Optional[JobDataclass] = DB.session.execute(JobDataclass.apply_authentication_filter(q, user_id)).scalar()
+    if job is None:
+        raise QunicornError(JobDataclass.not_found_message(job_id), HTTPStatus.NOT_FOUND)
+
+    results_query = ResultDataclass.get_by_job_query(job.id, program_id, result_type, after_id=cursor)
+    next_cursor: Optional[int] = None
+    if item_count is not None:
+        ids_query = results_query.with_only_columns(ResultDataclass.id).limit(item_count + 1)
+        result_ids = DB.session.execute(ids_query).scalars().all()
+        if len(result_ids) > item_count:
+            next_cursor = result_ids[item_count - 1]
+            results_query = results_query.where(ResultDataclass.id <= next_cursor)
+
+    return _iter_results(results_query), next_cursor
+
+
+def _iter_results(results_query) -> Iterator[ResultDto]:
+    # the job of the results is already loaded, programs are not needed for the dto
+    results_query = results_query.options(lazyload(ResultDataclass.job), noload(ResultDataclass.program))
+    for result in DB.session.scalars(results_query.execution_options(yield_per=RESULT_STREAM_BATCH_SIZE)):
+        yield result_mapper.dataclass_to_dto(result)
+        DB.session.expunge(result)  # do not keep results that were already mapped in the session
+
+
 def get_job_result_by_id(result_id: int, job_id: int, user_id: Optional[str]) -> ResultDto:
     result: ResultDataclass = ResultDataclass.get_by_id_authenticated_or_404(result_id, user_id)
     if result.job_id != job_id:
@@ -24,7 +24,7 @@ def dataclass_to_dto(result: ResultDataclass) -> ResultDto:
     assert job is not None
     return ResultDto(
         id=result.id,
-        data=result.data,
+        data=result.get_data(),
         metadata=result.meta,
         result_type=ResultType(result.result_type),
         job_id=job.id,
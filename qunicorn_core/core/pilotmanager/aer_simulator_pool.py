@@ -0,0 +1,114 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pool of Aer simulators shared by all jobs running on local IBM devices of a worker."""
+
+import os
+from contextlib import contextmanager
+from queue import LifoQueue
+from threading import Lock
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from flask.globals import current_app
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+
+PARALLELIZATION_MODES = ("auto", "experiments", "shots", "none")
+
+
+class AerParallelism(NamedTuple):
+    """Parallelization options of the Aer simulator (see the options of :py:class:`AerSimulator`)."""
+
+    max_parallel_threads: int
+    max_parallel_experiments: int
+    max_parallel_shots: int
+
+
+def get_worker_cores() -> int:
+    """Get the number of cores this worker is allowed to use."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on all platforms
+        return os.cpu_count() or 1
+
+
+def choose_parallelism(circuits: Sequence[QuantumCircuit]) -> AerParallelism:
+    """Choose whether the experiments (circuits), the shots or the simulation of each circuit is parallelized.
+
+    In "auto" mode, wide circuits use all threads for the parallel simulation of a single circuit.
+    Batches of narrow circuits are simulated in parallel and single narrow circuits parallelize their shots.
+    """
+    config = current_app.config
+    threads = config.get("AER_MAX_PARALLEL_THREADS", 0) or get_worker_cores()
+    mode = config.get("AER_PARALLELIZATION", "auto")
+    if mode not in PARALLELIZATION_MODES:
+        raise ValueError(f"Unknown Aer parallelization mode '{mode}', use one of {PARALLELIZATION_MODES}.")
+
+    if mode == "auto":
+        width = max((circuit.num_qubits for circuit in circuits), default=0)
+        if width >= config.get("AER_PARALLEL_STATE_MIN_QUBITS", 14):
+            mode = "none"
+        elif len(circuits) > 1:
+            mode = "experiments"
+        else:
+            mode = "shots"
+
+    if mode == "experiments":
+        return AerParallelism(threads, min(threads, max(len(circuits), 1)), 1)
+    if mode == "shots":
+        return AerParallelism(threads, 1, threads)
+    return AerParallelism(threads, 1, 1)
+
+
+class AerSimulatorPool:
+    """Reuse Aer simulators instead of creating a new simulator for every job.
+
+    A simulator is only used by one job at a time, as the parallelization options are set per job.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = max(size, 1)
+        self._idle: LifoQueue[AerSimulator] = LifoQueue()
+        self._created = 0
+        self._lock = Lock()
+
+    def _get_simulator(self) -> AerSimulator:
+        with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                self._created += 1
+                return AerSimulator()
+        return self._idle.get()  # wait for another job to release a simulator
+
+    @contextmanager
+    def simulator(self, circuits: Sequence[QuantumCircuit]) -> Iterator[AerSimulator]:
+        """Get a simulator configured for the parallel simulation of the given circuits."""
+        simulator = self._get_simulator()
+        try:
+            simulator.set_options(**choose_parallelism(circuits)._asdict())
+            yield simulator
+        finally:
+            self._idle.put(simulator)
+
+
+_SIMULATOR_POOL: Optional[AerSimulatorPool] = None
+_SIMULATOR_POOL_LOCK = Lock()
+
+
+def get_simulator_pool() -> AerSimulatorPool:
+    """Get the simulator pool of this worker (created with the size configured in ``AER_SIMULATOR_POOL_SIZE``)."""
+    global _SIMULATOR_POOL
+    with _SIMULATOR_POOL_LOCK:
+        if _SIMULATOR_POOL is None:
+            _SIMULATOR_POOL = AerSimulatorPool(current_app.config.get("AER_SIMULATOR_POOL_SIZE", 1))
+        return _SIMULATOR_POOL
@@ -14,7 +14,9 @@
 
 import traceback
 from itertools import groupby
-from typing import List, Optional, Sequence, Union
+from os import getpid
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 from flask.globals import current_app
 from braket.devices import LocalSimulator
@@ -33,6 +35,27 @@ from qunicorn_core.static.enums.provider_name import ProviderName
 from qunicorn_core.static.enums.result_type import ResultType
 from qunicorn_core.static.qunicorn_exception import QunicornError
 
+# qunicorn device names of the braket local simulator backends
+LOCAL_SIMULATOR_BACKENDS = {"local_simulator": "default"}
+
+_LOCAL_SIMULATORS: Dict[str, LocalSimulator] = {}
+_LOCAL_SIMULATORS_PID: Optional[int] = None
+_LOCAL_SIMULATORS_LOCK = Lock()
+
+
+def get_local_simulator(backend: str = "default") -> LocalSimulator:
+    """Get the local simulator of this worker process for the braket simulator backend."""
+    global _LOCAL_SIMULATORS_PID
+    with _LOCAL_SIMULATORS_LOCK:
+        if _LOCAL_SIMULATORS_PID != getpid():
+            # simulators are not shared with forked worker processes
+            _LOCAL_SIMULATORS.clear()
+            _LOCAL_SIMULATORS_PID = getpid()
+        simulator = _LOCAL_SIMULATORS.get(backend)
+        if simulator is None:
+            simulator = _LOCAL_SIMULATORS[backend] = LocalSimulator(backend=backend)
+        return simulator
+
 
 class AWSPilot(Pilot):
     """The AWS Pilot"""
@@ -45,22 +68,40 @@ class AWSPilot(Pilot):
         if any(not j.job.executed_on or not j.job.executed_on.is_local for j in jobs):
             raise QunicornError("Device not found, device needs to be local for AWS")
 
-        batches = [(k, list(j)) for k, j in groupby(jobs, key=lambda j: j.job.shots)]
+        # circuits of all jobs with the same shots and simulator are executed in one batch, regardless of their order
+        sorted_jobs = sorted(jobs, key=AWSPilot._get_batch_key)
+        batches = [(k, list(j)) for k, j in groupby(sorted_jobs, key=AWSPilot._get_batch_key)]
+        max_parallel = current_app.config.get("AWS_MAX_PARALLEL", None) or None
 
-        for shots, jobs in batches:
+        for (shots, backend), batch_jobs in batches:
             # Since QASM is stored as a string, it needs to be converted to a QASM program before execution
             # FIXME: support circuits where not all qubits have gates
             preprocessed_circuits = [
-                (Program(source=j.circuit) if isinstance(j.circuit, str) else j.circuit) for j in jobs
+                (Program(source=j.circuit) if isinstance(j.circuit, str) else j.circuit) for j in batch_jobs
             ]
 
-            quantum_tasks: LocalQuantumTaskBatch = LocalSimulator().run_batch(preprocessed_circuits, shots=shots)
-
-            results = AWSPilot._map_aws_results(quantum_tasks.results())
-            for result, job in zip(results, jobs):
+            try:
+                quantum_tasks: LocalQuantumTaskBatch = get_local_simulator(backend).run_batch(
+                    preprocessed_circuits, shots=shots, max_parallel=max_parallel
+                )
+                results = AWSPilot._map_aws_results(quantum_tasks.results())
+            except Exception as err:
+                # the batch may contain programs of several jobs, every program gets the error
+                current_app.logger.exception(f"Batch of {len(batch_jobs)} circuits failed on AWS {backend} simulator.")
+                for job in batch_jobs:
+                    job.job.save_error(err, program=job.program)
+                continue
+
+            # results of the batch are in the order of the circuits, each result belongs to the job of its circuit
+            for result, job in zip(results, batch_jobs):
                 self.save_results(job, result, commit=False)
         DB.session.commit()
 
+    @staticmethod
+    def _get_batch_key(job: PilotJob) -> Tuple[int, str]:
+        device_name = job.job.executed_on.name
+        return job.job.shots, LOCAL_SIMULATOR_BACKENDS.get(device_name, device_name)
+
     def execute_provider_specific(self, jobs: Sequence[PilotJob], job_type: str, token: Optional[str] = None):
         """Execute a job of a provider specific type on a backend using a pilot"""
         raise QunicornError("No valid Job Type specified")
@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Any, List, Optional, Sequence, Tuple, Union, Generator, NamedTuple, Dict
 
 from celery.states import PENDING
+from flask import current_app
 
 from qunicorn_core.api.api_models.device_dtos import DeviceDto
 from qunicorn_core.celery import CELERY
@@ -43,6 +44,15 @@ from qunicorn_core.static.qunicorn_exception import QunicornError
 from qunicorn_core.util.utils import is_running_asynchronously
 
 
+class PilotResultsPending(Exception):
+    """Raised while the results of some jobs submitted to a provider are not available yet."""
+
+
+def is_result_poller_enabled() -> bool:
+    """True if the results of remote jobs are collected by the shared periodic poller instead of one task per job."""
+    return bool(current_app.config.get("RESULT_POLL_INTERVAL", 0))
+
+
 class PilotJob(NamedTuple):
     circuit: Any
     job: JobDataclass
@@ -125,6 +135,14 @@ class Pilot:
         """Cancel execution of a job at the corresponding backend"""
         raise NotImplementedError()
 
+    def get_completed_jobs(self, jobs: Sequence[JobDataclass]) -> Sequence[JobDataclass]:
+        """Check the status of the remote jobs of running jobs in bulk and return the jobs with results to collect"""
+        return []
+
+    def collect_job_results(self, job_id: int):
+        """Save the results of completed remote jobs, raise PilotResultsPending if some jobs are still running"""
+        raise NotImplementedError()
+
     def save_results(self, job: PilotJob, results: Sequence[PilotJobResult], commit: bool = False):
         contains_error = False
         contains_fragments = False
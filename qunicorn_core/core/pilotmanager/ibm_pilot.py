@@ -13,21 +13,21 @@
 # limitations under the License.
 
 import traceback
+from contextlib import nullcontext
 from http import HTTPStatus
 from os import environ
 from itertools import groupby
 from pathlib import Path
-from typing import List, Optional, Sequence, Union, Dict
+from time import sleep, time
+from typing import ContextManager, List, Optional, Sequence, Union, Dict
 
 import numpy as np
 from flask.globals import current_app
-import qiskit_aer
-from qiskit import transpile, QuantumCircuit, QiskitError
+from qiskit import QuantumCircuit, QiskitError
 from qiskit.primitives import PrimitiveResult, PubResult
 from qiskit.providers import BackendV2, QiskitBackendNotFoundError
 from qiskit.quantum_info import SparsePauliOp
 from qiskit.result import Result
-from qiskit_aer import AerSimulator
 from qiskit_ibm_runtime import (
     EstimatorV2,
     IBMRuntimeError,
@@ -40,7 +40,17 @@ from qiskit_ibm_runtime import (
 )
 
 from qunicorn_core.api.api_models import DeviceDto
-from qunicorn_core.core.pilotmanager.base_pilot import Pilot, PilotJob, PilotJobResult
+from qunicorn_core.celery import CELERY
+from qunicorn_core.core.isa_circuit_cache import get_isa_circuits
+from qunicorn_core.core.pilotmanager.aer_simulator_pool import get_simulator_pool
+from qunicorn_core.core.pilotmanager.base_pilot import (
+    Pilot,
+    PilotJob,
+    PilotJobResult,
+    PilotResultsPending,
+    is_result_poller_enabled,
+)
+from qunicorn_core.core.pilotmanager.runtime_service_cache import get_service_cache
 from qunicorn_core.db.db import DB
 from qunicorn_core.db.models.device import DeviceDataclass
 from qunicorn_core.db.models.job import JobDataclass
@@ -54,6 +64,14 @@ from qunicorn_core.static.enums.provider_name import ProviderName
 from qunicorn_core.static.enums.result_type import ResultType
 from qunicorn_core.static.qunicorn_exception import QunicornError
 from qunicorn_core.util import utils
+from qunicorn_core.util.utils import is_running_asynchronously
+
+# seconds between two status requests for remote jobs if qunicorn is not running asynchronously
+SYNCHRONOUS_POLL_INTERVAL = 5
+
+
+class IBMResultsPending(PilotResultsPending):
+    pass
 
 
 class IBMPilot(Pilot):
@@ -77,8 +95,9 @@ class IBMPilot(Pilot):
             raise QunicornError("No valid Job Type specified")
 
     def run(self, jobs: Sequence[PilotJob], token: Optional[str] = None):
-        """Execute a job local using aer simulator or a real backend"""
+        """Execute a job local using aer simulator or submit it to a real backend (results are collected later)"""
         batched_jobs = [(db_job, list(pilot_jobs)) for db_job, pilot_jobs in groupby(jobs, lambda j: j.job)]
+        jobs_to_watch: list[JobDataclass] = []
 
         for db_job, pilot_jobs in batched_jobs:
             device = db_job.executed_on
@@ -86,45 +105,204 @@ class IBMPilot(Pilot):
                 db_job.save_error(QunicornError("The job does not have any device associated!"))
                 continue  # one job failing should not affect other jobs
 
-            backend: BackendV2
-            if device.is_local:
-                backend = qiskit_aer.Aer.get_backend("aer_simulator")
-            else:
-                provider = self.__get_provider_login_and_update_job(token, db_job)
-                backend = provider.backend(device.name)
-
             pilot_jobs = list(pilot_jobs)
+            circuits = [j.circuit for j in pilot_jobs]
 
-            backend_specific_circuits = transpile([j.circuit for j in pilot_jobs], backend)
-            qiskit_job = backend.run(backend_specific_circuits, shots=db_job.shots)
-
-            job_state: Optional[TransientJobStateDataclass] = None
-
-            for state in db_job._transient:
-                if state.program is not None and isinstance(state.data, dict):
-                    if state.data.get("type") == "IBM":
-                        job_state = state
-                        break
-            else:
-                job_state = TransientJobStateDataclass(db_job, data={"type": "IBM"})
+            with self.__get_backend(db_job, circuits, token=token) as backend:
+                backend_specific_circuits = get_isa_circuits(circuits, backend)
+                qiskit_job = backend.run(backend_specific_circuits, shots=db_job.shots)
 
-            provider_specific_ids = job_state.data.get("provider_ids", [])
-            provider_specific_ids.append(qiskit_job.job_id())
-            job_state.data = dict(job_state.data) | {"provider_ids": provider_specific_ids}
-            job_state.save()
+                if not device.is_local:
+                    # do not block the worker until the job has left the queue of the remote backend
+                    IBMPilot.__save_remote_job_state(db_job, pilot_jobs, backend_specific_circuits, qiskit_job.job_id())
+                    jobs_to_watch.append(db_job)
+                    continue
 
-            db_job.state = JobState.RUNNING.value
-            db_job.save(commit=True)
+                result = qiskit_job.result()
 
-            result = qiskit_job.result()
             mapped_results: list[Sequence[PilotJobResult]] = IBMPilot.__map_runner_results(
-                result, backend_specific_circuits
+                result, [IBMPilot._get_register_metadata(c) for c in backend_specific_circuits]
             )
 
             for pilot_results, pilot_job in zip(mapped_results, pilot_jobs):
                 self.save_results(pilot_job, pilot_results)
             DB.session.commit()
 
+        DB.session.commit()
+
+        for db_job in jobs_to_watch:
+            if not is_running_asynchronously():
+                self.__wait_for_job_results(db_job.id)
+            elif not is_result_poller_enabled():
+                watch_task = watch_ibm_results.s(job_id=db_job.id).delay()
+                db_job.celery_id = watch_task.id
+                db_job.save(commit=True)  # commit new celery id
+
+    @staticmethod
+    def __save_remote_job_state(
+        db_job: JobDataclass, pilot_jobs: Sequence[PilotJob], circuits: Sequence[QuantumCircuit], provider_id: str
+    ):
+        """Store the provider job id and everything needed to map the results later for every submitted circuit."""
+        started_at = int(time())
+
+        for i, (pilot_job, circuit) in enumerate(zip(pilot_jobs, circuits)):
+            program_state = TransientJobStateDataclass(
+                job=db_job,
+                program=pilot_job.program,
+                circuit_fragment_id=pilot_job.circuit_fragment_id,
+                data={
+                    "type": "IBM",
+                    "id": provider_id,
+                    "circuit_index": i,
+                    "registers": IBMPilot._get_register_metadata(circuit),
+                    "started_at": started_at,
+                },
+            )
+            program_state.save()
+
+        if db_job.provider_specific_id is None:
+            db_job.provider_specific_id = provider_id
+        db_job.state = JobState.RUNNING.value
+        db_job.save()
+
+    def __wait_for_job_results(self, job_id: int):
+        """Block until the results of all remote jobs are collected (only used if qunicorn runs synchronously)"""
+        while True:
+            try:
+                self._get_job_results(job_id)
+                return
+            except IBMResultsPending:
+                sleep(SYNCHRONOUS_POLL_INTERVAL)
+
+    def get_completed_jobs(self, jobs: Sequence[JobDataclass]) -> Sequence[JobDataclass]:
+        """Return the jobs with at least one remote job that is no longer pending (one request per IBM account)"""
+        timeout = current_app.config.get("IBM_JOB_TIMEOUT", 7 * 24 * 3600)
+        pending_ids: dict[Optional[str], Optional[set[str]]] = {}
+        completed_jobs = []
+
+        for db_job in jobs:
+            program_states = [
+                s for s in db_job._transient if isinstance(s.data, dict) and s.data.get("type", None) == "IBM"
+            ]
+            if not program_states:
+                continue
+
+            token = db_job.get_transient_state_key("token", None)
+            if token not in pending_ids:
+                try:
+                    service = IBMPilot.get_ibm_provider_and_login(token)
+                    pending_ids[token] = {j.job_id() for j in service.jobs(limit=None, pending=True)}
+                except Exception:
+                    # collecting the results of the job saves the error
+                    current_app.logger.exception("Could not fetch the pending jobs of an IBM account.")
+                    pending_ids[token] = None
+
+            account_pending_ids = pending_ids[token]
+            if account_pending_ids is None or any(
+                s.data["id"] not in account_pending_ids or s.data["started_at"] + timeout < time()
+                for s in program_states
+            ):
+                completed_jobs.append(db_job)
+
+        return completed_jobs
+
+    def collect_job_results(self, job_id: int):
+        self._get_job_results(job_id)
+
+    def _get_job_results(self, qunicorn_job_id: int) -> None:  # noqa: C901
+        """Collect the results of all finished remote jobs, raises IBMResultsPending while some jobs are unfinished"""
+        qunicorn_job: Optional[JobDataclass] = JobDataclass.get_by_id(qunicorn_job_id)
+
+        if qunicorn_job is None:
+            raise ValueError(f"Unknown Qunicorn job id {qunicorn_job_id}!")
+
+        program_states: dict[str, list[TransientJobStateDataclass]] = {}
+
+        for program_state in tuple(qunicorn_job._transient):
+            if program_state.program is None:
+                continue  # only process program related transient state
+
+            if not isinstance(program_state.data, dict) or program_state.data.get("type", None) != "IBM":
+                continue  # only process transient state created by this pilot
+
+            if qunicorn_job.state == JobState.CANCELED.value:
+                program_state.delete()  # results of canceled jobs are not collected
+                continue
+
+            program_states.setdefault(program_state.data["id"], []).append(program_state)
+
+        if not program_states:
+            DB.session.commit()
+            return
+
+        token = qunicorn_job.get_transient_state_key("token", None)
+        service = self.__get_runtime_service(qunicorn_job, token=token)
+        timeout = current_app.config.get("IBM_JOB_TIMEOUT", 7 * 24 * 3600)
+
+        jobs_to_save = []
+        results_to_save = []
+        pending = False
+
+        for ibm_job_id, states in program_states.items():
+            try:
+                qiskit_job = service.job(ibm_job_id)
+
+                if not qiskit_job.in_final_state():
+                    if states[0].data["started_at"] + timeout >= time():
+                        pending = True
+                        continue
+                    raise QunicornError(f"IBM job with id {ibm_job_id} timed out!")
+
+                states.sort(key=lambda s: s.data["circuit_index"])
+                mapped_results = IBMPilot.__map_runner_results(
+                    qiskit_job.result(), [s.data["registers"] for s in states]
+                )
+            except Exception as err:
+                for program_state in states:
+                    program_state.delete()
+                    qunicorn_job.save_error(err, program=program_state.program)
+                continue
+
+            for program_state in states:
+                jobs_to_save.append(
+                    PilotJob(
+                        circuit=None,
+                        job=qunicorn_job,
+                        program=program_state.program,
+                        circuit_fragment_id=program_state.circuit_fragment_id,
+                    )
+                )
+                results_to_save.append(mapped_results[program_state.data["circuit_index"]])
+                program_state.delete()
+
+        # ensure that the relevant transient states are removed
+        DB.session.commit()
+
+        # this saves the results after all transient states of finished jobs are deleted so that
+        # determine_db_job_state can determine the correct state
+        for job, result in zip(jobs_to_save, results_to_save):
+            self.save_results(job, result)
+
+        DB.session.commit()
+
+        if pending:
+            raise IBMResultsPending()
+
+    def determine_db_job_state(self, db_job: JobDataclass) -> JobState:
+        if db_job.state == JobState.RUNNING.value:
+            if any(t.data.get("type") == "IBM" for t in db_job._transient if isinstance(t.data, dict)):
+                return JobState.RUNNING
+        return super().determine_db_job_state(db_job)
+
+    def __get_backend(
+        self, db_job: JobDataclass, circuits: Sequence[QuantumCircuit], token: Optional[str]
+    ) -> ContextManager[BackendV2]:
+        """Get a pooled simulator for local devices or the backend of the device from the IBM provider."""
+        if db_job.executed_on.is_local:
+            return get_simulator_pool().simulator(circuits)
+        provider = self.__get_provider_login_and_update_job(token, db_job)
+        return nullcontext(provider.backend(db_job.executed_on.name))
+
     def cancel_provider_specific(self, job: JobDataclass, token: Optional[str] = None):
         """Cancel a job on an IBM backend using the IBM Pilot"""
         qiskit_job = self.__get_qiskit_job_from_qiskit_runtime(job, token=token)
@@ -150,15 +328,13 @@ class IBMPilot(Pilot):
             else:
                 raise QunicornError(f"Error mitigation method {db_job.error_mitigation} not supported by IBM sampler.")
 
-            if db_job.executed_on.is_local:
-                backend = AerSimulator()
-            else:
-                backend = self.__get_qiskit_runtime_backend(db_job, token=token)
+            circuits = [j.circuit for j in pilot_jobs]
 
-            sampler = Sampler(backend, options=options)
+            with self.__get_runtime_backend(db_job, circuits, token=token) as backend:
+                sampler = Sampler(backend, options=options)
 
-            job_from_ibm: RuntimeJobV2 = sampler.run([j.circuit for j in pilot_jobs])
-            ibm_result: PrimitiveResult = job_from_ibm.result()
+                job_from_ibm: RuntimeJobV2 = sampler.run(get_isa_circuits(circuits, backend))
+                ibm_result: PrimitiveResult = job_from_ibm.result()
             mapped_results = IBMPilot._map_sampler_results(ibm_result)
 
             for pilot_results, pilot_job in zip(mapped_results, pilot_jobs):
@@ -193,62 +369,49 @@ class IBMPilot(Pilot):
                     f"Error mitigation method {db_job.error_mitigation} not supported by IBM estimator."
                 )
 
-            if db_job.executed_on.is_local:
-                backend = AerSimulator()
-            else:
-                backend = self.__get_qiskit_runtime_backend(db_job, token=token)
-
-            estimator = EstimatorV2(backend, options=options)
             circuits = [j.circuit for j in pilot_jobs]
 
-            job_from_ibm = estimator.run(list(zip(circuits, observables)))
-            ibm_result: PrimitiveResult = job_from_ibm.result()
+            with self.__get_runtime_backend(db_job, circuits, token=token) as backend:
+                estimator = EstimatorV2(backend, options=options)
+                isa_circuits = get_isa_circuits(circuits, backend)
+                # the observables must act on the physical qubits of the ISA circuits
+                isa_observables = [o.apply_layout(c.layout) for o, c in zip(observables, isa_circuits)]
+
+                job_from_ibm = estimator.run(list(zip(isa_circuits, isa_observables)))
+                ibm_result: PrimitiveResult = job_from_ibm.result()
             mapped_results = IBMPilot._map_estimator_results(ibm_result, observables)
 
             for pilot_results, pilot_job in zip(mapped_results, pilot_jobs):
                 self.save_results(pilot_job, pilot_results)
             DB.session.commit()
 
+    def __get_runtime_backend(
+        self, db_job: JobDataclass, circuits: Sequence[QuantumCircuit], token: Optional[str]
+    ) -> ContextManager[BackendV2]:
+        """Get a pooled simulator for local devices or the backend of the device from the QiskitRuntimeService."""
+        if db_job.executed_on.is_local:
+            return get_simulator_pool().simulator(circuits)
+        return nullcontext(self.__get_qiskit_runtime_backend(db_job, token=token))
+
     def __get_qiskit_runtime_backend(self, job: JobDataclass, token: Optional[str]) -> BackendV2:
         """Instantiate all important configurations and updates the job_state"""
-
-        # If the token is empty the token is taken from the environment variables.
-        if not token and (t := environ.get("IBM_TOKEN")):
-            token = t
-
-        self.__get_provider_login_and_update_job(token, job)
-        return QiskitRuntimeService().backend(job.executed_on.name)
+        service = self.__get_provider_login_and_update_job(token, job)
+        return service.backend(job.executed_on.name)
 
     def __get_qiskit_job_from_qiskit_runtime(self, job: JobDataclass, token: Optional[str]) -> RuntimeJob:
         """Returns the job of the provider specific ID created on the given account"""
-
-        # If the token is empty the token is taken from the environment variables.
-        if not token and (t := environ.get("IBM_TOKEN")):
-            token = t
-
-        self.__get_provider_login_and_update_job(token, job.id)
-        service: QiskitRuntimeService = QiskitRuntimeService()
+        service = self.__get_provider_login_and_update_job(token, job)
         return service.job(job.provider_specific_id)  # FIXME use ids from transient state!
 
     @staticmethod
     def get_ibm_provider_and_login(token: Optional[str]) -> QiskitRuntimeService:
-        """Save account credentials and get provider"""
+        """Get an authenticated provider for the token (cached, see :py:class:`RuntimeServiceCache`)"""
 
         # If the token is empty the token is taken from the environment variables.
         if not token and (t := environ.get("IBM_TOKEN")):
             token = t
 
-        # Try to save the account. Update job_dto to job_state = Error, if it is not possible
-        # FIXME test and use job specific name for saving credentials??
-        file_path = Path(current_app.instance_path) / "qiskit_accounts"
-        file_path.mkdir(exist_ok=True, parents=True)
-        file_path /= "ibm_account.json"
-
-        QiskitRuntimeService.save_account(
-            channel="ibm_quantum", token=token, overwrite=True, name="TODO", filename=str(file_path)
-        )
-
-        return QiskitRuntimeService(channel="ibm_quantum", name="TODO", filename=str(file_path))  # FIXME change name
+        return get_service_cache().get_service(token)
 
     @staticmethod
     def __get_provider_login_and_update_job(token: str, job: JobDataclass) -> QiskitRuntimeService:
@@ -329,18 +492,15 @@ class IBMPilot(Pilot):
 
     @staticmethod
     def __get_runtime_service(job: JobDataclass, token: Optional[str]) -> QiskitRuntimeService:
-        # If the token is empty the token is taken from the environment variables.
-        if not token and (t := environ.get("IBM_TOKEN")):
-            token = t
+        return IBMPilot.__get_provider_login_and_update_job(token, job)
 
-        service = QiskitRuntimeService(token=None, channel=None, filename=None, name=None)
-        service.save_account(token=token, channel="ibm_quantum", overwrite=True)
-        return service
+    @staticmethod
+    def _get_register_metadata(circuit: QuantumCircuit) -> list[dict]:
+        # FIXME: don't append registers that are not measured
+        return [{"name": reg.name, "size": reg.size} for reg in reversed(circuit.cregs)]
 
     @staticmethod
-    def __map_runner_results(
-        ibm_result: Result, circuits: List[QuantumCircuit] = None
-    ) -> list[Sequence[PilotJobResult]]:
+    def __map_runner_results(ibm_result: Result, registers: Sequence[list[dict]]) -> list[Sequence[PilotJobResult]]:
         results: list[Sequence[PilotJobResult]] = []
 
         try:
@@ -357,13 +517,7 @@ class IBMPilot(Pilot):
 
             metadata = result.to_dict()
             metadata["format"] = "hex"
-            classical_registers_metadata = []
-
-            for reg in reversed(circuits[i].cregs):
-                # FIXME: don't append registers that are not measured
-                classical_registers_metadata.append({"name": reg.name, "size": reg.size})
-
-            metadata["registers"] = classical_registers_metadata
+            metadata["registers"] = registers[i]
             metadata.pop("data")
             metadata.pop("circuit", None)
 
@@ -534,3 +688,14 @@ class IBMPilot(Pilot):
         config_dict["_control_channels"] = None
         config_dict["gates"] = None
         return config_dict
+
+
+@CELERY.task(
+    ignore_result=True,
+    autoretry_for=(IBMResultsPending,),
+    retry_backoff=1.2,
+    retry_backoff_max=60,
+    max_retries=None,
+)
+def watch_ibm_results(job_id: int):
+    IBMPilot()._get_job_results(job_id)
@@ -15,7 +15,6 @@ import uuid
 from http import HTTPStatus
 from typing import Optional, Union
 
-import requests
 from flask import current_app
 
 from qunicorn_core.api.api_models import DeviceDto
@@ -29,6 +28,7 @@ from qunicorn_core.db.models.device import DeviceDataclass
 from qunicorn_core.db.models.job import JobDataclass
 from qunicorn_core.db.models.provider import ProviderDataclass
 from qunicorn_core.static.qunicorn_exception import QunicornError
+from qunicorn_core.util.http_client import get_http_client
 
 PILOTS: list[Pilot] = [IBMPilot(), AWSPilot(), RigettiPilot(), QMwarePilot()]
 provider_name_map = {"IBM": "ibmq"}  # "<Qunicorn Provider Name>: <QPROV Provider Name>"
@@ -60,7 +60,8 @@ def update_devices_from_provider(provider_id: int, token: Optional[str]):
         current_app.logger.info("QPROV_URL not set, skipping QPROV update")
         return
 
-    response = requests.get(f"{qprov_root_url}/providers")
+    http_client = get_http_client()
+    response = http_client.get(f"{qprov_root_url}/providers")
     response.raise_for_status()
     qprov_providers = response.json()["_embedded"]["providerDtoes"]
 
@@ -69,7 +70,7 @@ def update_devices_from_provider(provider_id: int, token: Optional[str]):
             qprov_id = qprov_provider["id"]
             provider.qprov_id = uuid.UUID(qprov_id)
 
-            response = requests.get(f"{qprov_root_url}/providers/{qprov_id}/qpus")
+            response = http_client.get(f"{qprov_root_url}/providers/{qprov_id}/qpus", endpoint="/providers/{id}/qpus")
             response.raise_for_status()
             qprov_qpus = response.json()["_embedded"]["qpuDtoes"]
             qpu_name_id_map = {}
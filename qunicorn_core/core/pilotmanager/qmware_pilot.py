@@ -13,19 +13,26 @@
 # limitations under the License.
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from itertools import groupby
 from time import time
 from typing import List, Optional, Sequence, Union, Dict, Tuple
 from urllib.parse import urljoin
 
-import requests
+import numpy as np
 from flask.globals import current_app
 from qiskit import qasm2
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, RequestException
 
 from qunicorn_core.celery import CELERY
 from qunicorn_core.api.api_models.device_dtos import DeviceDto
-from qunicorn_core.core.pilotmanager.base_pilot import Pilot, PilotJob, PilotJobResult
+from qunicorn_core.core.pilotmanager.base_pilot import (
+    Pilot,
+    PilotJob,
+    PilotJobResult,
+    PilotResultsPending,
+    is_result_poller_enabled,
+)
 from qunicorn_core.db.db import DB
 from qunicorn_core.db.models.device import DeviceDataclass
 from qunicorn_core.db.models.job import JobDataclass
@@ -36,6 +43,7 @@ from qunicorn_core.static.enums.job_state import JobState
 from qunicorn_core.static.enums.provider_name import ProviderName
 from qunicorn_core.static.enums.result_type import ResultType
 from qunicorn_core.static.qunicorn_exception import QunicornError
+from qunicorn_core.util.http_client import get_http_client
 
 DEFAULT_QUANTUM_CIRCUIT = """OPENQASM 2.0;
 include "qelib1.inc";
@@ -59,11 +67,36 @@ AUTHORIZATION_HEADERS = {
     "X-API-KEY-ID": QMWARE_API_KEY_ID,
 }
 
+# code types of requests to the QMware dispatcher for every device
+QMWARE_CODE_TYPES = {"dev": "qasm2", "dev-gpu": "qasm2-gpu", "dev-batch": "qasm2-batch"}
+
+# code types that return the measurements of separate registers (all other code types combine the registers)
+QMWARE_SEPARATE_REGISTER_CODE_TYPES = ("qasm2",)
+
+# statuses of QMware jobs that are not finished yet
+QMWARE_PENDING_STATUSES = ("WAITING", "PREPARING", "RUNNING")
+
+# seconds after which qunicorn stops waiting for the results of a QMware job
+QMWARE_JOB_TIMEOUT = 24 * 3600
+
 
-class QMWAREResultsPending(Exception):
+class QMWAREResultsPending(PilotResultsPending):
     pass
 
 
+def _to_bit_array(numbers: Sequence[int], bits: int = 0) -> np.ndarray:
+    """Store measured bits as unsigned 64 bit integers if possible or as python integers for wider measurements."""
+    if bits <= 64 and all(0 <= n < 2**64 for n in numbers):
+        return np.array(numbers, dtype=np.uint64)
+    return np.array(numbers, dtype=object)
+
+
+def _to_hex_strings(numbers: np.ndarray) -> np.ndarray:
+    """Format the numbers as hex strings, every distinct number is only formatted once."""
+    unique_numbers, inverse = np.unique(numbers, return_inverse=True)
+    return np.array([hex(int(n)) for n in unique_numbers], dtype=object)[inverse.reshape(-1)]
+
+
 class QMwarePilot(Pilot):
     """Base class for Pilots"""
 
@@ -79,34 +112,61 @@ class QMwarePilot(Pilot):
             (db_job, list(pilot_jobs)) for db_job, pilot_jobs in groupby(jobs, lambda j: j.job)
         ]
 
+        batch_code_types: Dict[str, str] = current_app.config.get("QMWARE_BATCH_CODE_TYPES", {})
+
         for db_job, pilot_jobs in batched_jobs:
-            batched = False
-
-            if db_job.executed_on.name == "dev":
-                code_type = "qasm2"
-            elif db_job.executed_on.name == "dev-gpu":
-                code_type = "qasm2-gpu"
-            elif db_job.executed_on.name == "dev-batch":
-                code_type = "qasm2-batch"
-                batched = True
-            else:
+            code_type = QMWARE_CODE_TYPES.get(db_job.executed_on.name)
+            if code_type is None:
                 raise QunicornError(f"Unknown QMware device {db_job.executed_on.name}")
 
-            if batched:
-                self._send_circuit_request(pilot_jobs, batched, job_name, code_type)
+            if code_type == "qasm2-batch":
+                batch_code_type = code_type  # the device only accepts batches
+            else:
+                batch_code_type = batch_code_types.get(db_job.executed_on.name)
+
+            if batch_code_type is not None and (len(pilot_jobs) > 1 or batch_code_type == code_type):
+                # pack the programs into as few requests as possible
+                for batch in self._split_into_batches(pilot_jobs):
+                    self._send_circuit_request(batch, True, job_name, batch_code_type)
             else:
                 for pilot_job in pilot_jobs:
-                    self._send_circuit_request([pilot_job], batched, job_name, code_type)
+                    self._send_circuit_request([pilot_job], False, job_name, code_type)
 
             jobs_to_watch.append(db_job)
 
         DB.session.commit()
 
+        if is_result_poller_enabled():
+            return  # the results are collected by the shared result poller
+
         for qunicorn_job in jobs_to_watch:
             watch_task = watch_qmware_results.s(job_id=qunicorn_job.id).delay()
             qunicorn_job.celery_id = watch_task.id
             qunicorn_job.save(commit=True)  # commit new celery id
 
+    @staticmethod
+    def _split_into_batches(jobs: Sequence[PilotJob]) -> List[List[PilotJob]]:
+        """Split the jobs into batches limited by ``QMWARE_MAX_BATCH_SIZE`` and ``QMWARE_MAX_BATCH_PAYLOAD``."""
+        max_batch_size: int = current_app.config.get("QMWARE_MAX_BATCH_SIZE", 100)
+        max_payload: int = current_app.config.get("QMWARE_MAX_BATCH_PAYLOAD", 2**20)
+
+        batches: List[List[PilotJob]] = []
+        batch: List[PilotJob] = []
+        payload = 0
+
+        for job in jobs:
+            circuit_payload = len(json.dumps(job.circuit))
+            if batch and (len(batch) >= max_batch_size or payload + circuit_payload > max_payload):
+                batches.append(batch)
+                batch = []
+                payload = 0
+            batch.append(job)
+            payload += circuit_payload
+
+        if batch:
+            batches.append(batch)
+        return batches
+
     @staticmethod
     def _send_circuit_request(
         jobs: list[PilotJob],
@@ -125,6 +185,8 @@ class QMwarePilot(Pilot):
 
         circuits = [job.circuit for job in jobs]
         shots = jobs[0].job.shots
+        # the circuits are only parsed once, polling for the results only needs the layout of the registers
+        register_metadata = [QMwarePilot._get_register_metadata(circuit) for circuit in circuits]
 
         data = {
             "name": job_name,
@@ -135,7 +197,7 @@ class QMwarePilot(Pilot):
             "programParameters": [{"name": "shots", "value": str(shots)}],
         }
 
-        response = requests.post(
+        response = get_http_client().post(
             urljoin(QMWARE_URL, "/v0/requests"), json=data, headers=AUTHORIZATION_HEADERS, timeout=10
         )
         response.raise_for_status()
@@ -146,7 +208,7 @@ class QMwarePilot(Pilot):
             # TODO save job/program specific error in DB
             raise QunicornError(f"Job was not created. ({result['message']})")
 
-        for i, job in enumerate(jobs):
+        for i, (job, registers) in enumerate(zip(jobs, register_metadata)):
             program_state = TransientJobStateDataclass(
                 job=job.job,
                 program=job.program,
@@ -157,9 +219,10 @@ class QMwarePilot(Pilot):
                     "started_at": int(time()),
                     "X-API-KEY": QMWARE_API_KEY,
                     "X-API-KEY-ID": QMWARE_API_KEY_ID,
-                    "circuit": job.circuit,
+                    "registers": registers,
                     "batched": batched,
                     "circuit_index": i if batched else None,
+                    "code_type": code_type,
                 },
             )
             program_state.save()
@@ -168,90 +231,142 @@ class QMwarePilot(Pilot):
             db_job.state = JobState.RUNNING.value
             db_job.save()
 
-    def _get_job_results(self, qunicorn_job_id: int) -> None:  # noqa: C901
-        qunicorn_job: JobDataclass = JobDataclass.get_by_id(qunicorn_job_id)
+    @staticmethod
+    def _get_register_metadata(circuit: str) -> list[dict[str, Union[str, int]]]:
+        try:
+            parsed_circuit = qasm2.loads(circuit)
+        except qasm2.exceptions.QASM2ParseError:
+            parsed_circuit = qasm2.loads(circuit, custom_instructions=qasm2.LEGACY_CUSTOM_INSTRUCTIONS)
+
+        return [{"name": register.name, "size": register.size} for register in reversed(parsed_circuit.cregs)]
+
+    def get_completed_jobs(self, jobs: Sequence[JobDataclass]) -> Sequence[JobDataclass]:
+        """Return the jobs with at least one finished QMware job (all QMware jobs are fetched concurrently)"""
+        program_states = [(qunicorn_job, self._get_program_states(qunicorn_job)) for qunicorn_job in jobs]
+        fetched_results = self._fetch_qmware_jobs(
+            [s for _, states in program_states for s in states if not self._is_timed_out(s)]
+        )
 
-        if qunicorn_job is None:
-            raise ValueError("Unknown Qunicorn job id {qunicorn_job_id}!")
+        def is_finished(program_state: TransientJobStateDataclass) -> bool:
+            if self._is_timed_out(program_state):
+                return True  # collecting the results of the job saves the timeout error
+            result = fetched_results[program_state.data["id"]]
+            return result is not None and result["status"] not in QMWARE_PENDING_STATUSES
 
-        jobs_to_save = []
-        results_to_save = []
-        fetched_results: dict[str, any] = {}
-        fetched_measurements: dict[str, list[dict] | list[list[dict]]] = {}
+        return [qunicorn_job for qunicorn_job, states in program_states if any(is_finished(s) for s in states)]
 
-        for program_state in tuple(qunicorn_job._transient):
+    @staticmethod
+    def _get_program_states(qunicorn_job: JobDataclass) -> List[TransientJobStateDataclass]:
+        """Get the program related transient states created by this pilot."""
+        program_states = []
+        for program_state in qunicorn_job._transient:
             if program_state.program is None:
                 continue  # only process program related transient state
-
             if not isinstance(program_state.data, dict) or program_state.data.get("type", None) != "QMWARE":
                 continue  # only process transient state created by this pilot
+            program_states.append(program_state)
+        return program_states
 
-            job_started_at = program_state.data["started_at"]
-            qmware_job_id = program_state.data["id"]
-            program = program_state.program
+    @staticmethod
+    def _is_timed_out(program_state: TransientJobStateDataclass) -> bool:
+        return program_state.data["started_at"] + QMWARE_JOB_TIMEOUT < time()
 
-            if qmware_job_id in fetched_results:
-                result = fetched_results[qmware_job_id]
+    @staticmethod
+    def _fetch_qmware_jobs(program_states: Sequence[TransientJobStateDataclass]) -> Dict[str, Optional[dict]]:
+        """Fetch every distinct QMware job of the program states concurrently.
+
+        Jobs that could not be fetched at the moment are mapped to None.
+        """
+        headers = {
+            program_state.data["id"]: {
+                "X-API-KEY": program_state.data["X-API-KEY"],
+                "X-API-KEY-ID": program_state.data["X-API-KEY-ID"],
+            }
+            for program_state in program_states
+        }
+        if not headers:
+            return {}
 
-                if result is None:
-                    continue  # response was fetched, but had an error
-            else:
-                if job_started_at + (24 * 3600) < time():
-                    # time out jobs after 24 hours!
-                    program_state.delete()
-                    error = QunicornError(f"QMware job with id {qmware_job_id} timed out!")
-                    qunicorn_job.save_error(error, program=program)
-                    continue
-
-                response = requests.get(
+        http_client = get_http_client()
+
+        def fetch(qmware_job_id: str) -> Optional[dict]:
+            try:
+                response = http_client.get(
                     urljoin(QMWARE_URL, f"/v0/jobs/{qmware_job_id}"),
-                    headers={
-                        "X-API-KEY": program_state.data["X-API-KEY"],
-                        "X-API-KEY-ID": program_state.data["X-API-KEY-ID"],
-                    },
+                    endpoint="/v0/jobs/{id}",
+                    headers=headers[qmware_job_id],
                     timeout=10,
                 )
-                fetched_results[qmware_job_id] = None
                 response.raise_for_status()
-                result = response.json()
+                return response.json()
+            except RequestException:
+                return None
 
-                if result["status"] in ("WAITING", "PREPARING", "RUNNING"):
-                    raise QMWAREResultsPending()
+        # more concurrent requests than pooled connections would only open additional connections
+        max_workers = min(len(headers), current_app.config.get("HTTP_POOL_SIZE", 10))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched_results = dict(zip(headers.keys(), executor.map(fetch, headers.keys())))
 
-                if result["status"] in ("ERROR", "TIMEOUT", "CANCELED"):
-                    program_state.delete()
-                    error = QunicornError(f"QMware job with id {qmware_job_id} returned status {result['status']}")
-                    qunicorn_job.save_error(error, program=program, extra_data={"qmware_result": result})
-                    continue
+        for qmware_job_id, result in fetched_results.items():
+            if result is None:
+                current_app.logger.warning(f"Could not fetch the QMware job with id {qmware_job_id}.")
+        return fetched_results
 
-                if result["status"] != "SUCCESS":
-                    program_state.delete()
-                    error = QunicornError(
-                        f"QMware job with id {qmware_job_id} returned unknown status {result['status']}"
-                    )
-                    qunicorn_job.save_error(error, program=program, extra_data={"qmware_result": result})
-                    continue
+    def collect_job_results(self, job_id: int):
+        self._get_job_results(job_id)
 
-                fetched_results[qmware_job_id] = result
-                fetched_measurements[qmware_job_id] = json.loads(result["out"]["value"])
+    def _get_job_results(self, qunicorn_job_id: int) -> None:  # noqa: C901
+        """Save the results of all finished QMware jobs, raises QMWAREResultsPending while some jobs are unfinished"""
+        qunicorn_job: JobDataclass = JobDataclass.get_by_id(qunicorn_job_id)
+
+        if qunicorn_job is None:
+            raise ValueError(f"Unknown Qunicorn job id {qunicorn_job_id}!")
+
+        program_states = self._get_program_states(qunicorn_job)
+        fetched_results = self._fetch_qmware_jobs([s for s in program_states if not self._is_timed_out(s)])
+
+        jobs_to_save = []
+        results_to_save = []
+        fetched_measurements: dict[str, list[dict] | list[list[dict]]] = {}
+        pending = False
+
+        for program_state in program_states:
+            qmware_job_id = program_state.data["id"]
+            program = program_state.program
+
+            if self._is_timed_out(program_state):
+                # time out jobs after 24 hours!
+                program_state.delete()
+                error = QunicornError(f"QMware job with id {qmware_job_id} timed out!")
+                qunicorn_job.save_error(error, program=program)
+                continue
+
+            result = fetched_results[qmware_job_id]
+
+            if result is None or result["status"] in QMWARE_PENDING_STATUSES:
+                pending = True
+                continue  # results of other programs may already be available
+
+            if result["status"] in ("ERROR", "TIMEOUT", "CANCELED"):
+                program_state.delete()
+                error = QunicornError(f"QMware job with id {qmware_job_id} returned status {result['status']}")
+                qunicorn_job.save_error(error, program=program, extra_data={"qmware_result": result})
+                continue
+
+            if result["status"] != "SUCCESS":
+                program_state.delete()
+                error = QunicornError(f"QMware job with id {qmware_job_id} returned unknown status {result['status']}")
+                qunicorn_job.save_error(error, program=program, extra_data={"qmware_result": result})
+                continue
 
             try:
-                try:
-                    circuit = qasm2.loads(program_state.data["circuit"])
-                except qasm2.exceptions.QASM2ParseError:
-                    circuit = qasm2.loads(
-                        program_state.data["circuit"], custom_instructions=qasm2.LEGACY_CUSTOM_INSTRUCTIONS
-                    )
-
-                register_metadata = []
-
-                for classical_register in reversed(circuit.cregs):
-                    register_metadata.append(
-                        {
-                            "name": classical_register.name,
-                            "size": classical_register.size,
-                        }
-                    )
+                if qmware_job_id not in fetched_measurements:
+                    fetched_measurements[qmware_job_id] = json.loads(result["out"]["value"])
+
+                register_metadata = program_state.data.get("registers", None)
+                if register_metadata is None:
+                    # transient state created before the registers were stored at submission
+                    register_metadata = self._get_register_metadata(program_state.data["circuit"])
 
                 if program_state.data["batched"]:
                     measurements: list[dict] = fetched_measurements[qmware_job_id][program_state.data["circuit_index"]]
@@ -261,7 +376,7 @@ class QMwarePilot(Pilot):
                 results: List[List[Dict[str, int]]] = [measurement["result"] for measurement in measurements]
 
                 hex_counts, hex_probabilities = self._convert_qmware_measurements_to_qunicorn_measurements(
-                    qunicorn_job, results, register_metadata
+                    qunicorn_job, results, register_metadata, program_state.data.get("code_type", None)
                 )
             except Exception as err:
                 program_state.delete()
@@ -270,7 +385,7 @@ class QMwarePilot(Pilot):
 
             jobs_to_save.append(
                 PilotJob(
-                    circuit=program_state.data["circuit"],
+                    circuit=None,
                     job=program_state.job,
                     program=program_state.program,
                     circuit_fragment_id=program_state.circuit_fragment_id,
@@ -304,59 +419,58 @@ class QMwarePilot(Pilot):
         # ensure that the relevant transient states are removed
         DB.session.commit()
 
-        # this saves the results after all transient states with type QMWARE are deleted so that determine_db_job_state
-        # can determine the correct state
+        # this saves the results after the transient states of all finished programs are deleted so that
+        # determine_db_job_state can determine the correct state
         for job, result in zip(jobs_to_save, results_to_save):
             self.save_results(job, result)
 
         DB.session.commit()
 
+        if pending:
+            raise QMWAREResultsPending()
+
     def _convert_qmware_measurements_to_qunicorn_measurements(
-        self, job: JobDataclass, results: List[List[dict[str, int]]], register_metadata: list[dict[str, any]]
+        self,
+        job: JobDataclass,
+        results: List[List[dict[str, int]]],
+        register_metadata: list[dict[str, any]],
+        code_type: Optional[str] = None,
     ) -> Tuple[dict[str, int], dict[str, float]]:
-        hex_counts = {}
-        hex_probabilities = {}
-
-        for single_result in zip(*results):
-            hex_measurements = []
-            hits = None
-            register: Dict[str, int]
-
-            if job.executed_on.name == "dev":
-                for register in single_result:
-                    hex_measurements.append(hex(register["number"]))
-
-                    if hits is None:
-                        hits = register["hits"]
-                    else:
-                        assert hits == register["hits"], "results have different number of hits"
-            elif job.executed_on.name in ("dev-gpu", "dev-batch"):
-                # measurements are combined into one register on this device, therefore we have to split them again
-                register = single_result[0]
-                measured_bits = register["number"]
-
-                for single_register_meta in reversed(register_metadata):
-                    size: int = single_register_meta["size"]
-                    mask = (0b1 << size) - 1
-
-                    hex_measurements.append(hex(measured_bits & mask))
-
-                    # discard already processed bits
-                    measured_bits >>= size
-
-                hex_measurements.reverse()
-
-                if hits is None:
-                    hits = register["hits"]
-                else:
-                    assert hits == register["hits"], "results have different number of hits"
-
-            if hits is None:
-                hits = 0
-
-            hex_measurement = " ".join(hex_measurements)
-            hex_counts[hex_measurement] = hits
-            hex_probabilities[hex_measurement] = hits / job.shots
+        # results contains one list of outcomes per measurement, outcomes with the same index belong together
+        outcome_count = min((len(r) for r in results), default=0)
+        if outcome_count == 0:
+            return {}, {}
+
+        if code_type is None:
+            # the format of the measurements depends on the code type of the request, not the device
+            code_type = QMWARE_CODE_TYPES.get(job.executed_on.name)
+
+        if code_type in QMWARE_SEPARATE_REGISTER_CODE_TYPES:
+            hits = np.array([[outcome["hits"] for outcome in r[:outcome_count]] for r in results])
+            assert np.all(hits == hits[0]), "results have different number of hits"
+            hits = hits[0]
+            registers = [_to_bit_array([outcome["number"] for outcome in r[:outcome_count]]) for r in results]
+        elif code_type is not None:
+            # measurements are combined into one register for this code type, therefore we have to split them again
+            hits = np.array([outcome["hits"] for outcome in results[0][:outcome_count]])
+            sizes = [register["size"] for register in register_metadata]
+            measured_bits = _to_bit_array([outcome["number"] for outcome in results[0][:outcome_count]], sum(sizes))
+            # the last register is stored in the least significant bits
+            shifts = np.cumsum([0] + sizes[:0:-1])[::-1]
+            registers = [
+                (measured_bits >> measured_bits.dtype.type(shift)) & measured_bits.dtype.type((1 << size) - 1)
+                for shift, size in zip(shifts.tolist(), sizes)
+            ]
+        else:
+            raise QunicornError(f"Unknown QMware device {job.executed_on.name}")
+
+        hex_measurements = _to_hex_strings(registers[0]) if registers else np.full(outcome_count, "", dtype=object)
+        for register in registers[1:]:
+            hex_measurements = hex_measurements + " " + _to_hex_strings(register)
+
+        hex_measurements = hex_measurements.tolist()
+        hex_counts = dict(zip(hex_measurements, hits.tolist()))
+        hex_probabilities = dict(zip(hex_measurements, (hits / job.shots).tolist()))
 
         return hex_counts, hex_probabilities
 
@@ -394,7 +508,7 @@ class QMwarePilot(Pilot):
 
     def is_device_available(self, device: Union[DeviceDataclass, DeviceDto], token: Optional[str]) -> bool:
         """Check if a device is available for a user"""
-        response = requests.get(urljoin(QMWARE_URL, "/health"))
+        response = get_http_client().get(urljoin(QMWARE_URL, "/health"))
 
         if response.status_code != 200:
             return False
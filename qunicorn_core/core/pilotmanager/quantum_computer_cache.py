@@ -0,0 +1,104 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per worker cache of pyquil quantum computers and of the executables compiled for them."""
+
+from collections import OrderedDict
+from hashlib import sha256
+from os import getpid
+from threading import Lock
+from typing import Optional
+
+from flask.globals import current_app
+from pyquil import Program
+from pyquil.api import QuantumExecutable, QuantumComputer, get_qc
+
+DEFAULT_EXECUTABLE_CACHE_SIZE = 128
+
+
+class QuantumComputerCache:
+    """Cache of quantum computer handles by device name and an LRU cache of compiled executables.
+
+    Executables are cached by the hash of the source program, the device and the number of shots.
+    Source programs are never modified, the shots are set on a copy before compiling.
+    """
+
+    def __init__(self, max_executables: int = DEFAULT_EXECUTABLE_CACHE_SIZE) -> None:
+        self.max_executables = max_executables
+        self._quantum_computers: dict[str, QuantumComputer] = {}
+        self._executables: OrderedDict[tuple[str, str, int], QuantumExecutable] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._executables)
+
+    def get_quantum_computer(self, device_name: str) -> QuantumComputer:
+        with self._lock:
+            quantum_computer = self._quantum_computers.get(device_name)
+        if quantum_computer is None:
+            quantum_computer = get_qc(device_name)
+            with self._lock:
+                quantum_computer = self._quantum_computers.setdefault(device_name, quantum_computer)
+        return quantum_computer
+
+    @staticmethod
+    def _get_key(program: Program, device_name: str, shots: int) -> tuple[str, str, int]:
+        return sha256(program.out().encode()).hexdigest(), device_name, shots
+
+    def get_executable(self, program: Program, device_name: str, shots: int) -> QuantumExecutable:
+        """Get the executable of the program compiled for the device or compile the program (with quilc)."""
+        key = self._get_key(program, device_name, shots)
+        with self._lock:
+            executable = self._executables.get(key)
+            if executable is not None:
+                self._executables.move_to_end(key)
+
+        if executable is None:
+            # compile outside of the lock, compiling requires a request to quilc
+            prepared_program = program.copy()
+            prepared_program.wrap_in_numshots_loop(shots)
+            executable = self.get_quantum_computer(device_name).compile(prepared_program)
+
+            with self._lock:
+                if self.max_executables > 0:
+                    self._executables[key] = executable
+                    self._executables.move_to_end(key)
+                    while len(self._executables) > self.max_executables:
+                        self._executables.popitem(last=False)
+
+        # executables may store memory values, every run gets its own copy
+        return executable.copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._quantum_computers.clear()
+            self._executables.clear()
+
+
+_QUANTUM_COMPUTER_CACHE: Optional[QuantumComputerCache] = None
+_QUANTUM_COMPUTER_CACHE_PID: Optional[int] = None
+_QUANTUM_COMPUTER_CACHE_LOCK = Lock()
+
+
+def get_quantum_computer_cache() -> QuantumComputerCache:
+    """Get the quantum computer cache of this worker process (configured by ``RIGETTI_EXECUTABLE_CACHE_SIZE``)."""
+    global _QUANTUM_COMPUTER_CACHE, _QUANTUM_COMPUTER_CACHE_PID
+    with _QUANTUM_COMPUTER_CACHE_LOCK:
+        if _QUANTUM_COMPUTER_CACHE is None or _QUANTUM_COMPUTER_CACHE_PID != getpid():
+            # the clients of the quantum computers must not be shared with forked worker processes
+            _QUANTUM_COMPUTER_CACHE = QuantumComputerCache(
+                current_app.config.get("RIGETTI_EXECUTABLE_CACHE_SIZE", DEFAULT_EXECUTABLE_CACHE_SIZE)
+            )
+            _QUANTUM_COMPUTER_CACHE_PID = getpid()
+        return _QUANTUM_COMPUTER_CACHE
@@ -12,15 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import Counter
 from http import HTTPStatus
 from typing import Optional, Sequence, Union
 
+import numpy as np
 from flask.globals import current_app
-from pyquil.api import get_qc
 
 from qunicorn_core.api.api_models import DeviceDto
 from qunicorn_core.core.pilotmanager.base_pilot import Pilot, PilotJob, PilotJobResult
+from qunicorn_core.core.pilotmanager.quantum_computer_cache import get_quantum_computer_cache
 from qunicorn_core.db.db import DB
 from qunicorn_core.db.models.device import DeviceDataclass
 from qunicorn_core.db.models.job import JobDataclass
@@ -60,14 +60,14 @@ class RigettiPilot(Pilot):
         if any(not j.job.executed_on or not j.job.executed_on.is_local for j in jobs):
             raise QunicornError("Device need to be local for RIGETTI")
 
+        cache = get_quantum_computer_cache()
+
         for job in jobs:
-            job.circuit.wrap_in_numshots_loop(job.job.shots)
-            qvm = get_qc(job.job.executed_on.name)
-            qvm_result = qvm.run(qvm.compile(job.circuit)).get_register_map().get("ro")
-            result_dict = RigettiPilot.result_to_dict(qvm_result)
-            result_dict = RigettiPilot.qubit_binary_string_to_hex(
-                result_dict, reverse_qubit_order=True
-            )  # FIXME: test qubit order with qasm testsuite!
+            device_name = job.job.executed_on.name
+            qvm = cache.get_quantum_computer(device_name)
+            executable = cache.get_executable(job.circuit, device_name, job.job.shots)
+            qvm_result = qvm.run(executable).get_register_map().get("ro")
+            result_dict = RigettiPilot.readout_to_hex_counts(qvm_result)  # FIXME: test qubit order with qasm testsuite!
             probabilities_dict = utils.calculate_probabilities(result_dict)
 
             pilot_results = [
@@ -101,11 +101,19 @@ class RigettiPilot(Pilot):
         DB.session.commit()
 
     @staticmethod
-    def result_to_dict(results: Sequence[Sequence[int]]) -> dict:
-        """Converts the result of the qvm to a dictionary"""
-        results_as_strings = ("".join(map(str, row)) for row in results)
-        result_counter = Counter(results_as_strings)
-        return dict(result_counter)
+    def readout_to_hex_counts(readout: np.ndarray) -> dict:
+        """Count the shots of the qvm readout (one row of bits per shot) by their hex value, ro[0] is the lowest bit"""
+        readout = np.asarray(readout)
+        if readout.shape[1] == 0:
+            return {"0x0": readout.shape[0]}
+
+        # pack every shot into bytes (least significant bit first) so that equal shots can be counted at once
+        packed_shots = np.packbits(readout.astype(bool), axis=1, bitorder="little")
+        unique_shots, counts = np.unique(packed_shots, axis=0, return_counts=True)
+
+        return {
+            hex(int.from_bytes(shot.tobytes(), "little")): count for shot, count in zip(unique_shots, counts.tolist())
+        }
 
     def execute_provider_specific(self, jobs: Sequence[PilotJob], job_type: str, token: Optional[str] = None):
         """Execute a job of a provider specific type on a backend using a Pilot"""
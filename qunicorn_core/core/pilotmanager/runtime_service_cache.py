@@ -0,0 +1,95 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory cache of authenticated QiskitRuntimeService clients shared by all jobs of a worker."""
+
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from flask.globals import current_app
+from qiskit_ibm_runtime import QiskitRuntimeService
+
+DEFAULT_SERVICE_CACHE_SIZE = 16
+DEFAULT_SERVICE_CACHE_TTL = 3600  # seconds
+
+
+class RuntimeServiceCache:
+    """LRU cache of runtime services by token with a maximum age for each service.
+
+    Only a hash of the token is used as the cache key.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SERVICE_CACHE_SIZE, ttl: float = DEFAULT_SERVICE_CACHE_TTL) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._services: OrderedDict[str, tuple[float, QiskitRuntimeService]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._services)
+
+    @staticmethod
+    def _get_key(token: Optional[str]) -> str:
+        return sha256((token or "").encode()).hexdigest()
+
+    def get_service(self, token: Optional[str]) -> QiskitRuntimeService:
+        """Get the cached service for the token or log in with the token and cache the new service."""
+        key = self._get_key(token)
+        with self._lock:
+            cached = self._services.get(key)
+            if cached is not None:
+                if monotonic() - cached[0] < self.ttl:
+                    self._services.move_to_end(key)
+                    return cached[1]
+                del self._services[key]
+
+        # log in outside of the lock, logging in requires a request to the IBM API
+        service = QiskitRuntimeService(channel="ibm_quantum", token=token)
+
+        with self._lock:
+            if self.max_size > 0:
+                self._services[key] = (monotonic(), service)
+                self._services.move_to_end(key)
+                while len(self._services) > self.max_size:
+                    self._services.popitem(last=False)
+        return service
+
+    def invalidate(self, token: Optional[str]) -> None:
+        """Remove the service of the token (e.g., because the token was revoked)."""
+        with self._lock:
+            self._services.pop(self._get_key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._services.clear()
+
+
+_SERVICE_CACHE: Optional[RuntimeServiceCache] = None
+_SERVICE_CACHE_LOCK = Lock()
+
+
+def get_service_cache() -> RuntimeServiceCache:
+    """Get the runtime service cache of this worker (configured by ``IBM_SERVICE_CACHE_SIZE`` and ``_TTL``)."""
+    global _SERVICE_CACHE
+    with _SERVICE_CACHE_LOCK:
+        if _SERVICE_CACHE is None:
+            config = current_app.config
+            _SERVICE_CACHE = RuntimeServiceCache(
+                config.get("IBM_SERVICE_CACHE_SIZE", DEFAULT_SERVICE_CACHE_SIZE),
+                config.get("IBM_SERVICE_CACHE_TTL", DEFAULT_SERVICE_CACHE_TTL),
+            )
+        return _SERVICE_CACHE
@@ -0,0 +1,129 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hashlib import sha256
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+from flask.globals import current_app
+
+from qunicorn_core.core.translation_cache import normalize_circuit
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.db.models.quantum_program import QuantumProgramDataclass
+from qunicorn_core.db.models.result import ResultDataclass
+from qunicorn_core.db.models.result_cache import CachedResultDataclass
+from qunicorn_core.static.enums.job_type import JobType
+from qunicorn_core.static.enums.result_type import ResultType
+
+"""
+Opt-in cache for the results of programs executed on local simulators.
+
+Results are keyed by a hash of the program, the device, the shots, the job type and the error mitigation.
+A job whose programs all have cached results is finished with copies of these results instead of being executed.
+Reused results are marked with a ``result_cache`` entry in their metadata that references the original result.
+"""
+
+
+def is_result_cache_enabled(job: JobDataclass) -> bool:
+    """Check if the results of the job can be reused by later jobs and the job can reuse the results of earlier jobs."""
+    device = job.executed_on
+    if not current_app.config.get("RESULT_CACHE", False) or device is None or not device.is_local:
+        return False
+    return job.type == JobType.RUNNER.value and job.cut_to_width is None
+
+
+def get_result_cache_key(job: JobDataclass, program: QuantumProgramDataclass) -> Optional[str]:
+    """Get the content address of the results of the program run by the job (None for empty programs)."""
+    if not program.quantum_circuit:
+        return None
+    device = job.executed_on
+    content_hash = sha256()
+    for part in (
+        device.provider.name if device.provider else "",
+        device.name,
+        str(job.shots),
+        job.type,
+        job.error_mitigation,
+        program.assembler_language or "",
+    ):
+        content_hash.update(part.encode())
+        content_hash.update(b"\0")
+    content_hash.update(normalize_circuit(program.quantum_circuit))
+    return content_hash.hexdigest()
+
+
+def _get_program_keys(job: JobDataclass) -> List[Tuple[str, QuantumProgramDataclass]]:
+    programs = job.deployment.programs if job.deployment else []
+    keys = [(get_result_cache_key(job, program), program) for program in programs]
+    return [(key, program) for key, program in keys if key is not None]
+
+
+def reuse_cached_results(job: JobDataclass) -> bool:
+    """Finish the job with copies of the cached results of its programs.
+
+    Returns:
+        bool: True if all programs had cached results and the job is finished, False if the job must be executed
+    """
+    program_keys = _get_program_keys(job)
+    if not program_keys:
+        return False
+
+    cached_results: Dict[str, List[ResultDataclass]] = {}
+    keys = list(set(key for key, _ in program_keys))
+    entries = sorted(CachedResultDataclass.get_by_cache_keys(keys), key=lambda e: (e.cache_key, e.id))
+    for key, key_entries in groupby(entries, lambda e: e.cache_key):
+        results = [e.result for e in key_entries]
+        # identical programs may have been cached by concurrent jobs, only use the results of one of these jobs
+        cached_results[key] = [r for r in results if r.job_id == results[0].job_id]
+
+    if any(key not in cached_results for key, _ in program_keys):
+        return False
+
+    reused_results = []
+    for key, program in program_keys:
+        for cached in cached_results[key]:
+            meta = dict(cached.meta or {})
+            meta["result_cache"] = {"job_id": cached.job_id, "result_id": cached.id}
+            reused_results.append(
+                ResultDataclass(
+                    program=program,
+                    data=cached.data,
+                    meta=meta,
+                    result_type=cached.result_type,
+                    encoded_data=cached.encoded_data,
+                )
+            )
+    job.save_results(reused_results)
+    current_app.logger.info(f"Reused the cached results of all programs of job {job.id}.")
+    return True
+
+
+def cache_job_results(job: JobDataclass):
+    """Add the results of all successfully executed programs of the finished job to the cache."""
+    program_keys = _get_program_keys(job)
+    cached_keys = set(e.cache_key for e in CachedResultDataclass.get_by_cache_keys([k for k, _ in program_keys]))
+
+    for key, program in program_keys:
+        if key in cached_keys:
+            continue
+        results = [r for r in job.results if r.program_id == program.id]
+        if not results or any(r.result_type == ResultType.ERROR for r in results):
+            continue
+        if any(r.meta and "result_cache" in r.meta for r in results):
+            continue  # reused results are already cached
+        for result in results:
+            CachedResultDataclass(cache_key=key, result=result).save()
+        cached_keys.add(key)
+    DB.session.commit()
@@ -0,0 +1,235 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask.globals import current_app
+from sqlalchemy.exc import IntegrityError
+
+from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.translation_cache import CachedTranslationDataclass
+
+"""
+Content addressed cache for circuit translations that is shared between all deployments.
+
+Translations are keyed by a hash of the source format, the normalized source circuit,
+the target format, the version of the registered transpilers and the transpiler exclusions.
+An in-process LRU cache (limited by the total size of the cached circuits) is placed in front of the database.
+"""
+
+DEFAULT_TRANSLATION_CACHE_SIZE = 64 * 2**20  # 64 MiB
+
+
+# formats that are python objects and can never be cached
+OBJECT_FORMATS = frozenset({"QISKIT", "BRAKET", "QRISP", "QUIL"})
+
+
+class CachedTranslation(NamedTuple):
+    circuit: str | bytes
+    translation_distance: int
+
+
+# marker for translations known to be missing from the database
+NOT_CACHED = CachedTranslation(b"", -1)
+
+
+class TranslationLRUCache:
+    """Thread safe LRU cache for translated circuits with a size based eviction strategy."""
+
+    def __init__(self, max_size: int = DEFAULT_TRANSLATION_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[str, CachedTranslation] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedTranslation]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedTranslation) -> None:
+        entry_size = max(len(entry.circuit), 1)
+        if entry_size > self.max_size:
+            return  # never cache circuits that would evict the whole cache
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self.size -= max(len(old_entry.circuit), 1)
+            self._entries[key] = entry
+            self.size += entry_size
+            while self.size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= max(len(evicted.circuit), 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_LRU_CACHE: Optional[TranslationLRUCache] = None
+
+
+def get_lru_cache() -> TranslationLRUCache:
+    """Get the in-process translation cache (configured with ``TRANSLATION_CACHE_SIZE`` in bytes)."""
+    global _LRU_CACHE
+    if _LRU_CACHE is None:
+        _LRU_CACHE = TranslationLRUCache(
+            current_app.config.get("TRANSLATION_CACHE_SIZE", DEFAULT_TRANSLATION_CACHE_SIZE)
+        )
+    return _LRU_CACHE
+
+
+def normalize_circuit(circuit: str | bytes) -> bytes:
+    """Normalize line endings and surrounding whitespace of text circuits so that equal circuits hash equally."""
+    if isinstance(circuit, bytes):
+        return circuit
+    lines = circuit.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip().encode()
+
+
+def get_cache_version() -> str:
+    """Get a hash of the registered transpilers and the transpiler exclusions of the current app config.
+
+    Translations created by transpilers that are excluded now must not be served from the cache.
+    """
+    config = current_app.config
+    content_hash = sha256(CircuitTranspiler.get_version().encode())
+    for option in ("EXCLUDE_TRANSPILERS", "EXCLUDE_FORMATS"):
+        content_hash.update(b"\0")
+        content_hash.update(",".join(sorted(str(e) for e in (config.get(option, None) or []))).encode())
+    content_hash.update(b"\0")
+    content_hash.update(str(bool(config.get("EXCLUDE_UNSAFE_TRANSPILERS", True))).encode())
+    return content_hash.hexdigest()
+
+
+def get_cacheable_formats() -> set[str]:
+    """Get all formats that transpilers can produce as strings or bytes (i.e., all formats that can be cached)."""
+    targets = {
+        t.target for source in CircuitTranspiler.get_known_formats() for t in CircuitTranspiler.get_transpilers(source)
+    }
+    return targets - OBJECT_FORMATS
+
+
+def _get_source_hash(source_language: str, circuit: str | bytes) -> str:
+    content_hash = sha256()
+    for part in (get_cache_version().encode(), source_language.encode()):
+        content_hash.update(part)
+        content_hash.update(b"\0")
+    content_hash.update(normalize_circuit(circuit))
+    return content_hash.hexdigest()
+
+
+def _get_key(source_hash: str, target_language: str) -> str:
+    return sha256(f"{source_hash}\0{target_language}".encode()).hexdigest()
+
+
+def get_translation_key(source_language: str, circuit: str | bytes, target_language: str) -> str:
+    """Get the content address of the translation of a circuit from the source to the target format."""
+    return _get_key(_get_source_hash(source_language, circuit), target_language)
+
+
+def get_cached_translations(
+    source_language: str, circuit: Any, target_languages: Optional[Sequence[str]] = None
+) -> List[Tuple[str, Any, int]]:
+    """Get all cached translations of a circuit.
+
+    Args:
+        source_language (str): the format of the source circuit
+        circuit (Any): the source circuit (only str and bytes circuits can be cached)
+        target_languages (Sequence[str], optional): the formats to look up. Defaults to all cacheable formats.
+
+    Returns:
+        List[Tuple[str, Any, int]]: (format, circuit, translation distance) tuples usable as transpilation sources
+    """
+    if not isinstance(circuit, (str, bytes)):
+        return []
+    if target_languages is None:
+        target_languages = sorted(get_cacheable_formats())
+
+    source_hash = _get_source_hash(source_language, circuit)
+    lru_cache = get_lru_cache()
+    translations: List[Tuple[str, Any, int]] = []
+    missing: dict[str, str] = {}
+
+    for target in target_languages:
+        if target == source_language:
+            continue
+        key = _get_key(source_hash, target)
+        entry = lru_cache.get(key)
+        if entry is None:
+            missing[key] = target
+        elif entry is not NOT_CACHED:
+            translations.append((target, entry.circuit, entry.translation_distance))
+
+    for cached in CachedTranslationDataclass.get_by_cache_keys(list(missing.keys())):
+        del missing[cached.cache_key]
+        entry = CachedTranslation(cached.circuit, cached.translation_distance)
+        lru_cache.put(cached.cache_key, entry)
+        translations.append((cached.assembler_language, entry.circuit, entry.translation_distance))
+
+    for key in missing:
+        # remember misses to avoid querying the database for every job of the same circuit
+        lru_cache.put(key, NOT_CACHED)
+
+    return translations
+
+
+def cache_translation(
+    source_language: str,
+    source_circuit: Any,
+    target_language: str,
+    translated_circuit: Any,
+    translation_distance: int,
+):
+    """Store a translation in the in-process cache and the database.
+
+    Only circuits that are strings or bytes can be cached. The database object is added to the current session
+    (in a savepoint to detect translations persisted concurrently), but the session is not committed.
+    """
+    if not isinstance(source_circuit, (str, bytes)) or not isinstance(translated_circuit, (str, bytes)):
+        return
+    if source_language == target_language:
+        return
+
+    key = get_translation_key(source_language, source_circuit, target_language)
+    lru_cache = get_lru_cache()
+    if lru_cache.get(key) not in (None, NOT_CACHED):
+        return  # already cached
+
+    lru_cache.put(key, CachedTranslation(translated_circuit, translation_distance))
+
+    if CachedTranslationDataclass.get_by_cache_key(key) is not None:
+        return  # already persisted
+
+    is_string = isinstance(translated_circuit, str)
+    try:
+        with DB.session.begin_nested():
+            CachedTranslationDataclass(
+                cache_key=key,
+                quantum_circuit=translated_circuit.encode() if is_string else translated_circuit,
+                is_string=is_string,
+                assembler_language=target_language,
+                translation_distance=translation_distance,
+            ).save()
+    except IntegrityError:
+        pass  # another worker persisted the same translation concurrently
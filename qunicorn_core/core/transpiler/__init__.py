@@ -12,7 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .circuit_transpiler import transpile_circuit, TranspilationError  # noqa
+from .circuit_transpiler import (  # noqa
+    CircuitTranspiler,
+    TranspilationError,
+    TranspilationResult,
+    transpile_circuit,
+    transpile_circuits,
+)
 
-# load transpile plugins
-from . import qiskit_transpiler, braket_transpiler, qrisp_transpiler, unsafe_transpilers  # noqa
+# Transpiler plugins with their metadata (module, class name, source, target, cost, unsafe).
+# The modules (and the quantum SDKs they depend on) are only imported once a transpiler is used.
+TRANSPILER_PLUGINS = (
+    ("qiskit_transpiler", "Qasm2ToQiskit", "QASM2", "QISKIT", 1, False),
+    ("qiskit_transpiler", "QiskitToQasm2", "QISKIT", "QASM2", 1, False),
+    ("qiskit_transpiler", "Qasm3ToQiskit", "QASM3", "QISKIT", 1, False),
+    ("qiskit_transpiler", "QiskitToQasm3", "QISKIT", "QASM3", 1, False),
+    ("qiskit_transpiler", "QPYToQiskit", "QPY", "QISKIT", 1, False),
+    ("qiskit_transpiler", "QiskitToQPY", "QISKIT", "QPY", 1, False),
+    ("braket_transpiler", "Qasm3ToBraket", "QASM3", "BRAKET", 2, False),
+    ("braket_transpiler", "BraketToQasm3", "BRAKET", "QASM3", 2, False),
+    ("qrisp_transpiler", "QiskitToQrisp", "QISKIT", "QRISP", 1, False),
+    ("qrisp_transpiler", "QrispToQiskit", "QRISP", "QISKIT", 1, False),
+    ("unsafe_transpilers", "QiskitPythonToQiskit", "QISKIT-PYTHON", "QISKIT", 1, True),
+    ("unsafe_transpilers", "BraketPythonToBraket", "BRAKET-PYTHON", "BRAKET", 1, True),
+    ("unsafe_transpilers", "QrispPythonToQrisp", "QRISP-PYTHON", "QRISP", 1, True),
+    ("unsafe_transpilers", "QuilPythonToQuil", "QUIL-PYTHON", "QUIL", 1, True),
+)
+
+for module, name, source, target, cost, unsafe in TRANSPILER_PLUGINS:
+    CircuitTranspiler.register_plugin(
+        f"{__name__}.{module}", name, source=source, target=target, cost=cost, unsafe=unsafe
+    )
@@ -12,8 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from hashlib import sha256
 from heapq import heappush, heappop
-from typing import ClassVar, Any, Sequence, Callable, Union, Optional, Type, cast
+from importlib import import_module
+from threading import Lock
+from time import perf_counter
+from typing import ClassVar, Any, Sequence, Callable, Union, Optional, Type, Hashable, Mapping, NamedTuple, cast
+
+# weight of a new sample in the exponentially weighted moving average of the measured transpiler costs
+MEASURED_COST_SMOOTHING = 0.2
 
 
 class TranspilationError(Exception):
@@ -25,6 +32,35 @@ class TranspilationError(Exception):
         self.circuit = circuit
 
 
+class ChainCacheInfo(NamedTuple):
+    """Statistics of the transpiler chain cache."""
+
+    hits: int
+    misses: int
+    size: int
+
+
+class TranspilationResult(NamedTuple):
+    """The result of transpiling a single circuit of a batch (see :py:func:`transpile_circuits`)."""
+
+    circuit: Any = None
+    error: Optional[Exception] = None
+
+
+class MeasuredCost(NamedTuple):
+    """The runtime cost of a transpiler learned from previous transpilations."""
+
+    # moving average of the transpilation time in seconds per circuit size unit (see get_circuit_size)
+    cost: float
+    samples: int
+
+    def update(self, sample: float) -> "MeasuredCost":
+        """Add a new sample to the exponentially weighted moving average."""
+        if self.samples == 0:
+            return MeasuredCost(cost=sample, samples=1)
+        return MeasuredCost(cost=self.cost + MEASURED_COST_SMOOTHING * (sample - self.cost), samples=self.samples + 1)
+
+
 class CircuitTranspiler:
     """Base class for all circuit transpilers.
 
@@ -45,18 +81,84 @@ class CircuitTranspiler:
     __known_formats: set[str] = set()
     __transpilers: dict[str, list["CircuitTranspiler"]] = {}
 
+    # cache for resolved transpiler chains (stores the KeyError message if no chain exists)
+    __chain_cache: dict[Hashable, Union[tuple["CircuitTranspiler", ...], str]] = {}
+    __chain_cache_hits: int = 0
+    __chain_cache_misses: int = 0
+
+    # hash over all registered transpilers, used to invalidate persisted translations
+    __version: Optional[str] = None
+
+    # learned runtime costs by qualified transpiler name and the samples not yet shared with other processes
+    __measured_costs: dict[str, MeasuredCost] = {}
+    __unpublished_samples: list[tuple[str, float]] = []
+    __measured_costs_lock = Lock()
+    # changes whenever the measured costs used for routing change (part of the chain cache key)
+    __measured_costs_generation: int = 0
+
     source: ClassVar[str] = ""
     target: ClassVar[str] = ""
     cost: ClassVar[int] = 1
     unsafe: ClassVar[bool] = False
 
-    def __init_subclass__(cls, source: str, target: str, cost: int = 1) -> None:
+    def __init_subclass__(cls, source: Optional[str] = None, target: Optional[str] = None, cost: int = 1) -> None:
+        if source is None or target is None:
+            return  # not a concrete transpiler (e.g., a base class for other transpilers)
         cls.source = source
         cls.target = target
         cls.cost = cost
+        transpilers = CircuitTranspiler.__transpilers.setdefault(source, [])
+        for index, transpiler in enumerate(transpilers):
+            if isinstance(transpiler, LazyTranspiler) and transpiler.qualified_name == cls.get_qualified_name():
+                # the module of a declared plugin was imported, replace the placeholder with the real transpiler
+                transpiler.check_metadata(cls)
+                transpilers[index] = transpiler.set_transpiler(cls())
+                return
+        CircuitTranspiler.__register(cls(), source, target)
+
+    @staticmethod
+    def __register(transpiler: "CircuitTranspiler", source: str, target: str) -> None:
         CircuitTranspiler.__known_formats.add(source)
         CircuitTranspiler.__known_formats.add(target)
-        CircuitTranspiler.__transpilers.setdefault(source, []).append(cls())
+        CircuitTranspiler.__transpilers.setdefault(source, []).append(transpiler)
+        # new transpilers may enable new or cheaper transpilation paths
+        CircuitTranspiler.clear_chain_cache()
+        CircuitTranspiler.__version = None
+
+    @staticmethod
+    def register_plugin(
+        module: str, name: str, *, source: str, target: str, cost: int = 1, unsafe: bool = False
+    ) -> None:
+        """Declare a transpiler without importing the module it is defined in.
+
+        The module is imported when the transpiler is used for the first time.
+
+        Args:
+            module (str): the module defining the transpiler class
+            name (str): the (qualified) name of the transpiler class in the module
+            source (str): the source format of the transpiler
+            target (str): the target format of the transpiler
+            cost (int, optional): the cost of the transpiler. Defaults to 1.
+            unsafe (bool, optional): True if the transpiler may execute unsafe code. Defaults to False.
+        """
+        lazy_transpiler = LazyTranspiler(module, name, source=source, target=target, cost=cost, unsafe=unsafe)
+        if any(t.qualified_name == lazy_transpiler.qualified_name for t in CircuitTranspiler.get_all_transpilers()):
+            return  # the transpiler is already registered
+        CircuitTranspiler.__register(lazy_transpiler, source, target)
+
+    @classmethod
+    def get_qualified_name(cls) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    @property
+    def qualified_name(self) -> str:
+        """The qualified name of the transpiler class (also available for transpilers that are not loaded yet)."""
+        return type(self).get_qualified_name()
+
+    @property
+    def names(self) -> set[str]:
+        """All names that can be used to exclude this transpiler."""
+        return {type(self).__name__, type(self).__qualname__}
 
     def _is_valid_operand(self, other):
         return isinstance(other, CircuitTranspiler)
@@ -64,17 +166,39 @@ class CircuitTranspiler:
     def __eq__(self, other):
         if not self._is_valid_operand(other):
             return NotImplemented
-        return type(self) is type(other)
+        return self.qualified_name == other.qualified_name
+
+    def __hash__(self):
+        return hash(self.qualified_name)
 
     def __lt__(self, other):
         if not self._is_valid_operand(other):
             return NotImplemented
-        return (self.cost, type(self).__name__.lower()) < (other.cost, type(other).__name__.lower())
+        return (self.cost, self.qualified_name.rsplit(".", 1)[-1].lower()) < (
+            other.cost,
+            other.qualified_name.rsplit(".", 1)[-1].lower(),
+        )
 
     def transpile_circuit(self, circuit: Any) -> Any:
         """Transpile the given circuit to the target format."""
         raise NotImplementedError()
 
+    def transpile_circuits(self, circuits: Sequence[Any]) -> list[Any]:
+        """Transpile a batch of circuits to the target format.
+
+        Override this method if the transpiler can process many circuits at once.
+
+        Returns:
+            list[Any]: the transpiled circuits, circuits that failed to transpile are replaced by the raised exception
+        """
+        transpiled: list[Any] = []
+        for circuit in circuits:
+            try:
+                transpiled.append(self.transpile_circuit(circuit))
+            except Exception as err:
+                transpiled.append(err)
+        return transpiled
+
     @staticmethod
     def get_known_formats() -> set[str]:
         """Get all known formats (i.e., set(target_formats) + set(source_formats))."""
@@ -98,7 +222,177 @@ class CircuitTranspiler:
             raise KeyError(f"'{source}' is an unknown circuit format!")
 
     @staticmethod
-    def _get_transpiler_chain(  # noqa: C901
+    def get_all_transpilers() -> Sequence["CircuitTranspiler"]:
+        """Get all registered transpilers (including declared plugins that are not loaded yet)."""
+        return tuple(t for transpilers in CircuitTranspiler.__transpilers.values() for t in transpilers)
+
+    @staticmethod
+    def get_version() -> str:
+        """Get a version hash identifying the set of registered transpilers.
+
+        The version changes whenever a transpiler is added, removed or changes its source, target or cost.
+        """
+        if CircuitTranspiler.__version is None:
+            transpilers = sorted(
+                f"{t.qualified_name}:{t.source}->{t.target}:{t.cost}" for t in CircuitTranspiler.get_all_transpilers()
+            )
+            CircuitTranspiler.__version = sha256("\n".join(transpilers).encode()).hexdigest()
+        return CircuitTranspiler.__version
+
+    @staticmethod
+    def clear_chain_cache() -> None:
+        """Remove all cached transpiler chains and reset the cache statistics."""
+        CircuitTranspiler.__chain_cache.clear()
+        CircuitTranspiler.__chain_cache_hits = 0
+        CircuitTranspiler.__chain_cache_misses = 0
+
+    @staticmethod
+    def get_chain_cache_info() -> ChainCacheInfo:
+        """Get the hit and miss counters and the current size of the transpiler chain cache."""
+        return ChainCacheInfo(
+            hits=CircuitTranspiler.__chain_cache_hits,
+            misses=CircuitTranspiler.__chain_cache_misses,
+            size=len(CircuitTranspiler.__chain_cache),
+        )
+
+    @staticmethod
+    def record_measured_cost(transpiler: "CircuitTranspiler", seconds: float, circuit_size: int) -> None:
+        """Record the time a transpiler needed for a circuit of the given size.
+
+        The sample only updates the local moving average used for routing. Chains resolved by
+        :py:meth:`get_transpilers_limit_measured_cost` change once :py:meth:`set_measured_costs` is called.
+        """
+        CircuitTranspiler.record_measured_cost_sample(transpiler.qualified_name, seconds / max(circuit_size, 1))
+
+    @staticmethod
+    def record_measured_cost_sample(name: str, sample: float) -> None:
+        """Record a cost sample (seconds per circuit size unit) of the transpiler with the given qualified name."""
+        with CircuitTranspiler.__measured_costs_lock:
+            current = CircuitTranspiler.__measured_costs.get(name, MeasuredCost(cost=0.0, samples=0))
+            CircuitTranspiler.__measured_costs[name] = current.update(sample)
+            CircuitTranspiler.__unpublished_samples.append((name, sample))
+
+    @staticmethod
+    def pop_measured_cost_samples() -> list[tuple[str, float]]:
+        """Get and remove all normalized cost samples recorded since the last call (by qualified transpiler name)."""
+        with CircuitTranspiler.__measured_costs_lock:
+            samples = CircuitTranspiler.__unpublished_samples
+            CircuitTranspiler.__unpublished_samples = []
+        return samples
+
+    @staticmethod
+    def get_measured_costs() -> dict[str, MeasuredCost]:
+        """Get the learned runtime costs of all transpilers that were measured (by qualified transpiler name)."""
+        with CircuitTranspiler.__measured_costs_lock:
+            return dict(CircuitTranspiler.__measured_costs)
+
+    @staticmethod
+    def set_measured_costs(costs: Mapping[str, MeasuredCost]) -> None:
+        """Replace the learned runtime costs (e.g., with the costs learned by all workers) used for routing."""
+        with CircuitTranspiler.__measured_costs_lock:
+            if costs == CircuitTranspiler.__measured_costs:
+                return
+            CircuitTranspiler.__measured_costs = dict(costs)
+            CircuitTranspiler.__measured_costs_generation += 1
+            # drop chains resolved with the old costs, they can never be hit again
+            for key in list(CircuitTranspiler.__chain_cache):
+                cost_key = cast(tuple, key)[0]
+                if isinstance(cost_key, tuple) and cost_key[0] == "measured":
+                    CircuitTranspiler.__chain_cache.pop(key, None)
+
+    @staticmethod
+    def get_measured_cost(transpiler: "CircuitTranspiler") -> float:
+        """Get the learned runtime cost of a transpiler.
+
+        Transpilers that were not measured yet are estimated by scaling their static cost with
+        the average measured cost of all other transpilers.
+        """
+        with CircuitTranspiler.__measured_costs_lock:
+            measured = CircuitTranspiler.__measured_costs.get(transpiler.qualified_name)
+            if measured is not None:
+                return measured.cost
+            costs = [c.cost for c in CircuitTranspiler.__measured_costs.values()]
+        if not costs:
+            return transpiler.cost
+        return transpiler.cost * sum(costs) / len(costs)
+
+    @staticmethod
+    def _get_chain_cache_key(
+        cost_key: Hashable,
+        source: Union[str, Sequence[Union[str, tuple[str, int]]]],
+        target: str,
+        exclude: Optional[set[Union[str, Type["CircuitTranspiler"]]]],
+        exclude_formats: Optional[set[str]],
+        exclude_unsafe: bool,
+    ) -> Hashable:
+        """Build a hashable cache key for a chain search that does not depend on the order of the source formats."""
+        if isinstance(source, str):
+            sources = frozenset(((source, 0),))
+        else:
+            sources = frozenset(s if isinstance(s, tuple) else (s, 0) for s in source)
+        return (
+            cost_key,
+            sources,
+            target,
+            frozenset(exclude) if exclude else frozenset(),
+            frozenset(exclude_formats) if exclude_formats else frozenset(),
+            bool(exclude_unsafe),
+        )
+
+    @staticmethod
+    def _get_transpiler_chain(
+        source: Union[str, Sequence[Union[str, tuple[str, int]]]],
+        target: str,
+        *,
+        cost: Callable[["CircuitTranspiler"], float],
+        exclude: Optional[set[Union[str, Type["CircuitTranspiler"]]]] = None,
+        exclude_formats: Optional[set[str]] = None,
+        exclude_unsafe: bool = False,
+        cost_key: Optional[Hashable] = None,
+    ) -> Sequence["CircuitTranspiler"]:
+        """Get a list of transpilers from source to target minimizing overall transpilation cost.
+
+        If a ``cost_key`` identifying the cost function is given, the resolved chain (or the
+        information that no chain exists) is cached until a new transpiler is registered.
+        """
+        if cost_key is None:
+            return CircuitTranspiler._search_transpiler_chain(
+                source,
+                target,
+                cost=cost,
+                exclude=exclude,
+                exclude_formats=exclude_formats,
+                exclude_unsafe=exclude_unsafe,
+            )
+
+        key = CircuitTranspiler._get_chain_cache_key(cost_key, source, target, exclude, exclude_formats, exclude_unsafe)
+        cached = CircuitTranspiler.__chain_cache.get(key)
+        if cached is not None:
+            CircuitTranspiler.__chain_cache_hits += 1
+            if isinstance(cached, str):
+                raise KeyError(cached)
+            return cached
+
+        CircuitTranspiler.__chain_cache_misses += 1
+        try:
+            chain = tuple(
+                CircuitTranspiler._search_transpiler_chain(
+                    source,
+                    target,
+                    cost=cost,
+                    exclude=exclude,
+                    exclude_formats=exclude_formats,
+                    exclude_unsafe=exclude_unsafe,
+                )
+            )
+        except KeyError as err:
+            CircuitTranspiler.__chain_cache[key] = str(err.args[0]) if err.args else ""
+            raise
+        CircuitTranspiler.__chain_cache[key] = chain
+        return chain
+
+    @staticmethod
+    def _search_transpiler_chain(  # noqa: C901
         source: Union[str, Sequence[Union[str, tuple[str, int]]]],
         target: str,
         *,
@@ -107,7 +401,7 @@ class CircuitTranspiler:
         exclude_formats: Optional[set[str]] = None,
         exclude_unsafe: bool = False,
     ) -> Sequence["CircuitTranspiler"]:
-        """Get a list of transpilers from source to target minimizing overall transpilation cost."""
+        """Search for the transpiler chain from source to target with the lowest cost (uncached)."""
         if exclude_formats and target in exclude_formats:
             raise ValueError("Cannot transpile to an excluded target format!")
         frontier: list[tuple[float, str, tuple[CircuitTranspiler, ...]]] = []
@@ -150,16 +444,24 @@ class CircuitTranspiler:
                     continue  # transpiler is not safe, i.e., may execute arbitrary code
                 if exclude_formats and transpiler.target in exclude_formats:
                     continue  # format is excluded from transpilation
-                if exclude:
-                    t_class = type(transpiler)
-                    if t_class in exclude or t_class.__name__ in exclude or t_class.__qualname__ in exclude:
-                        continue  # transpiler was specifically excluded
+                if exclude and CircuitTranspiler._is_excluded(transpiler, exclude):
+                    continue  # transpiler was specifically excluded
                 if transpiler in current[2]:
                     continue  # transpiler was already used in this chain
                 heappush(frontier, (current[0] + cost(transpiler), transpiler.target, (*current[2], transpiler)))
 
         raise KeyError(f"There is no transpilation path from '{source}' to '{target}'.")
 
+    @staticmethod
+    def _is_excluded(transpiler: "CircuitTranspiler", exclude: set[Union[str, Type["CircuitTranspiler"]]]) -> bool:
+        for excluded in exclude:
+            if isinstance(excluded, str):
+                if excluded in transpiler.names:
+                    return True
+            elif excluded.get_qualified_name() == transpiler.qualified_name:
+                return True
+        return False
+
     @staticmethod
     def get_transpilers_limit_depth(
         source: Union[str, Sequence[Union[str, tuple[str, int]]]],
@@ -177,6 +479,7 @@ class CircuitTranspiler:
             exclude=exclude,
             exclude_formats=exclude_formats,
             exclude_unsafe=exclude_unsafe,
+            cost_key="depth",
         )
 
     @staticmethod
@@ -196,9 +499,236 @@ class CircuitTranspiler:
             exclude=exclude,
             exclude_formats=exclude_formats,
             exclude_unsafe=exclude_unsafe,
+            cost_key="cost",
+        )
+
+    @staticmethod
+    def get_transpilers_limit_measured_cost(
+        source: Union[str, Sequence[Union[str, tuple[str, int]]]],
+        target: str,
+        *,
+        exclude: Optional[set[Union[str, Type["CircuitTranspiler"]]]] = None,
+        exclude_formats: Optional[set[str]] = None,
+        exclude_unsafe: bool = False,
+    ) -> Sequence["CircuitTranspiler"]:
+        """Get a list of transpilers from source to target format using the measured transpiler runtime costs."""
+        return CircuitTranspiler._get_transpiler_chain(
+            source,
+            target,
+            cost=CircuitTranspiler.get_measured_cost,
+            exclude=exclude,
+            exclude_formats=exclude_formats,
+            exclude_unsafe=exclude_unsafe,
+            cost_key=("measured", CircuitTranspiler.__measured_costs_generation),
         )
 
 
+class LazyTranspiler(CircuitTranspiler):
+    """Placeholder for a declared transpiler plugin that imports the module of the transpiler on first use."""
+
+    def __init__(self, module: str, name: str, *, source: str, target: str, cost: int, unsafe: bool) -> None:
+        self.module = module
+        self.name = name
+        # shadow the class variables with the declared metadata
+        self.source = source  # type: ignore
+        self.target = target  # type: ignore
+        self.cost = cost  # type: ignore
+        self.unsafe = unsafe  # type: ignore
+        self._transpiler: Optional[CircuitTranspiler] = None
+        self._lock = Lock()
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.module}.{self.name}"
+
+    @property
+    def names(self) -> set[str]:
+        return {self.name, self.name.rsplit(".", 1)[-1]}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._transpiler is not None
+
+    def check_metadata(self, transpiler_class: Type[CircuitTranspiler]) -> None:
+        """Check that the declared metadata matches the loaded transpiler class."""
+        declared = (self.source, self.target, self.cost, self.unsafe)
+        actual = (transpiler_class.source, transpiler_class.target, transpiler_class.cost, transpiler_class.unsafe)
+        if declared != actual:
+            raise ValueError(
+                f"The declared transpiler plugin {self.qualified_name} {declared} does not match "
+                f"the transpiler class {actual}!"
+            )
+
+    def set_transpiler(self, transpiler: CircuitTranspiler) -> CircuitTranspiler:
+        self._transpiler = transpiler
+        return transpiler
+
+    def load(self) -> CircuitTranspiler:
+        """Import the module of the transpiler (the transpiler registers itself on import)."""
+        if self._transpiler is None:
+            with self._lock:
+                if self._transpiler is None:
+                    import_module(self.module)
+        if self._transpiler is None:
+            raise ImportError(f"The module '{self.module}' does not define the transpiler '{self.name}'!")
+        return self._transpiler
+
+    def transpile_circuit(self, circuit: Any) -> Any:
+        return self.load().transpile_circuit(circuit)
+
+
+ROUTING_MODES: dict[str, Callable[..., Sequence[CircuitTranspiler]]] = {
+    "depth": CircuitTranspiler.get_transpilers_limit_depth,
+    "cost": CircuitTranspiler.get_transpilers_limit_cost,
+    "measured": CircuitTranspiler.get_transpilers_limit_measured_cost,
+}
+
+
+def get_routing_mode(routing: str) -> Callable[..., Sequence[CircuitTranspiler]]:
+    """Get the function resolving transpiler chains for a routing mode (see :py:data:`ROUTING_MODES`)."""
+    try:
+        return ROUTING_MODES[routing]
+    except KeyError:
+        raise ValueError(f"Unknown routing mode '{routing}'!")
+
+
+def get_circuit_size(circuit: Any) -> int:
+    """Get the size of a circuit used to normalize the measured transpiler costs.
+
+    The size is the number of lines of text based formats and the number of instructions of circuit objects.
+    """
+    if isinstance(circuit, str):
+        return circuit.count("\n") + 1
+    if isinstance(circuit, bytes):
+        return circuit.count(b"\n") + 1
+    for attribute in ("data", "instructions"):
+        # qiskit and qrisp circuits store their instructions in data, braket and pyquil in instructions
+        instructions = getattr(circuit, attribute, None)
+        if isinstance(instructions, Sequence):
+            return len(instructions)
+    return 1
+
+
+def _transpile_and_measure(transpiler: CircuitTranspiler, circuit: Any) -> Any:
+    """Transpile the circuit and record the runtime cost of the transpiler."""
+    if isinstance(transpiler, LazyTranspiler):
+        transpiler.load()  # do not measure the import of the transpiler
+    start = perf_counter()
+    transpiled_circuit = transpiler.transpile_circuit(circuit)
+    CircuitTranspiler.record_measured_cost(transpiler, perf_counter() - start, get_circuit_size(circuit))
+    return transpiled_circuit
+
+
+def _transpile_batch_and_measure(
+    transpiler: CircuitTranspiler, batch: Sequence[tuple[int, Any, int]], results: list[Optional[TranspilationResult]]
+) -> list[tuple[int, Any, int]]:
+    """Transpile a batch of (index, circuit, cost) tuples and record the runtime cost of the transpiler.
+
+    Errors are stored in ``results`` and the failed circuits are removed from the returned batch.
+    """
+    if isinstance(transpiler, LazyTranspiler):
+        transpiler.load()  # do not measure the import of the transpiler
+    circuits = [circuit for _, circuit, _ in batch]
+    start = perf_counter()
+    transpiled_circuits = transpiler.transpile_circuits(circuits)
+    CircuitTranspiler.record_measured_cost(
+        transpiler, perf_counter() - start, sum(get_circuit_size(circuit) for circuit in circuits)
+    )
+    assert len(transpiled_circuits) == len(batch), "A transpiler must return one result per circuit."
+
+    transpiled_batch = []
+    for (index, circuit, cost), transpiled in zip(batch, transpiled_circuits):
+        if isinstance(transpiled, Exception):
+            error = TranspilationError(transpiler, circuit)
+            error.__cause__ = transpiled
+            results[index] = TranspilationResult(error=error)
+        else:
+            transpiled_batch.append((index, transpiled, cost + transpiler.cost))
+    return transpiled_batch
+
+
+def transpile_circuits(  # noqa: C901
+    target: str,
+    circuits: Sequence[Sequence[tuple[str, Any, int]]],
+    *,
+    exclude: Optional[set[Union[str, Type[CircuitTranspiler]]]] = None,
+    exclude_formats: Optional[set[str]] = None,
+    exclude_unsafe: bool = False,
+    visitor: Optional[Callable[[int, str, Any, int], None]] = None,
+    routing: str = "depth",
+) -> list[TranspilationResult]:
+    """Transpile a batch of circuits (each available in one or more source formats) to a specific target format.
+
+    The transpiler chain is resolved once for all circuits available in the same source formats.
+    Each transpiler of a chain transpiles all circuits of the batch at once (see
+    :py:meth:`CircuitTranspiler.transpile_circuits`).
+
+    Args:
+        target (str): the target format for transpilation
+        circuits (Sequence[Sequence[tuple[str, Any, int]]]): the source formats of every circuit,
+        see :py:func:`transpile_circuit`
+        exclude, exclude_formats, exclude_unsafe, routing: see :py:func:`transpile_circuit`
+        visitor (Callable[[int, str, Any, int], None]], optional): gets called with the index of the circuit
+        for every translated circuit.
+
+    Raises:
+        ValueError: If the routing mode is unknown.
+
+    Returns:
+        list[TranspilationResult]: the transpiled circuit or the error (a ValueError, KeyError or
+        TranspilationError, see :py:func:`transpile_circuit`) for every circuit
+    """
+    get_transpiler_chain = get_routing_mode(routing)
+
+    results: list[Optional[TranspilationResult]] = [None] * len(circuits)
+    chains: dict[Hashable, Union[tuple[CircuitTranspiler, ...], Exception]] = {}
+    # (index, circuit, cost) of the circuits that need to be transpiled grouped by transpiler chain
+    batches: dict[tuple[CircuitTranspiler, ...], list[tuple[int, Any, int]]] = {}
+
+    for index, circuit in enumerate(circuits):
+        if len(circuit) == 0:
+            results[index] = TranspilationResult(error=ValueError("Must provide a circuit to compile!"))
+            continue
+        available = next((c for source, c, _ in circuit if source == target), None)
+        if available is not None:
+            results[index] = TranspilationResult(circuit=available)
+            continue
+
+        source_format: Hashable = circuit[0][0] if len(circuit) == 1 else tuple((c[0], c[2]) for c in circuit)
+        if source_format not in chains:
+            try:
+                chains[source_format] = tuple(
+                    get_transpiler_chain(
+                        source=source_format,
+                        target=target,
+                        exclude=exclude,
+                        exclude_formats=exclude_formats,
+                        exclude_unsafe=exclude_unsafe,
+                    )
+                )
+            except (KeyError, ValueError) as err:
+                chains[source_format] = err
+        chain = chains[source_format]
+        if isinstance(chain, Exception):
+            results[index] = TranspilationResult(error=chain)
+            continue
+
+        assert len(chain) > 0, "There should always be at least one transpiler present."
+        start_circuit, start_cost = next((c, cost) for source, c, cost in circuit if source == chain[0].source)
+        batches.setdefault(chain, []).append((index, start_circuit, start_cost))
+
+    for chain, batch in batches.items():
+        for transpiler in chain:
+            batch = _transpile_batch_and_measure(transpiler, batch, results)
+            if visitor:
+                for index, transpiled, cost in batch:
+                    visitor(index, transpiler.target, transpiled, cost)
+        for index, transpiled, _ in batch:
+            results[index] = TranspilationResult(circuit=transpiled)
+
+    return cast(list[TranspilationResult], results)
+
+
 def transpile_circuit(
     target: str,
     *circuit: tuple[str, Any, int],
@@ -206,6 +736,7 @@ def transpile_circuit(
     exclude_formats: Optional[set[str]] = None,
     exclude_unsafe: bool = False,
     visitor: Optional[Callable[[str, Any, int], None]] = None,
+    routing: str = "depth",
 ) -> Any:
     """Transpile a circuit available in one or more source formats to a specific target format.
 
@@ -218,9 +749,11 @@ def transpile_circuit(
         exclude_unsafe (bool, optional): exclude unsafe transpilers from transpilation.
         Defaults to False.
         visitor (Callable[[str, Any, int], None]], optional): gets called for every translated circuit.
+        routing (str, optional): how to choose the transpiler chain, one of "depth" (fewest steps),
+        "cost" (lowest static cost) or "measured" (lowest measured runtime). Defaults to "depth".
 
     Raises:
-        ValueError: If no circuit is provided or either the target format or all
+        ValueError: If no circuit is provided, the routing mode is unknown or either the target format or all
         source formats are excluded by `exclude_formats`.
         KeyError: If no transpilation chain could be found to transpile the circuit to the target format.
         TranspilationError: If a transpilation step fails.
@@ -240,7 +773,7 @@ def transpile_circuit(
             # return fast if target format is already available
             return c
 
-    transpiler_chain = CircuitTranspiler.get_transpilers_limit_depth(
+    transpiler_chain = get_routing_mode(routing)(
         source=source_format,
         target=target,
         exclude=exclude,
@@ -257,7 +790,7 @@ def transpile_circuit(
 
     for transpiler in transpiler_chain:
         try:
-            current_circuit = transpiler.transpile_circuit(current_circuit)
+            current_circuit = _transpile_and_measure(transpiler, current_circuit)
             current_cost += transpiler.cost
         except Exception as err:
             raise TranspilationError(transpiler, current_circuit) from err
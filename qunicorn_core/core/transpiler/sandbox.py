@@ -0,0 +1,284 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process pool for transpilers that execute user provided code.
+
+The pool keeps a number of pre-started worker processes that already imported the quantum SDKs.
+Every call is limited in CPU time, wall clock time and memory, so that a runaway script cannot block the
+celery worker. Each call runs in its own worker process, a worker exceeding its limits is killed and replaced
+without affecting the calls running in the other workers. The limits protect the worker from resource exhaustion,
+but the sandbox is *not* a security boundary (results are exchanged with the worker processes via pickle).
+"""
+
+import atexit
+import signal
+from importlib import import_module
+from math import ceil
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.connection import Connection
+from queue import Empty, Queue
+from threading import Lock
+from typing import Any, Callable, NamedTuple, Optional
+
+from flask import has_app_context
+from flask.globals import current_app
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # resource limits are not supported on windows
+
+# modules imported by every worker process before the first circuit is transpiled
+PRELOADED_MODULES = ("qiskit", "qiskit.qpy", "braket.circuits", "qrisp", "pyquil")
+
+# additional time (in seconds) to wait for a worker process to report a timeout itself before it is killed
+TIMEOUT_GRACE_PERIOD = 5
+
+
+class SandboxError(Exception):
+    """Error raised if a sandboxed call was aborted because it exceeded its limits."""
+
+
+class SandboxConfig(NamedTuple):
+    pool_size: int = 2
+    cpu_time_limit: int = 30  # seconds
+    timeout: int = 60  # seconds (wall clock time)
+    memory_limit: Optional[int] = 2**30  # bytes
+
+
+def _init_worker(memory_limit: Optional[int]):
+    for module in PRELOADED_MODULES:
+        import_module(module)
+    limit_memory(memory_limit)
+
+
+def limit_memory(memory_limit: Optional[int]):
+    """Limit the address space of the current process (used by processes that run unsafe transpilers)."""
+    if resource is not None and memory_limit:
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        if hard_limit != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard_limit)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard_limit))
+
+
+def _warm_up(argument: Any) -> bool:
+    return True
+
+
+def _raise_timeout(signum, frame):
+    raise SandboxError("Sandboxed transpilation exceeded its time limit!")
+
+
+def _run_limited(func: Callable[[Any], Any], argument: Any, cpu_time_limit: int, timeout: int) -> Any:
+    """Run the function in the worker process with a CPU time and a wall clock time limit."""
+    if resource is None:
+        return func(argument)
+
+    # RLIMIT_CPU counts the total CPU time of the process, the limit must be relative to the current usage
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used_cpu_time = ceil(usage.ru_utime + usage.ru_stime)
+    soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+    call_limit = used_cpu_time + cpu_time_limit
+    if hard_limit != resource.RLIM_INFINITY:
+        call_limit = min(call_limit, hard_limit)
+    resource.setrlimit(resource.RLIMIT_CPU, (call_limit, hard_limit))
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.alarm(timeout)
+    try:
+        return func(argument)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft_limit, hard_limit))
+
+
+def _worker_main(connection: Connection, memory_limit: Optional[int]):
+    """Main loop of a sandbox worker process, runs one call at a time until the connection is closed."""
+    _init_worker(memory_limit)
+    while True:
+        try:
+            call = connection.recv()
+        except (EOFError, OSError):
+            return  # the parent process closed the connection
+        if call is None:
+            return
+        try:
+            connection.send((True, _run_limited(*call)))
+        except Exception as err:
+            try:
+                connection.send((False, err))
+            except Exception:
+                connection.send((False, SandboxError(f"Sandboxed transpilation failed: {err!r}")))
+
+
+class _SandboxWorker:
+    """A single worker process of the sandbox."""
+
+    def __init__(self, context, memory_limit: Optional[int]) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_connection, memory_limit), daemon=False)
+        self.process.start()
+        child_connection.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def call(self, func: Callable[[Any], Any], argument: Any, cpu_time_limit: int, timeout: int) -> Any:
+        """Run the call in the worker process, the worker is killed if it does not respond in time."""
+        try:
+            self.connection.send((func, argument, cpu_time_limit, timeout))
+            # the worker enforces the timeout itself, only wait longer as a fallback
+            if not self.connection.poll(timeout + TIMEOUT_GRACE_PERIOD):
+                self.kill()
+                raise SandboxError(f"Sandboxed transpilation exceeded the time limit of {timeout}s.")
+            success, result = self.connection.recv()
+        except (EOFError, OSError) as err:
+            # the worker was killed, e.g., because it exceeded the CPU time limit
+            self.kill()
+            raise SandboxError(
+                f"Sandboxed transpilation was aborted (CPU time limit of {cpu_time_limit}s or memory limit exceeded)."
+            ) from err
+        if success:
+            return result
+        raise result
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class TranspilerSandbox:
+    """A pool of pre-started worker processes to run untrusted transpilation code in.
+
+    Every call gets a worker process for itself, callers wait until a worker is available
+    (waiting does not count towards the time limit of the call).
+    """
+
+    def __init__(self, config: SandboxConfig) -> None:
+        self.config = config
+        self._context = None
+        self._lock = Lock()
+        # idle workers, None marks a free slot without a started worker
+        self._idle: Queue[Optional[_SandboxWorker]] = Queue()
+        for _ in range(config.pool_size):
+            self._idle.put(None)
+
+    def _start_worker(self) -> _SandboxWorker:
+        with self._lock:
+            if self._context is None:
+                start_method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+                self._context = get_context(start_method)
+                if start_method == "forkserver":
+                    self._context.set_forkserver_preload(list(PRELOADED_MODULES))
+        return _SandboxWorker(self._context, self.config.memory_limit)
+
+    def start(self):
+        """Start the worker processes so that the first call does not pay the startup and import cost."""
+        workers = [self._idle.get() for _ in range(self.config.pool_size)]
+        try:
+            for index, worker in enumerate(workers):
+                if worker is None or not worker.is_alive():
+                    workers[index] = worker = self._start_worker()
+                worker.call(_warm_up, None, self.config.cpu_time_limit, self.config.timeout)
+        finally:
+            for worker in workers:
+                self._idle.put(worker if worker is not None and worker.is_alive() else None)
+
+    def shutdown(self):
+        """Stop all idle worker processes (workers that are currently running a call are stopped later)."""
+        stopped = 0
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Empty:
+                break
+            stopped += 1
+            if worker is not None:
+                worker.stop()
+        for _ in range(stopped):
+            self._idle.put(None)
+
+    def run(self, func: Callable[[Any], Any], argument: Any) -> Any:
+        """Run ``func(argument)`` in a worker process.
+
+        The function and its argument must be picklable, and the result should be a serialized circuit.
+
+        Raises:
+            SandboxError: If the call exceeded its time limits or the worker process was killed.
+        """
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.is_alive():
+                worker = self._start_worker()
+            return worker.call(func, argument, self.config.cpu_time_limit, self.config.timeout)
+        finally:
+            # a worker exceeding its limits was killed, the next caller starts a new worker in its slot
+            self._idle.put(worker if worker is not None and worker.is_alive() else None)
+
+
+_SANDBOX: Optional[TranspilerSandbox] = None
+_SANDBOX_LOCK = Lock()
+
+
+def is_sandbox_enabled() -> bool:
+    """Check if unsafe transpilers should run in the sandbox (config ``UNSAFE_TRANSPILER_SANDBOX``)."""
+    if not has_app_context():
+        return True
+    return bool(current_app.config.get("UNSAFE_TRANSPILER_SANDBOX", True))
+
+
+def get_sandbox_config() -> SandboxConfig:
+    """Get the sandbox limits configured in the app config."""
+    defaults = SandboxConfig()
+    config = current_app.config if has_app_context() else {}
+    return SandboxConfig(
+        pool_size=config.get("UNSAFE_TRANSPILER_POOL_SIZE", defaults.pool_size),
+        cpu_time_limit=config.get("UNSAFE_TRANSPILER_CPU_TIME_LIMIT", defaults.cpu_time_limit),
+        timeout=config.get("UNSAFE_TRANSPILER_TIMEOUT", defaults.timeout),
+        memory_limit=config.get("UNSAFE_TRANSPILER_MEMORY_LIMIT", defaults.memory_limit),
+    )
+
+
+def get_sandbox() -> TranspilerSandbox:
+    """Get the sandbox of the current process configured from the app config."""
+    global _SANDBOX
+    with _SANDBOX_LOCK:
+        if _SANDBOX is None:
+            _SANDBOX = TranspilerSandbox(get_sandbox_config())
+            atexit.register(_SANDBOX.shutdown)
+        return _SANDBOX
+
+
+def run_with_limits(func: Callable[[Any], Any], argument: Any, config: SandboxConfig) -> Any:
+    """Run ``func(argument)`` in the current process with the CPU time and wall clock time limits of the sandbox.
+
+    Only use this in processes that can be killed if the CPU time limit is exceeded.
+    """
+    return _run_limited(func, argument, config.cpu_time_limit, config.timeout)
+
+
+def run_in_sandbox(func: Callable[[Any], Any], argument: Any) -> Any:
+    """Run ``func(argument)`` in the sandbox of the current process."""
+    return get_sandbox().run(func, argument)
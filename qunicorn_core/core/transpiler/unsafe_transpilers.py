@@ -12,21 +12,55 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pickle
+from io import BytesIO
 from typing import Any
 
 from pyquil import Program
 from qrisp import QuantumCircuit as QrispQC
 
 from braket.circuits import Circuit  # noqa
-from qiskit import QuantumCircuit  # noqa
+from qiskit import QuantumCircuit, qpy  # noqa
 
 from .circuit_transpiler import CircuitTranspiler
+from .sandbox import is_sandbox_enabled, run_in_sandbox
 
 
-class QiskitPythonToQiskit(CircuitTranspiler, source="QISKIT-PYTHON", target="QISKIT", cost=1):
+class SandboxedTranspiler:
+    """Mixin for transpilers that execute user code.
+
+    The user code is executed by :py:meth:`execute_circuit_code` in a sandboxed worker process.
+    Only the serialized circuit (e.g., QPY or QASM) produced by :py:meth:`serialize` is sent back.
+    """
+
+    @classmethod
+    def execute_circuit_code(cls, circuit: Any) -> Any:
+        """Execute the circuit code and return the created circuit object."""
+        raise NotImplementedError()
+
+    @classmethod
+    def serialize(cls, circuit: Any) -> str | bytes:
+        raise NotImplementedError()
+
+    @classmethod
+    def deserialize(cls, circuit: str | bytes) -> Any:
+        raise NotImplementedError()
+
+    @classmethod
+    def execute_and_serialize(cls, circuit: Any) -> str | bytes:
+        return cls.serialize(cls.execute_circuit_code(circuit))
+
+    def transpile_circuit(self, circuit: Any) -> Any:
+        if not is_sandbox_enabled():
+            return self.execute_circuit_code(circuit)
+        return self.deserialize(run_in_sandbox(type(self).execute_and_serialize, circuit))
+
+
+class QiskitPythonToQiskit(SandboxedTranspiler, CircuitTranspiler, source="QISKIT-PYTHON", target="QISKIT", cost=1):
     unsafe = True
 
-    def transpile_circuit(self, circuit: Any) -> QuantumCircuit:
+    @classmethod
+    def execute_circuit_code(cls, circuit: Any) -> QuantumCircuit:
         circuit_globals = {"QuantumCircuit": QuantumCircuit}
         exec(circuit, circuit_globals)
         try:
@@ -40,11 +74,25 @@ class QiskitPythonToQiskit(CircuitTranspiler, source="QISKIT-PYTHON", target="QI
             f"(Expected {QuantumCircuit}, but got {type(qiskit_circuit)})"
         )
 
+    @classmethod
+    def serialize(cls, circuit: QuantumCircuit) -> bytes:
+        buffer = BytesIO()
+        qpy.dump(circuit, buffer)
+        return buffer.getvalue()
 
-class BraketPythonToBraket(CircuitTranspiler, source="BRAKET-PYTHON", target="BRAKET", cost=1):
+    @classmethod
+    def deserialize(cls, circuit: str | bytes) -> QuantumCircuit:
+        assert isinstance(circuit, bytes)
+        programs = qpy.load(BytesIO(circuit))
+        assert len(programs) == 1 and isinstance(programs[0], QuantumCircuit)
+        return programs[0]
+
+
+class BraketPythonToBraket(SandboxedTranspiler, CircuitTranspiler, source="BRAKET-PYTHON", target="BRAKET", cost=1):
     unsafe = True
 
-    def transpile_circuit(self, circuit: Any) -> Circuit:
+    @classmethod
+    def execute_circuit_code(cls, circuit: Any) -> Circuit:
         circuit_globals = {"Circuit": Circuit}
         braket_circuit = eval(circuit, circuit_globals)
         if isinstance(braket_circuit, Circuit):
@@ -53,11 +101,24 @@ class BraketPythonToBraket(CircuitTranspiler, source="BRAKET-PYTHON", target="BR
             f"The circuit type does not match the expected type. (Expected {Circuit}, but got {type(braket_circuit)})"
         )
 
+    @classmethod
+    def serialize(cls, circuit: Circuit) -> bytes:
+        # the OpenQASM export adds measurements which are not restored correctly by Circuit.from_ir
+        return pickle.dumps(circuit)
+
+    @classmethod
+    def deserialize(cls, circuit: str | bytes) -> Circuit:
+        assert isinstance(circuit, bytes)
+        braket_circuit = pickle.loads(circuit)
+        assert isinstance(braket_circuit, Circuit)
+        return braket_circuit
+
 
-class QrispPythonToQrisp(CircuitTranspiler, source="QRISP-PYTHON", target="QRISP", cost=1):
+class QrispPythonToQrisp(SandboxedTranspiler, CircuitTranspiler, source="QRISP-PYTHON", target="QRISP", cost=1):
     unsafe = True
 
-    def transpile_circuit(self, circuit: Any) -> QrispQC:
+    @classmethod
+    def execute_circuit_code(cls, circuit: Any) -> QrispQC:
         circuit_globals = {"QuantumCircuit": QrispQC}
         exec(circuit, circuit_globals)
         try:
@@ -70,11 +131,21 @@ class QrispPythonToQrisp(CircuitTranspiler, source="QRISP-PYTHON", target="QRISP
             f"The circuit type does not match the expected type. (Expected {QrispQC}, but got {type(qrisp_circuit)})"
         )
 
+    @classmethod
+    def serialize(cls, circuit: QrispQC) -> str:
+        return circuit.qasm()
 
-class QuilPythonToQuil(CircuitTranspiler, source="QUIL-PYTHON", target="QUIL", cost=1):
+    @classmethod
+    def deserialize(cls, circuit: str | bytes) -> QrispQC:
+        assert isinstance(circuit, str)
+        return QrispQC.from_qasm_str(circuit)
+
+
+class QuilPythonToQuil(SandboxedTranspiler, CircuitTranspiler, source="QUIL-PYTHON", target="QUIL", cost=1):
     unsafe = True
 
-    def transpile_circuit(self, circuit: Any) -> Program:
+    @classmethod
+    def execute_circuit_code(cls, circuit: Any) -> Program:
         circuit_globals = {"Program": Program}  # TODO: test this...
         exec(circuit, circuit_globals)
         try:
@@ -86,3 +157,12 @@ class QuilPythonToQuil(CircuitTranspiler, source="QUIL-PYTHON", target="QUIL", c
         raise TypeError(
             f"The circuit type does not match the expected type. (Expected {Program}, but got {type(quil_circuit)})"
         )
+
+    @classmethod
+    def serialize(cls, circuit: Program) -> str:
+        return circuit.out()
+
+    @classmethod
+    def deserialize(cls, circuit: str | bytes) -> Program:
+        assert isinstance(circuit, str)
+        return Program(circuit)
@@ -0,0 +1,80 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module sharing the measured runtime costs of the transpilers between all workers."""
+
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from qunicorn_core.api.api_models.transpiler_dtos import TranspilerCostDto
+from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler, MeasuredCost
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.transpiler_cost import TranspilerCostDataclass
+
+
+def publish_measured_costs():
+    """Merge the cost samples measured in this process into the costs stored in the database.
+
+    Afterwards, the costs learned by all workers are used for routing in this process.
+    The database objects are added to the current session, but the session is not committed.
+    """
+    samples: defaultdict[str, list[float]] = defaultdict(list)
+    for transpiler, sample in CircuitTranspiler.pop_measured_cost_samples():
+        samples[transpiler].append(sample)
+
+    stored = {cost.transpiler: cost for cost in TranspilerCostDataclass.get_all()}
+
+    for transpiler, transpiler_samples in samples.items():
+        stored_cost = stored.get(transpiler)
+        cost = MeasuredCost(cost=0.0, samples=0)
+        if stored_cost is not None:
+            cost = MeasuredCost(cost=stored_cost.cost, samples=stored_cost.samples)
+        for sample in transpiler_samples:
+            cost = cost.update(sample)
+        if stored_cost is not None:
+            stored_cost.cost, stored_cost.samples = cost
+            continue
+        try:
+            with DB.session.begin_nested():
+                stored_cost = TranspilerCostDataclass(transpiler=transpiler, cost=cost.cost, samples=cost.samples)
+                stored_cost.save()
+            stored[transpiler] = stored_cost
+        except IntegrityError:
+            pass  # another worker stored the first samples concurrently, the samples of this worker are dropped
+
+    CircuitTranspiler.set_measured_costs(
+        {transpiler: MeasuredCost(cost=cost.cost, samples=cost.samples) for transpiler, cost in stored.items()}
+    )
+
+
+def get_transpiler_costs() -> list[TranspilerCostDto]:
+    """Get the static and the measured costs of all registered transpilers."""
+    stored = {cost.transpiler: cost for cost in TranspilerCostDataclass.get_all()}
+    costs = []
+    for transpiler in sorted(CircuitTranspiler.get_all_transpilers(), key=lambda t: t.qualified_name):
+        stored_cost: Optional[TranspilerCostDataclass] = stored.get(transpiler.qualified_name)
+        costs.append(
+            TranspilerCostDto(
+                transpiler=transpiler.qualified_name,
+                source=transpiler.source,
+                target=transpiler.target,
+                cost=transpiler.cost,
+                unsafe=transpiler.unsafe,
+                measured_cost=stored_cost.cost if stored_cost else None,
+                samples=stored_cost.samples if stored_cost else 0,
+            )
+        )
+    return costs
@@ -21,9 +21,13 @@ from . import (
     db_model,
     deployment,
     device,
+    isa_circuit_cache,
     job,
     provider,
     provider_assembler_language,
     quantum_program,
     result,
+    result_cache,
+    translation_cache,
+    transpiler_cost,
 )
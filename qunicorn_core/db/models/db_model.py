@@ -114,6 +114,15 @@ class DbModel:
         q = cls.get_by_id_query(id_)
         return DB.session.execute(q).scalar_one_or_none()
 
+    @classmethod
+    def get_by_id_for_update(cls, id_: int):
+        """Get a single database object by its `id` attribute and lock it until the end of the transaction.
+
+        Databases without row level locks (e.g. SQLite) ignore the lock.
+        """
+        q = cls.get_by_id_query(id_).with_for_update().execution_options(populate_existing=True)
+        return DB.session.execute(q).scalar_one_or_none()
+
     @classmethod
     def get_by_id_or_404(cls, id_: int):
         """Get a single database object by its `id` attribute and raise 404 error if not found."""
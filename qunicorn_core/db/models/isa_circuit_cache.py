@@ -0,0 +1,50 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Sequence
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import select
+from sqlalchemy.sql import sqltypes as sql
+
+from .db_model import DbModel
+from ..db import DB, REGISTRY
+
+
+@REGISTRY.mapped_as_dataclass
+class CachedISACircuitDataclass(DbModel):
+    """Dataclass for storing circuits transpiled for a specific backend (i.e., ISA circuits).
+
+    ISA circuits are addressed by a hash over the circuit, the backend, the version and calibration
+    of the backend and the optimization settings.
+
+    Attributes:
+        id (int): The ID of the cached circuit. (set by the database)
+        cache_key (str): The content hash identifying the ISA circuit.
+        backend (str): The name of the backend the circuit was transpiled for.
+        quantum_circuit (bytes): The ISA circuit in QPY format.
+    """
+
+    # non-default arguments
+    id: Mapped[int] = mapped_column(sql.INTEGER(), primary_key=True, autoincrement=True, init=False)
+    cache_key: Mapped[str] = mapped_column(sql.String(64), nullable=False, index=True, unique=True)
+    backend: Mapped[str] = mapped_column(sql.String(255), nullable=False)
+    quantum_circuit: Mapped[bytes] = mapped_column(sql.LargeBinary(), nullable=False)
+
+    @classmethod
+    def get_by_cache_keys(cls, cache_keys: Sequence[str]) -> Sequence["CachedISACircuitDataclass"]:
+        if not cache_keys:
+            return []
+        q = select(cls).where(cls.cache_key.in_(cache_keys))
+        return DB.session.execute(q).scalars().all()
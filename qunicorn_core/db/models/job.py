@@ -20,7 +20,7 @@ from flask import current_app
 
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import Select, or_, select
+from sqlalchemy.sql import Select, func, or_, select
 from sqlalchemy.sql import sqltypes as sql
 
 from . import deployment as deployment_model
@@ -123,6 +123,44 @@ class JobDataclass(DbModel):
             q = q.where(cls.deployment == deployment)
         return DB.session.execute(q).scalars().all()
 
+    @classmethod
+    def get_running_with_transient_state(cls):
+        """Get all running jobs that have transient state, e.g. the ids of jobs submitted to a provider."""
+        q = select(cls).where(cls.state == JobState.RUNNING.value, cls._transient.any())
+        return DB.session.execute(q).scalars().all()
+
+    @classmethod
+    def _get_waiting_for_batch_query(cls, device_id: int) -> Select:
+        # only jobs with a scheduled task wait, synchronous jobs are executed by the request that created them
+        return select(cls).where(
+            cls.executed_on_id == device_id,
+            cls.state == JobState.READY.value,
+            cls.celery_id != None,  # noqa: E711
+            cls.celery_id != "synchronous",
+        )
+
+    @classmethod
+    def count_waiting_for_batch(cls, device_id: int) -> int:
+        """Count the asynchronous jobs waiting to be executed on the device."""
+        q = select(func.count()).select_from(cls._get_waiting_for_batch_query(device_id).subquery())
+        return DB.session.execute(q).scalar_one()
+
+    @classmethod
+    def get_waiting_for_batch_for_update(cls, device_id: int, limit: int):
+        """Get the oldest asynchronous jobs waiting to be executed on the device and lock them until the end of the
+        transaction.
+
+        Jobs locked by another transaction are skipped. Databases without row level locks (e.g. SQLite) ignore the lock.
+        """
+        q = (
+            cls._get_waiting_for_batch_query(device_id)
+            .order_by(cls.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        return DB.session.execute(q).scalars().all()
+
     def get_transient_state(
         self,
         *,
@@ -14,15 +14,19 @@
 
 from typing import Any, Optional, Dict
 
+from flask import current_app, has_app_context
 from sqlalchemy import ForeignKey, Select
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import sqltypes as sql, or_
+from sqlalchemy.sql import sqltypes as sql, or_, select
 
 from . import job as job_model
 from . import quantum_program
 from .db_model import DbModel, T
 from ..db import REGISTRY
 from ...static.enums.result_type import ResultType
+from ...util.result_encoding import decode_result_data, encode_result_data
+
+DEFAULT_RESULT_COMPRESSION_LEVEL = 6
 
 
 @REGISTRY.mapped_as_dataclass
@@ -33,7 +37,8 @@ class ResultDataclass(DbModel):
         id (int): The ID of the result. (set by the database)
         job (JobDataclass, optional): The job that was executed.
         program (QuantumProgramDataclass, optional): The specific program that was executed.
-        data (Any): The result of the job, in the given result_type.
+        data (Any): The result of the job, in the given result_type. (None if the data is stored in encoded_data)
+        encoded_data (bytes, optional): Counts or probabilities in a compact binary encoding, use get_data to decode.
         meta (dict): Some other data that was given by ibm.
         result_type (Enum): Result type depending on the Job_Type of the job.
     """
@@ -56,6 +61,27 @@ class ResultDataclass(DbModel):
     data: Mapped[Any] = mapped_column(sql.JSON, default=None, nullable=True)
     meta: Mapped[Dict[str, Any]] = mapped_column(sql.JSON, default=None, nullable=True)
     result_type: Mapped[str] = mapped_column(sql.String(50), default=ResultType.COUNTS.value)
+    encoded_data: Mapped[Optional[bytes]] = mapped_column(sql.LargeBinary(), default=None, nullable=True)
+
+    def __post_init__(self):
+        if self.encoded_data is not None or self.result_type not in (ResultType.COUNTS, ResultType.PROBABILITIES):
+            return
+        config = current_app.config if has_app_context() else {}
+        if not config.get("COMPACT_RESULTS", True):
+            return
+        self.encoded_data = encode_result_data(
+            self.data,
+            probabilities=self.result_type == ResultType.PROBABILITIES,
+            compression_level=config.get("RESULT_COMPRESSION_LEVEL", DEFAULT_RESULT_COMPRESSION_LEVEL),
+        )
+        if self.encoded_data is not None:
+            self.data = None
+
+    def get_data(self) -> Any:
+        """Get the data of the result in the given result_type (decodes compactly stored counts and probabilities)."""
+        if self.encoded_data is not None:
+            return decode_result_data(self.encoded_data)
+        return self.data
 
     @classmethod
     def apply_authentication_filter(cls, query: Select[T], user_id: Optional[str]) -> Select[T]:
@@ -68,3 +94,24 @@ class ResultDataclass(DbModel):
                 job_model.JobDataclass.executed_by == user_id,
             )
         )
+
+    @classmethod
+    def get_by_job_query(
+        cls,
+        job_id: int,
+        program_id: Optional[int] = None,
+        result_type: Optional[str] = None,
+        after_id: Optional[int] = None,
+    ) -> Select:
+        """Get a select query for the results of a job ordered by their id.
+
+        The results can be filtered by program and result type and start after a result id (for cursor pagination).
+        """
+        q = select(cls).where(cls.job_id == job_id)
+        if program_id is not None:
+            q = q.where(cls.program_id == program_id)
+        if result_type is not None:
+            q = q.where(cls.result_type == result_type)
+        if after_id is not None:
+            q = q.where(cls.id > after_id)
+        return q.order_by(cls.id)
@@ -0,0 +1,51 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Sequence
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import select
+from sqlalchemy.sql import sqltypes as sql
+
+from .db_model import DbModel
+from .result import ResultDataclass
+from ..db import DB, REGISTRY
+
+
+@REGISTRY.mapped_as_dataclass
+class CachedResultDataclass(DbModel):
+    """Dataclass for referencing results that can be reused by later runs of an identical program.
+
+    Results are addressed by a hash over the program, the device, the shots, the job type and the error mitigation.
+    The cache entries are deleted together with the referenced results.
+
+    Attributes:
+        id (int): The ID of the cache entry. (set by the database)
+        cache_key (str): The content hash identifying the run of the program.
+        result (ResultDataclass): The cached result.
+    """
+
+    # non-default arguments
+    id: Mapped[int] = mapped_column(sql.INTEGER(), primary_key=True, autoincrement=True, init=False)
+    cache_key: Mapped[str] = mapped_column(sql.String(64), nullable=False, index=True)
+    result_id: Mapped[int] = mapped_column(ForeignKey("Result.id", ondelete="CASCADE"), nullable=False, init=False)
+    result: Mapped[ResultDataclass] = relationship(ResultDataclass, lazy="selectin")
+
+    @classmethod
+    def get_by_cache_keys(cls, cache_keys: Sequence[str]) -> Sequence["CachedResultDataclass"]:
+        if not cache_keys:
+            return []
+        q = select(cls).where(cls.cache_key.in_(cache_keys)).order_by(cls.id)
+        return DB.session.execute(q).scalars().all()
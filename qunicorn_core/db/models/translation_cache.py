@@ -0,0 +1,65 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import select
+from sqlalchemy.sql import sqltypes as sql
+
+from .db_model import DbModel
+from ..db import DB, REGISTRY
+
+
+@REGISTRY.mapped_as_dataclass
+class CachedTranslationDataclass(DbModel):
+    """Dataclass for storing circuit translations independent of a specific quantum program.
+
+    Translations are addressed by a hash over the source circuit, the source and target format
+    and the version of the registered transpilers.
+
+    Attributes:
+        id (int): The ID of the cached translation. (set by the database)
+        cache_key (str): The content hash identifying the translation.
+        quantum_circuit (bytes): The translated circuit.
+        is_string (bool): True if the translated circuit is a string (stored utf-8 encoded).
+        assembler_language (str): The format of the translated circuit.
+        translation_distance (int): The distance of this translation from the source.
+    """
+
+    # non-default arguments
+    id: Mapped[int] = mapped_column(sql.INTEGER(), primary_key=True, autoincrement=True, init=False)
+    cache_key: Mapped[str] = mapped_column(sql.String(64), nullable=False, index=True, unique=True)
+    quantum_circuit: Mapped[bytes] = mapped_column(sql.LargeBinary(), nullable=False)
+    is_string: Mapped[bool] = mapped_column(sql.BOOLEAN(), nullable=False)
+    assembler_language: Mapped[str] = mapped_column(sql.String(50), nullable=False)
+    translation_distance: Mapped[int] = mapped_column(sql.INTEGER(), nullable=False)
+
+    @property
+    def circuit(self) -> str | bytes:
+        if self.is_string:
+            return self.quantum_circuit.decode()
+        return self.quantum_circuit
+
+    @classmethod
+    def get_by_cache_key(cls, cache_key: str) -> Optional["CachedTranslationDataclass"]:
+        q = select(cls).where(cls.cache_key == cache_key)
+        return DB.session.execute(q).scalar_one_or_none()
+
+    @classmethod
+    def get_by_cache_keys(cls, cache_keys: Sequence[str]) -> Sequence["CachedTranslationDataclass"]:
+        if not cache_keys:
+            return []
+        q = select(cls).where(cls.cache_key.in_(cache_keys))
+        return DB.session.execute(q).scalars().all()
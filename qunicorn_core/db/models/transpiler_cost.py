@@ -0,0 +1,47 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Sequence
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import select
+from sqlalchemy.sql import sqltypes as sql
+
+from .db_model import DbModel
+from ..db import DB, REGISTRY
+
+
+@REGISTRY.mapped_as_dataclass
+class TranspilerCostDataclass(DbModel):
+    """Dataclass for storing the runtime costs of transpilers learned by all workers.
+
+    Attributes:
+        id (int): The ID of the transpiler cost. (set by the database)
+        transpiler (str): The qualified name of the transpiler class.
+        cost (float): The moving average of the transpilation time in seconds per circuit size unit.
+        samples (int): The number of measurements included in the cost.
+    """
+
+    # non-default arguments
+    id: Mapped[int] = mapped_column(sql.INTEGER(), primary_key=True, autoincrement=True, init=False)
+    transpiler: Mapped[str] = mapped_column(sql.String(255), nullable=False, index=True, unique=True)
+    cost: Mapped[float] = mapped_column(sql.Float(), nullable=False)
+    samples: Mapped[int] = mapped_column(sql.INTEGER(), nullable=False)
+
+    @classmethod
+    def get_by_transpilers(cls, transpilers: Sequence[str]) -> Sequence["TranspilerCostDataclass"]:
+        if not transpilers:
+            return []
+        q = select(cls).where(cls.transpiler.in_(transpilers))
+        return DB.session.execute(q).scalars().all()
@@ -46,6 +46,79 @@ class ProductionConfig(SQLAchemyProductionConfig, SmorestProductionConfig):
 
     QPROV_URL = None
 
+    # maximum size (in bytes) of the in-process cache for circuit translations shared by all deployments
+    TRANSLATION_CACHE_SIZE = 64 * 2**20
+
+    # number of processes used to transpile the programs of a job in parallel (0 or 1 to transpile in the worker)
+    TRANSPILATION_POOL_SIZE = 0
+
+    # how transpiler chains are chosen: "depth" (fewest steps), "cost" (static costs) or "measured" (learned runtimes)
+    TRANSPILER_ROUTING = "depth"
+
+    # authenticated IBM runtime services kept in memory (by token hash) and their maximum age in seconds
+    IBM_SERVICE_CACHE_SIZE = 16
+    IBM_SERVICE_CACHE_TTL = 3600
+
+    # pooled keep-alive connections per host for requests to provider APIs and other services, default timeout of these
+    # requests in seconds and retries with exponential backoff (in seconds) of idempotent requests
+    HTTP_POOL_SIZE = 10
+    HTTP_TIMEOUT = 30
+    HTTP_RETRIES = 3
+    HTTP_RETRY_BACKOFF = 0.5
+
+    # executables compiled by quilc kept in memory per worker (by program, device and shots) for the Rigetti pilot
+    RIGETTI_EXECUTABLE_CACHE_SIZE = 128
+
+    # maximum number of circuits of a batch simulated in parallel by the AWS pilot (0 uses all cpus)
+    AWS_MAX_PARALLEL = 0
+
+    # code types used to submit the programs of a job to a QMware device in batches (devices without an entry submit one
+    # request per program) and the maximum number of circuits and their total size in bytes per batch
+    QMWARE_BATCH_CODE_TYPES = {"dev": "qasm2-batch"}
+    QMWARE_MAX_BATCH_SIZE = 100
+    QMWARE_MAX_BATCH_PAYLOAD = 2**20
+
+    # seconds asynchronous jobs on a local device wait to be executed together with other jobs on that device (0
+    # executes every job on its own) and the maximum number of jobs executed together
+    JOB_BATCH_WINDOW = 0
+    JOB_BATCH_MAX_SIZE = 50
+
+    # seconds between two checks of all running remote jobs by one periodic task (requires a worker started with the
+    # periodic scheduler), 0 watches every remote job with its own task instead
+    RESULT_POLL_INTERVAL = 0
+
+    # seconds after which qunicorn stops waiting for the results of jobs submitted to remote IBM backends
+    IBM_JOB_TIMEOUT = 7 * 24 * 3600
+
+    # reuse circuits transpiled for a specific IBM backend (ISA circuits) for identical circuits of later jobs
+    ISA_CIRCUIT_CACHE = True
+    IBM_TRANSPILER_OPTIMIZATION_LEVEL = None  # use the default optimization level of qiskit
+
+    # store counts and probabilities of results in a compact binary encoding instead of JSON and the zlib compression
+    # level of large encoded results (0 disables compression)
+    COMPACT_RESULTS = True
+    RESULT_COMPRESSION_LEVEL = 6
+
+    # reuse the results of earlier runs of identical programs with the same shots on the same local simulator instead
+    # of simulating them again (the reused results are marked in their metadata)
+    RESULT_CACHE = False
+
+    # number of Aer simulators a worker uses for jobs on local IBM devices (jobs wait for a free simulator)
+    AER_SIMULATOR_POOL_SIZE = 1
+    # number of threads per simulation (0 to use all cores the worker is allowed to use)
+    AER_MAX_PARALLEL_THREADS = 0
+    # what to parallelize: "experiments" (circuits), "shots", "none" or "auto" (choose by circuit width and batch size)
+    AER_PARALLELIZATION = "auto"
+    # circuits at least this wide are not parallelized by experiments or shots in "auto" mode
+    AER_PARALLEL_STATE_MIN_QUBITS = 14
+
+    # run transpilers executing user code (e.g. QISKIT-PYTHON) in a pool of pre-warmed worker processes
+    UNSAFE_TRANSPILER_SANDBOX = True
+    UNSAFE_TRANSPILER_POOL_SIZE = 2
+    UNSAFE_TRANSPILER_CPU_TIME_LIMIT = 30  # seconds of cpu time per circuit
+    UNSAFE_TRANSPILER_TIMEOUT = 60  # seconds of wall clock time per circuit
+    UNSAFE_TRANSPILER_MEMORY_LIMIT = 2**30  # bytes of address space per worker process
+
 
 class DebugConfig(ProductionConfig, SQLAchemyDebugConfig, SmorestDebugConfig):
     ENV = "development"
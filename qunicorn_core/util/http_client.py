@@ -0,0 +1,133 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pooled HTTP client shared by all requests of a worker to provider APIs and other services."""
+
+from os import getpid
+from threading import Lock
+from time import perf_counter
+from typing import Any, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from flask.globals import current_app
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5  # seconds
+
+# responses of idempotent requests that are retried (rate limits and temporarily unavailable servers)
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+
+class EndpointLatency(NamedTuple):
+    """Latency statistics of all requests to one endpoint (in seconds)."""
+
+    count: int
+    total: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def update(self, seconds: float) -> "EndpointLatency":
+        return EndpointLatency(self.count + 1, self.total + seconds, max(self.max, seconds))
+
+
+class HttpClient:
+    """A requests session with pooled keep-alive connections that records the latency of requests per endpoint.
+
+    Requests with idempotent methods are retried with exponential backoff on connection errors and on responses
+    with a status in ``RETRY_STATUS_CODES``. Other requests are only retried if the connection could not be opened.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> None:
+        self.timeout = timeout
+        self.session = Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._latencies: dict[str, EndpointLatency] = {}
+        self._lock = Lock()
+
+    def request(self, method: str, url: str, *, endpoint: Optional[str] = None, **kwargs: Any) -> Response:
+        """Send a request using a pooled connection.
+
+        The latency is recorded for ``endpoint`` which defaults to the path of the url. Urls containing ids
+        should pass an endpoint template (e.g. ``"/v0/jobs/{id}"``) to keep the number of endpoints bounded.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = f"{method.upper()} {urlsplit(url).netloc}{endpoint or urlsplit(url).path}"
+        start = perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            self._record_latency(endpoint, perf_counter() - start)
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Response:
+        return self.request("POST", url, **kwargs)
+
+    def _record_latency(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies[endpoint] = self._latencies.get(endpoint, EndpointLatency(0, 0.0, 0.0)).update(seconds)
+
+    def get_latencies(self) -> dict[str, EndpointLatency]:
+        """Get the latency statistics of all endpoints requested by this client (including retries)."""
+        with self._lock:
+            return dict(self._latencies)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_HTTP_CLIENT: Optional[HttpClient] = None
+_HTTP_CLIENT_PID: Optional[int] = None
+_HTTP_CLIENT_LOCK = Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the HTTP client of this worker process (configured by ``HTTP_POOL_SIZE``, ``HTTP_TIMEOUT``,
+    ``HTTP_RETRIES`` and ``HTTP_RETRY_BACKOFF``)."""
+    global _HTTP_CLIENT, _HTTP_CLIENT_PID
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None or _HTTP_CLIENT_PID != getpid():
+            # pooled connections must not be shared with forked worker processes
+            config = current_app.config
+            _HTTP_CLIENT = HttpClient(
+                config.get("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE),
+                config.get("HTTP_TIMEOUT", DEFAULT_TIMEOUT),
+                config.get("HTTP_RETRIES", DEFAULT_RETRIES),
+                config.get("HTTP_RETRY_BACKOFF", DEFAULT_RETRY_BACKOFF),
+            )
+            _HTTP_CLIENT_PID = getpid()
+        return _HTTP_CLIENT
@@ -0,0 +1,109 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact binary encoding of the counts and probabilities of results.
+
+Encoded data starts with a header of the format version, flags and the number of outcomes. The header is followed by
+the outcomes as sorted uint64 numbers and their values as uint32 counts or float64 probabilities (little endian).
+The outcomes and values may be compressed with zlib (flag ``COMPRESSED``).
+Only results with hex string outcomes of a single register (e.g. ``{"0x3": 1024}``) can be encoded.
+"""
+
+import struct
+import zlib
+from numbers import Integral, Real
+from typing import Any, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+COMPRESSED = 0b01
+PROBABILITIES = 0b10
+
+HEADER = struct.Struct("<BBI")  # version, flags, number of outcomes
+
+# encoded results smaller than this are not compressed
+MIN_COMPRESSION_SIZE = 1024
+
+MAX_COUNT = 2**32 - 1
+MAX_OUTCOME = 2**64 - 1
+
+
+def _parse_outcome(outcome: Any) -> Optional[int]:
+    if not isinstance(outcome, str) or not outcome.startswith("0x"):
+        return None
+    try:
+        number = int(outcome, 16)
+    except ValueError:
+        return None
+    if number > MAX_OUTCOME or hex(number) != outcome:
+        return None  # the outcome would not be decoded to the same string
+    return number
+
+
+def encode_result_data(data: Any, probabilities: bool = False, compression_level: int = 0) -> Optional[bytes]:
+    """Encode the counts or probabilities of a result.
+
+    Args:
+        data (Any): the counts or probabilities by hex string outcome
+        probabilities (bool): encode the values as float64 probabilities instead of uint32 counts
+        compression_level (int): zlib compression level, 0 disables compression
+
+    Returns:
+        Optional[bytes]: the encoded data or None if the data cannot be encoded without changing it
+    """
+    if not isinstance(data, dict) or not data:
+        return None
+
+    outcomes = []
+    for outcome, value in data.items():
+        number = _parse_outcome(outcome)
+        if number is None or isinstance(value, bool):
+            return None
+        if probabilities:
+            if not isinstance(value, Real):
+                return None
+        elif not isinstance(value, Integral) or not 0 <= value <= MAX_COUNT:
+            return None
+        outcomes.append(number)
+
+    outcome_array = np.array(outcomes, dtype="<u8")
+    value_array = np.array(list(data.values()), dtype="<f8" if probabilities else "<u4")
+    order = np.argsort(outcome_array, kind="stable")
+    body = outcome_array[order].tobytes() + value_array[order].tobytes()
+
+    flags = PROBABILITIES if probabilities else 0
+    if compression_level > 0 and len(body) >= MIN_COMPRESSION_SIZE:
+        compressed = zlib.compress(body, compression_level)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= COMPRESSED
+
+    return HEADER.pack(FORMAT_VERSION, flags, len(outcomes)) + body
+
+
+def decode_result_data(encoded: bytes) -> dict:
+    """Decode encoded counts or probabilities into a dict of hex string outcomes (sorted by outcome)."""
+    version, flags, size = HEADER.unpack_from(encoded)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result encoding version {version}.")
+
+    body = encoded[HEADER.size :]
+    if flags & COMPRESSED:
+        body = zlib.decompress(body)
+
+    outcomes = np.frombuffer(body, dtype="<u8", count=size)
+    values = np.frombuffer(body, dtype="<f8" if flags & PROBABILITIES else "<u4", count=size, offset=outcomes.nbytes)
+    return dict(zip(map(hex, outcomes.tolist()), values.tolist()))
@@ -214,6 +214,32 @@ def check_linting(c):
     )
 
 
+@task
+def benchmark_transpilers(c, output=None, threshold=None, update_baseline=False):
+    """Run the transpiler benchmark and compare the results with the stored baseline.
+
+    Args:
+        c (Context): task context
+        output (str, optional): write the machine readable results to this file. Defaults to None.
+        threshold (float, optional): the allowed slowdown compared to the baseline (1.0 = twice as slow).
+        update_baseline (bool, optional): store the results as the new baseline. Defaults to False.
+    """
+    cmd = [
+        "python",
+        "-m",
+        "tests.benchmarks.transpiler_benchmark",
+        "--baseline",
+        "tests/benchmarks/transpiler_baseline.json",
+    ]
+    if output:
+        cmd += ["--output", output]
+    if threshold is not None:
+        cmd += ["--threshold", str(threshold)]
+    if update_baseline:
+        cmd.append("--update-baseline")
+    c.run(join(cmd), echo=True)
+
+
 @task
 def celery_status(c):
     """Show the status of celery workers.
@@ -0,0 +1,53 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the pool of Aer simulators used for local IBM devices"""
+
+import pytest
+from qiskit import QuantumCircuit
+
+from qunicorn_core.core.pilotmanager.aer_simulator_pool import AerParallelism, AerSimulatorPool, choose_parallelism
+from tests.conftest import set_up_env
+
+
+@pytest.mark.parametrize(
+    "mode, widths, expected",
+    [
+        ("auto", [2, 3], AerParallelism(4, 2, 1)),
+        ("auto", [2] * 8, AerParallelism(4, 4, 1)),
+        ("auto", [2], AerParallelism(4, 1, 4)),
+        ("auto", [20, 2], AerParallelism(4, 1, 1)),
+        ("shots", [2, 3], AerParallelism(4, 1, 4)),
+        ("none", [2], AerParallelism(4, 1, 1)),
+    ],
+)
+def test_choose_parallelism(mode: str, widths: list[int], expected: AerParallelism):
+    app = set_up_env()
+    app.config["AER_MAX_PARALLEL_THREADS"] = 4
+    app.config["AER_PARALLELIZATION"] = mode
+    with app.app_context():
+        assert choose_parallelism([QuantumCircuit(width) for width in widths]) == expected
+
+
+def test_simulators_are_reused():
+    app = set_up_env()
+    app.config["AER_MAX_PARALLEL_THREADS"] = 2
+    with app.app_context():
+        pool = AerSimulatorPool(1)
+        with pool.simulator([QuantumCircuit(1), QuantumCircuit(1)]) as simulator:
+            assert simulator.options.max_parallel_experiments == 2
+        with pool.simulator([QuantumCircuit(1)]) as reused_simulator:
+            assert reused_simulator is simulator
+            assert reused_simulator.options.max_parallel_experiments == 1
+            assert reused_simulator.options.max_parallel_shots == 2
@@ -14,10 +14,20 @@
 
 """test in-request execution for aws"""
 
+from datetime import datetime, timezone
+
+from braket.devices import LocalSimulator
+
 from qunicorn_core.api.api_models.job_dtos import SimpleJobDto, JobRequestDto
-from qunicorn_core.core import job_service
+from qunicorn_core.core import job_manager_service, job_service
+from qunicorn_core.core.pilotmanager.aws_pilot import AWSPilot
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.deployment import DeploymentDataclass
+from qunicorn_core.db.models.device import DeviceDataclass
+from qunicorn_core.db.models.job import JobDataclass
 from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
 from qunicorn_core.static.enums.job_state import JobState
+from qunicorn_core.static.enums.job_type import JobType
 from qunicorn_core.static.enums.provider_name import ProviderName
 from tests import test_utils
 from tests.conftest import set_up_env
@@ -57,3 +67,57 @@ def test_create_and_run_aws_local_simulator():
 
         # THEN: Check if the correct job with its result is saved in the db
         assert return_dto.state == JobState.READY
+
+
+def _create_aws_job(deployment_id: int, shots: int) -> JobDataclass:
+    job = JobDataclass(
+        name="batched",
+        shots=shots,
+        error_mitigation="none",
+        cut_to_width=None,
+        type=JobType.RUNNER.value,
+        executed_by=None,
+        executed_on=DeviceDataclass.get_by_name(AWS_LOCAL_SIMULATOR, ProviderName.AWS.value),
+        deployment=DeploymentDataclass.get_by_id(deployment_id),
+        progress=0,
+        state=JobState.RUNNING,
+        started_at=datetime.now(timezone.utc),
+        results=[],
+    )
+    job.save(commit=True)
+    return job
+
+
+def test_aws_pilot_batches_circuits_of_several_jobs(monkeypatch):
+    """Tests that interleaved circuits of several jobs are coalesced by shots and the results reach their jobs"""
+    # GIVEN: Two jobs with different shots and their circuits in interleaved order
+    app = set_up_env()
+    batch_sizes = []
+    run_batch = LocalSimulator.run_batch
+
+    def counting_run_batch(simulator, circuits, *args, **kwargs):
+        batch_sizes.append(len(circuits))
+        return run_batch(simulator, circuits, *args, **kwargs)
+
+    monkeypatch.setattr(LocalSimulator, "run_batch", counting_run_batch)
+
+    with app.app_context():
+        job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.AWS)
+        test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM3])
+        jobs = [_create_aws_job(job_request_dto.deployment_id, shots) for shots in (1000, 2000)]
+        pilot = AWSPilot()
+        pilot_jobs = [job_manager_service._prepare_pilot_jobs(job, pilot.supported_languages) for job in jobs]
+        interleaved = [p for pair in zip(*pilot_jobs) for p in pair]
+        assert len(interleaved) == 4
+
+        # WHEN: Running all circuits with one call of the pilot
+        pilot.run(interleaved)
+
+        # THEN: Every shot count is simulated in one batch and every job gets the results of its own circuits
+        assert sorted(batch_sizes) == [2, 2]
+        DB.session.expire_all()
+        for job in jobs:
+            job = JobDataclass.get_by_id(job.id)
+            assert job.state == JobState.FINISHED
+            assert len(job.results) == 4
+            test_utils.check_if_job_runner_result_correct(job)
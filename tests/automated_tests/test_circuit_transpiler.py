@@ -13,16 +13,19 @@
 # limitations under the License.
 
 """test circuit transpilers"""
+import subprocess
+import sys
 from itertools import pairwise
+from pathlib import Path
 
 import pytest
 from qiskit import QuantumCircuit
 from qiskit.qasm2 import dumps as qasm2_dumps
 
-from qunicorn_core.core.transpiler import transpile_circuit
+from qunicorn_core.core.transpiler import TranspilationError, transpile_circuit, transpile_circuits
 from qunicorn_core.core.transpiler.braket_transpiler import Qasm3ToBraket, BraketToQasm3
-from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler
-from qunicorn_core.core.transpiler.qiskit_transpiler import Qasm3ToQiskit, QiskitToQasm3
+from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler, LazyTranspiler
+from qunicorn_core.core.transpiler.qiskit_transpiler import Qasm2ToQiskit, Qasm3ToQiskit, QiskitToQasm3
 
 
 def test_no_transpile():
@@ -101,6 +104,112 @@ def test_tranpile_with_cached_results():
     assert transpiled is not None, "transpilation with cached transpilation results failed"
 
 
+def test_transpile_circuits_batch(monkeypatch):
+    batch_sizes = []
+    transpile_batch = Qasm2ToQiskit.transpile_circuits
+
+    def count_batch(self, circuits):
+        batch_sizes.append(len(circuits))
+        return transpile_batch(self, circuits)
+
+    monkeypatch.setattr(Qasm2ToQiskit, "transpile_circuits", count_batch)
+    CircuitTranspiler.clear_chain_cache()
+
+    circuits = [QuantumCircuit(n) for n in range(1, 4)]
+    for circuit in circuits:
+        circuit.h(0)
+    visited = []
+    results = transpile_circuits(
+        "QASM3",
+        [
+            [("QASM2", qasm2_dumps(circuits[0]), 0)],
+            [("QASM2", "OPENQASM 2.0;\nnot a valid circuit;", 0)],
+            [("QASM3", "OPENQASM 3.0;", 0)],
+            [("QASM2", qasm2_dumps(circuits[1]), 0)],
+            [("QISKIT-PYTHON", "circuit = None", 0)],
+            [("QASM2", qasm2_dumps(circuits[2]), 0)],
+        ],
+        exclude_unsafe=True,
+        visitor=lambda index, *_: visited.append(index),
+    )
+
+    assert batch_sizes == [4], "each stage should transpile the whole batch at once"
+    assert CircuitTranspiler.get_chain_cache_info().misses == 2, "chains should be resolved once per source format"
+    assert [result.circuit.startswith("OPENQASM 3.0;") for result in results if result.error is None] == [True] * 4
+    assert isinstance(results[1].error, TranspilationError) and results[1].error.transpiler == Qasm2ToQiskit()
+    assert results[2].circuit == "OPENQASM 3.0;"
+    assert isinstance(results[4].error, KeyError)
+    assert sorted(set(visited)) == [0, 3, 5]
+
+
+def test_transpiler_chain_cache():
+    CircuitTranspiler.clear_chain_cache()
+
+    chain = CircuitTranspiler.get_transpilers_limit_depth("QASM2", "BRAKET")
+    assert CircuitTranspiler.get_chain_cache_info() == (0, 1, 1)
+
+    cached_chain = CircuitTranspiler.get_transpilers_limit_depth([("QASM2", 0)], "BRAKET")
+    assert cached_chain == chain, "cached chain should match the originally resolved chain"
+    assert CircuitTranspiler.get_chain_cache_info() == (1, 1, 1)
+
+    CircuitTranspiler.get_transpilers_limit_cost("QASM2", "BRAKET")
+    assert CircuitTranspiler.get_chain_cache_info() == (1, 2, 2), "cost functions must not share cache entries"
+
+
+def test_transpiler_chain_cache_no_path():
+    CircuitTranspiler.clear_chain_cache()
+
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            CircuitTranspiler.get_transpilers_limit_depth("QASM2", "QISKIT-PYTHON")
+
+    assert CircuitTranspiler.get_chain_cache_info() == (1, 1, 1), "missing paths should be cached"
+
+
+def test_transpiler_chain_cache_invalidation():
+    CircuitTranspiler.get_transpilers_limit_depth("QASM2", "BRAKET")
+    assert CircuitTranspiler.get_chain_cache_info().size > 0
+
+    class QiskitIdentity(CircuitTranspiler, source="QISKIT", target="QISKIT", cost=1):
+        def transpile_circuit(self, circuit):
+            return circuit
+
+    try:
+        assert CircuitTranspiler.get_chain_cache_info() == (0, 0, 0), "registering a transpiler must clear the cache"
+    finally:
+        CircuitTranspiler._CircuitTranspiler__transpilers["QISKIT"].remove(QiskitIdentity())
+        CircuitTranspiler.clear_chain_cache()
+
+
+def test_transpiler_plugins_are_loaded_lazily():
+    script = (
+        "import sys\n"
+        "from qunicorn_core.core.transpiler import transpile_circuit\n"
+        "module = 'qunicorn_core.core.transpiler.braket_transpiler'\n"
+        "assert module not in sys.modules\n"
+        "transpile_circuit('BRAKET', ('QASM3', 'OPENQASM 3.0;\\nqubit[1] q;\\nh q[0];', 0))\n"
+        "assert module in sys.modules\n"
+        "assert 'qunicorn_core.core.transpiler.unsafe_transpilers' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=Path(__file__).parents[2])
+
+
+def test_exclude_lazy_transpiler_by_name():
+    with pytest.raises(KeyError):
+        CircuitTranspiler.get_transpilers_limit_depth("QASM3", "BRAKET", exclude={"Qasm3ToBraket"})
+    with pytest.raises(KeyError):
+        CircuitTranspiler.get_transpilers_limit_depth("QASM3", "BRAKET", exclude={Qasm3ToBraket})
+
+
+def test_transpiler_plugin_metadata_mismatch():
+    plugin = LazyTranspiler(
+        Qasm3ToBraket.__module__, "Qasm3ToBraket", source="QASM3", target="BRAKET", cost=1, unsafe=False
+    )
+    assert plugin == Qasm3ToBraket()
+    with pytest.raises(ValueError):
+        plugin.check_metadata(Qasm3ToBraket)
+
+
 qasm3_circuit_no_gates = """include "stdgates.inc";
 qubit[1] q;
 bit[1] c;
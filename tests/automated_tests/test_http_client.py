@@ -0,0 +1,80 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the pooled HTTP client used for provider APIs and other services"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from qunicorn_core.util.http_client import HttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive
+
+    def _respond(self):
+        self.server.requests.append((self.command, self.path))
+        self.server.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        status = 503 if self.path.startswith("/unavailable") else 200
+        body = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    server.connections = set()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(server):
+    client = HttpClient(retries=0)
+    url = f"http://127.0.0.1:{server.server_port}"
+    for job_id in range(3):
+        assert client.get(f"{url}/v0/jobs/{job_id}", endpoint="/v0/jobs/{id}").status_code == 200
+    assert len(server.requests) == 3
+    assert len(server.connections) == 1
+
+    latencies = client.get_latencies()
+    assert list(latencies.keys()) == [f"GET 127.0.0.1:{server.server_port}/v0/jobs/{{id}}"]
+    latency = next(iter(latencies.values()))
+    assert latency.count == 3
+    assert 0 < latency.mean <= latency.max
+
+
+def test_only_idempotent_requests_are_retried(server):
+    client = HttpClient(retries=2, retry_backoff=0)
+    url = f"http://127.0.0.1:{server.server_port}/unavailable"
+    assert client.get(url).status_code == 503
+    assert client.post(url, json={}).status_code == 503
+    assert server.requests == [("GET", "/unavailable")] * 3 + [("POST", "/unavailable")]
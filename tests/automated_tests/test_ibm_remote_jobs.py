@@ -0,0 +1,196 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the non-blocking execution of jobs on remote IBM backends"""
+
+from types import SimpleNamespace
+
+import pytest
+from qiskit_aer import AerSimulator
+
+from qunicorn_core.api.api_models import JobRequestDto
+from qunicorn_core.core import job_manager_service, job_service
+from qunicorn_core.core.pilotmanager import ibm_pilot
+from qunicorn_core.core.pilotmanager.ibm_pilot import IBMPilot, IBMResultsPending
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.device import DeviceDataclass
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.db.models.provider import ProviderDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.job_state import JobState
+from qunicorn_core.static.enums.provider_name import ProviderName
+from qunicorn_core.static.enums.result_type import ResultType
+from tests import test_utils
+from tests.conftest import set_up_env
+
+REMOTE_DEVICE = "ibm_remote_test_device"
+
+
+class FakeRemoteJob:
+    def __init__(self, job):
+        self.job = job
+        self.finished = False
+        self.failed = False
+
+    def job_id(self) -> str:
+        return self.job.job_id()
+
+    def in_final_state(self) -> bool:
+        return self.finished
+
+    def result(self):
+        if not self.finished:
+            raise AssertionError("results of remote jobs must not be awaited")
+        if self.failed:
+            raise RuntimeError("job failed on the remote backend")
+        return self.job.result()
+
+
+class FakeRemoteBackend(AerSimulator):
+    def run(self, run_input, **options):
+        job = FakeRemoteJob(super().run(run_input, **options))
+        FakeRuntimeService.submitted_jobs[job.job_id()] = job
+        return job
+
+
+class FakeRuntimeService:
+    submitted_jobs: dict[str, FakeRemoteJob] = {}
+
+    def backend(self, name: str):
+        assert name == REMOTE_DEVICE
+        return FakeRemoteBackend()
+
+    def job(self, job_id: str) -> FakeRemoteJob:
+        return FakeRuntimeService.submitted_jobs[job_id]
+
+    def jobs(self, limit: int, pending: bool) -> list[FakeRemoteJob]:
+        assert limit is None and pending
+        return [job for job in FakeRuntimeService.submitted_jobs.values() if not job.finished]
+
+
+@pytest.fixture(autouse=True)
+def fake_runtime_service(monkeypatch):
+    FakeRuntimeService.submitted_jobs = {}
+    service_cache = SimpleNamespace(get_service=lambda token: FakeRuntimeService())
+    monkeypatch.setattr(ibm_pilot, "get_service_cache", lambda: service_cache)
+
+
+@pytest.fixture
+def watched_jobs(monkeypatch) -> list[int]:
+    jobs = []
+
+    def watch(job_id: int):
+        jobs.append(job_id)
+        return SimpleNamespace(delay=lambda: SimpleNamespace(id=f"watch-{job_id}"))
+
+    monkeypatch.setattr(ibm_pilot, "is_running_asynchronously", lambda: True)
+    monkeypatch.setattr(ibm_pilot, "watch_ibm_results", SimpleNamespace(s=watch))
+    return jobs
+
+
+def _run_remote_job() -> JobDataclass:
+    provider = ProviderDataclass.get_by_name(ProviderName.IBM.value)
+    DeviceDataclass(name=REMOTE_DEVICE, num_qubits=-1, is_simulator=True, is_local=False, provider=provider).save(
+        commit=True
+    )
+
+    job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.IBM)
+    job_request_dto.device_name = REMOTE_DEVICE
+    test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QISKIT])
+    return_dto = job_service.create_and_run_job(job_request_dto, False)
+
+    DB.session.expire_all()
+    return JobDataclass.get_by_id_or_404(return_dto.id)
+
+
+def test_remote_job_does_not_block_the_worker(watched_jobs):
+    app = set_up_env()
+    with app.app_context():
+        job = _run_remote_job()
+
+        assert watched_jobs == [job.id]
+        assert job.celery_id == f"watch-{job.id}"
+        assert job.state == JobState.RUNNING
+        assert job.results == []
+        remote_states = [s for s in job._transient if isinstance(s.data, dict) and s.data.get("type") == "IBM"]
+        assert len(remote_states) == len(job.deployment.programs)
+        assert job.provider_specific_id in FakeRuntimeService.submitted_jobs
+
+        with pytest.raises(IBMResultsPending):
+            IBMPilot()._get_job_results(job.id)
+
+        for remote_job in FakeRuntimeService.submitted_jobs.values():
+            remote_job.finished = True
+        IBMPilot()._get_job_results(job.id)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
+        assert not any(isinstance(s.data, dict) and s.data.get("type") == "IBM" for s in job._transient)
+
+
+def test_failed_remote_job_saves_errors(watched_jobs):
+    app = set_up_env()
+    with app.app_context():
+        job = _run_remote_job()
+
+        for remote_job in FakeRuntimeService.submitted_jobs.values():
+            remote_job.finished = True
+            remote_job.failed = True
+        IBMPilot()._get_job_results(job.id)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        assert job.state == JobState.ERROR
+        assert {r.program_id for r in job.results} == {p.id for p in job.deployment.programs}
+        assert all(r.result_type == ResultType.ERROR for r in job.results)
+
+
+def test_result_poller_collects_completed_jobs(watched_jobs, monkeypatch):
+    collected_jobs = []
+
+    def collect(job_id: int):
+        collected_jobs.append(job_id)
+        job_manager_service.collect_job_results(job_id)
+
+    monkeypatch.setattr(job_manager_service.collect_job_results, "delay", collect)
+    app = set_up_env()
+    app.config["RESULT_POLL_INTERVAL"] = 10
+    with app.app_context():
+        job = _run_remote_job()
+        assert watched_jobs == [], "jobs must not be watched individually if the result poller is enabled"
+
+        job_manager_service.poll_running_jobs()
+        assert collected_jobs == []
+
+        for remote_job in FakeRuntimeService.submitted_jobs.values():
+            remote_job.finished = True
+        job_manager_service.poll_running_jobs()
+        assert collected_jobs == [job.id]
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
+
+
+def test_synchronous_remote_job_waits_for_results(monkeypatch):
+    monkeypatch.setattr(FakeRemoteJob, "in_final_state", lambda self: True)
+    monkeypatch.setattr(FakeRemoteJob, "result", lambda self: self.job.result())
+    app = set_up_env()
+    with app.app_context():
+        job = _run_remote_job()
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
@@ -72,7 +72,7 @@ def check_if_job_sample_result_correct(job: JobDataclass):
     for i in range(len(count_results)):
         result: ResultDataclass = count_results[i]
         assert len(result.meta) == 0
-        counts: dict = result.data
+        counts: dict = result.get_data()
         shots = 0
 
         for count in counts.values():
@@ -0,0 +1,68 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the cache for circuits transpiled for a specific backend"""
+
+from qiskit import QuantumCircuit
+from qiskit_aer import AerSimulator
+
+from qunicorn_core.core import isa_circuit_cache
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.isa_circuit_cache import CachedISACircuitDataclass
+from tests.conftest import set_up_env
+
+
+def _get_circuit(name: str) -> QuantumCircuit:
+    circuit = QuantumCircuit(2, 2, name=name)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_isa_circuit_key():
+    backend = AerSimulator()
+    key = isa_circuit_cache.get_isa_circuit_key(_get_circuit("a"), backend, None)
+
+    assert key == isa_circuit_cache.get_isa_circuit_key(_get_circuit("b"), backend, None)
+    assert key != isa_circuit_cache.get_isa_circuit_key(_get_circuit("a"), backend, 3)
+    assert key != isa_circuit_cache.get_isa_circuit_key(QuantumCircuit(2, 2), backend, None)
+
+
+def test_isa_circuits_are_reused(monkeypatch):
+    app = set_up_env()
+    transpiled_batches = []
+    transpile = isa_circuit_cache.transpile
+
+    def count_transpile(circuits, *args, **kwargs):
+        transpiled_batches.append(len(circuits))
+        return transpile(circuits, *args, **kwargs)
+
+    monkeypatch.setattr(isa_circuit_cache, "transpile", count_transpile)
+
+    with app.app_context():
+        backend = AerSimulator()
+        isa_circuits = isa_circuit_cache.get_isa_circuits([_get_circuit("a"), _get_circuit("b")], backend)
+        DB.session.commit()
+        assert transpiled_batches == [1], "identical circuits should only be transpiled once"
+        assert len(CachedISACircuitDataclass.get_all()) == 1
+
+        cached_circuits = isa_circuit_cache.get_isa_circuits([_get_circuit("c")], backend)
+        assert transpiled_batches == [1], "the cached ISA circuit should be reused"
+        assert [c.name for c in isa_circuits + cached_circuits] == ["a", "b", "c"]
+        assert cached_circuits[0] == isa_circuits[0]
+
+        app.config["ISA_CIRCUIT_CACHE"] = False
+        isa_circuit_cache.get_isa_circuits([_get_circuit("d")], backend)
+        assert transpiled_batches == [1, 1]
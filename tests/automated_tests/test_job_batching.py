@@ -0,0 +1,122 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test executing the jobs waiting on a local device in batches"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from qunicorn_core.api.api_models.job_dtos import JobRequestDto
+from qunicorn_core.core import job_manager_service, job_service
+from qunicorn_core.core.pilotmanager.aws_pilot import AWSPilot
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.job_state import JobState
+from qunicorn_core.static.enums.provider_name import ProviderName
+from tests import test_utils
+from tests.conftest import set_up_env
+
+
+@pytest.fixture
+def scheduled_batches(monkeypatch) -> list[dict]:
+    """Record the scheduled batch tasks instead of sending them to a broker"""
+    batches: list[dict] = []
+
+    def apply_async(kwargs: dict, countdown: float, task_id: str):
+        batches.append({**kwargs, "countdown": countdown})
+        return SimpleNamespace(id=task_id)
+
+    monkeypatch.setattr(job_manager_service.run_job_batch, "apply_async", apply_async)
+    return batches
+
+
+@pytest.fixture
+def executed_batches(monkeypatch) -> list[list[int]]:
+    """Record the job ids of the pilot jobs of every call of the AWS pilot"""
+    batches: list[list[int]] = []
+    execute = AWSPilot.execute
+
+    def recording_execute(pilot, jobs, *args, **kwargs):
+        batches.append([j.job.id for j in jobs])
+        return execute(pilot, jobs, *args, **kwargs)
+
+    monkeypatch.setattr(AWSPilot, "execute", recording_execute)
+    return batches
+
+
+def _create_aws_jobs(count: int) -> list[JobDataclass]:
+    job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.AWS)
+    test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM3])
+    job_ids = [job_service.create_and_run_job(job_request_dto, is_asynchronous=True).id for _ in range(count)]
+    return [JobDataclass.get_by_id(job_id) for job_id in job_ids]
+
+
+def test_jobs_on_local_device_are_executed_as_one_batch(scheduled_batches, executed_batches):
+    # GIVEN: Batching enabled and three jobs submitted to the local simulator
+    app = set_up_env()
+    app.config["JOB_BATCH_WINDOW"] = 5
+    with app.app_context():
+        jobs = _create_aws_jobs(3)
+        device_id = jobs[0].executed_on_id
+
+        assert scheduled_batches == [{"device_id": device_id, "countdown": 5}] * 3
+        assert all(job.state == JobState.READY for job in jobs)
+        assert all(job.celery_id is not None for job in jobs)
+
+        # WHEN: The scheduled tasks are executed
+        for batch in scheduled_batches:
+            job_manager_service.run_job_batch(batch["device_id"])
+
+        # THEN: The first task executes all circuits of all jobs with one call of the pilot
+        assert len(executed_batches) == 1
+        assert sorted(executed_batches[0]) == sorted(job.id for job in jobs for _ in range(2))
+        DB.session.expire_all()
+        for job in jobs:
+            job = JobDataclass.get_by_id(job.id)
+            assert job.state == JobState.FINISHED
+            test_utils.check_if_job_runner_result_correct(job)
+
+
+def test_full_batch_is_executed_immediately(scheduled_batches, executed_batches):
+    # GIVEN: Batching enabled with a maximum of two jobs per batch
+    app = set_up_env()
+    app.config["JOB_BATCH_WINDOW"] = 5
+    app.config["JOB_BATCH_MAX_SIZE"] = 2
+    with app.app_context():
+        # WHEN: Three jobs are submitted
+        jobs = _create_aws_jobs(3)
+
+        # THEN: The task of the job filling the batch runs immediately and takes only the first two jobs
+        assert [batch["countdown"] for batch in scheduled_batches] == [5, 0, 0]
+        job_manager_service.run_job_batch(scheduled_batches[1]["device_id"])
+
+        assert len(executed_batches) == 1
+        DB.session.expire_all()
+        states = [JobDataclass.get_by_id(job.id).state for job in jobs]
+        assert states == [JobState.FINISHED, JobState.FINISHED, JobState.READY]
+
+
+def test_batching_is_disabled_by_default(monkeypatch, scheduled_batches):
+    app = set_up_env()
+    delayed_jobs = []
+    monkeypatch.setattr(
+        job_manager_service.run_job, "delay", lambda job_id: delayed_jobs.append(job_id) or SimpleNamespace(id="run")
+    )
+    with app.app_context():
+        jobs = _create_aws_jobs(2)
+
+        assert scheduled_batches == []
+        assert delayed_jobs == [job.id for job in jobs]
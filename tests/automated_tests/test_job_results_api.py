@@ -0,0 +1,94 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the paginated and streamed results endpoint of a job"""
+
+from http import HTTPStatus
+
+from qunicorn_core.api.api_models.job_dtos import JobRequestDto
+from qunicorn_core.core import job_service
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.provider_name import ProviderName
+from tests import test_utils
+from tests.conftest import set_up_env
+
+
+def _run_aws_job() -> JobDataclass:
+    job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.AWS)
+    test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM3])
+    return_dto = job_service.create_and_run_job(job_request_dto, is_asynchronous=False)
+
+    DB.session.expire_all()
+    return JobDataclass.get_by_id_or_404(return_dto.id)
+
+
+def test_get_all_results():
+    app = set_up_env()
+    with app.app_context():
+        job = _run_aws_job()
+        expected = sorted((r.id, r.program_id, r.result_type, r.get_data()) for r in job.results)
+
+        response = app.test_client().get(f"/jobs/{job.id}/results/")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.is_streamed
+        assert "Link" not in response.headers
+        results = response.get_json()
+        assert [(r["id"], r["resultType"], r["data"]) for r in results] == [(e[0], e[2], e[3]) for e in expected]
+        assert all(r["job"].endswith(f"/jobs/{job.id}/") for r in results)
+
+
+def test_filter_results():
+    app = set_up_env()
+    with app.app_context():
+        job = _run_aws_job()
+        program_id = job.results[0].program_id
+        client = app.test_client()
+
+        results = client.get(f"/jobs/{job.id}/results/?result-type=PROBABILITIES").get_json()
+        assert len(results) == 2
+        assert all(r["resultType"] == "PROBABILITIES" for r in results)
+
+        results = client.get(f"/jobs/{job.id}/results/?program={program_id}").get_json()
+        assert sorted(r["id"] for r in results) == sorted(r.id for r in job.results if r.program_id == program_id)
+
+        response = client.get(f"/jobs/{job.id}/results/?result-type=UNKNOWN")
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_paginate_results():
+    app = set_up_env()
+    with app.app_context():
+        job = _run_aws_job()
+        client = app.test_client()
+
+        response = client.get(f"/jobs/{job.id}/results/?item-count=3")
+        first_page = response.get_json()
+        assert len(first_page) == 3
+        next_url = response.headers["Link"].split(">")[0].lstrip("<")
+        assert f"cursor={first_page[-1]['id']}" in next_url
+
+        response = client.get(next_url)
+        second_page = response.get_json()
+        assert "Link" not in response.headers
+        assert [r["id"] for r in first_page + second_page] == sorted(r.id for r in job.results)
+
+
+def test_results_of_unknown_job():
+    app = set_up_env()
+    with app.app_context():
+        response = app.test_client().get("/jobs/404/results/")
+        assert response.status_code == HTTPStatus.NOT_FOUND
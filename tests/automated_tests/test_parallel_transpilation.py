@@ -0,0 +1,97 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the transpilation of deployment programs in a process pool"""
+
+import pytest
+
+from qunicorn_core.core import job_manager_service, job_service
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.deployment import DeploymentDataclass
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.job_state import JobState
+from qunicorn_core.static.enums.provider_name import ProviderName
+from qunicorn_core.static.qunicorn_exception import QunicornError
+from tests import test_utils
+from tests.conftest import set_up_env
+from tests.test_utils import IBM_LOCAL_SIMULATOR
+
+
+def _set_up_job(assembler_languages: list[AssemblerLanguage], pool_size: int = 2):
+    app = set_up_env()
+    app.config["TRANSPILATION_POOL_SIZE"] = pool_size
+    with app.app_context():
+        job_request_dto = test_utils.get_test_job(ProviderName.IBM)
+        job_request_dto.device_name = IBM_LOCAL_SIMULATOR
+        test_utils.save_deployment_and_add_id_to_job(job_request_dto, assembler_languages)
+    return app, job_request_dto
+
+
+def test_parallel_transpilation():
+    app, job_request_dto = _set_up_job([AssemblerLanguage.QASM3, AssemblerLanguage.BRAKET])
+
+    with app.app_context():
+        return_dto = job_service.create_and_run_job(job_request_dto, False)
+
+        job = JobDataclass.get_by_id_or_404(return_dto.id)
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
+        # results are in the order of the programs
+        program_ids = [program.id for program in job.deployment.programs]
+        assert [result.program_id for result in job.results] == sorted(
+            (result.program_id for result in job.results), key=program_ids.index
+        )
+
+
+@pytest.mark.parametrize("pool_size", [0, 2])
+def test_parallel_transpilation_error(pool_size: int):
+    app, job_request_dto = _set_up_job([AssemblerLanguage.QASM3], pool_size)
+
+    with app.app_context():
+        deployment = DeploymentDataclass.get_by_id(job_request_dto.deployment_id)
+        broken_program = deployment.programs[-1]
+        broken_program.quantum_circuit = "OPENQASM 3.0;\nnot a valid circuit;"
+        broken_program.save(commit=True)
+
+        with pytest.raises(QunicornError):
+            job_service.create_and_run_job(job_request_dto, False)
+
+        DB.session.expire_all()  # the job was updated by the celery task
+        job = JobDataclass.get_all()[-1]
+        assert job.state == JobState.ERROR.value
+        error_results = [result for result in job.results if result.result_type == "ERROR"]
+        assert [result.program_id for result in error_results] == [broken_program.id]
+
+
+def test_parallel_transpilation_recovers_from_broken_pool():
+    app, job_request_dto = _set_up_job([AssemblerLanguage.QASM2, AssemblerLanguage.QASM3])
+
+    with app.app_context():
+        job_service.create_and_run_job(job_request_dto, False)
+
+        # simulate a worker that was killed (e.g., by the OOM killer)
+        pool = job_manager_service._TRANSPILATION_POOL
+        assert pool is not None
+        for process in list(pool._processes.values()):
+            process.kill()
+            process.join()
+
+        return_dto = job_service.create_and_run_job(job_request_dto, False)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(return_dto.id)
+        assert job.state == JobState.FINISHED
+        test_utils.check_if_job_runner_result_correct(job)
+        assert job_manager_service._TRANSPILATION_POOL is not pool
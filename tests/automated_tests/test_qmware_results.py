@@ -0,0 +1,209 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test collecting the results of QMware jobs"""
+
+from json import dumps, loads
+from types import SimpleNamespace
+
+import pytest
+
+from qunicorn_core.api.api_models import JobRequestDto
+from qunicorn_core.core import job_service
+from qunicorn_core.core.pilotmanager import qmware_pilot
+from qunicorn_core.core.pilotmanager.base_pilot import PilotJob
+from qunicorn_core.core.pilotmanager.qmware_pilot import QMwarePilot, QMWAREResultsPending
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.job_state import JobState
+from qunicorn_core.static.enums.provider_name import ProviderName
+from tests import test_utils
+from tests.conftest import set_up_env
+
+
+class FakeResponse:
+    def __init__(self, body: dict):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return self.body
+
+
+class FakeQMware:
+    """Simulates the QMware API, every job returns the expected measurements of the test deployment."""
+
+    def __init__(self):
+        self.requests: dict[str, dict] = {}
+        self.finished: set[str] = set()
+        self.fetched: list[str] = []
+
+    def post(self, url: str, json: dict, **kwargs) -> FakeResponse:
+        job_id = f"qmware-{len(self.requests)}"
+        self.requests[job_id] = json["code"]
+        return FakeResponse({"jobCreated": True, "id": job_id})
+
+    @staticmethod
+    def _measure(circuit: str) -> list[dict]:
+        if "h q[0];\nh q[0];" in circuit:
+            return [{"result": [{"number": 0, "hits": 4000}]}]
+        return [{"result": [{"number": 0, "hits": 2000}, {"number": 3, "hits": 2000}]}]
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        job_id = url.rsplit("/", 1)[-1]
+        self.fetched.append(job_id)
+        if job_id not in self.finished:
+            return FakeResponse({"status": "RUNNING"})
+        code = self.requests[job_id]
+        if code["type"].endswith("batch"):
+            measurements = [self._measure(circuit) for circuit in loads(code["code"])]
+        else:
+            measurements = self._measure(code["code"])
+        return FakeResponse({"status": "SUCCESS", "out": {"value": dumps(measurements)}})
+
+
+@pytest.fixture
+def fake_qmware(monkeypatch) -> FakeQMware:
+    qmware = FakeQMware()
+    monkeypatch.setattr(qmware_pilot, "get_http_client", lambda: qmware)
+    return qmware
+
+
+def _run_qmware_job() -> JobDataclass:
+    job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.IBM)
+    job_request_dto.provider_name = ProviderName.QMWARE.value
+    job_request_dto.device_name = "dev"
+    test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM2])
+    return_dto = job_service.create_and_run_job(job_request_dto, False)
+
+    DB.session.expire_all()
+    return JobDataclass.get_by_id_or_404(return_dto.id)
+
+
+@pytest.mark.parametrize("batch_code_types, expected_requests", [({"dev": "qasm2-batch"}, 1), ({}, 2)])
+def test_programs_are_batched(fake_qmware, batch_code_types: dict, expected_requests: int):
+    app = set_up_env()
+    app.config["RESULT_POLL_INTERVAL"] = 10  # results are collected manually
+    app.config["QMWARE_BATCH_CODE_TYPES"] = batch_code_types
+    with app.app_context():
+        job = _run_qmware_job()
+        assert len(fake_qmware.requests) == expected_requests
+
+        fake_qmware.finished.update(fake_qmware.requests.keys())
+        QMwarePilot()._get_job_results(job.id)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
+
+
+def test_circuits_are_not_parsed_while_polling(fake_qmware, monkeypatch):
+    app = set_up_env()
+    app.config["RESULT_POLL_INTERVAL"] = 10  # results are collected manually
+    with app.app_context():
+        job = _run_qmware_job()
+        program_states = [s for s in job._transient if s.program is not None]
+        assert len(program_states) == 2
+        for program_state in program_states:
+            assert "circuit" not in program_state.data
+            assert program_state.data["registers"] == [{"name": "meas", "size": 2}]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("circuits must not be parsed while polling")
+
+        monkeypatch.setattr(qmware_pilot.qasm2, "loads", fail)
+        fake_qmware.finished.update(fake_qmware.requests.keys())
+        QMwarePilot()._get_job_results(job.id)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
+
+
+def test_finished_programs_are_saved_while_others_are_pending(fake_qmware):
+    app = set_up_env()
+    app.config["RESULT_POLL_INTERVAL"] = 10  # results are collected manually
+    with app.app_context():
+        app.config["QMWARE_MAX_BATCH_SIZE"] = 1
+        job = _run_qmware_job()
+        assert job.state == JobState.RUNNING
+        first_job, second_job = fake_qmware.requests.keys()
+
+        fake_qmware.finished.add(first_job)
+        with pytest.raises(QMWAREResultsPending):
+            QMwarePilot()._get_job_results(job.id)
+        assert sorted(fake_qmware.fetched) == [first_job, second_job]
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        assert job.state == JobState.RUNNING
+        assert {r.program_id for r in job.results} == {job.deployment.programs[0].id}
+        assert QMwarePilot().get_completed_jobs([job]) == []
+
+        fake_qmware.finished.add(second_job)
+        assert QMwarePilot().get_completed_jobs([job]) == [job]
+        QMwarePilot()._get_job_results(job.id)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(job.id)
+        test_utils.check_if_job_finished(job)
+        test_utils.check_if_job_runner_result_correct(job)
+
+
+@pytest.mark.parametrize("device", ["dev-gpu", "dev-batch"])
+def test_combined_registers_are_split(device: str):
+    job = SimpleNamespace(executed_on=SimpleNamespace(name=device), shots=10)
+    registers = [{"name": "a", "size": 1}, {"name": "b", "size": 70}, {"name": "c", "size": 3}]
+    results = [[{"number": (1 << 73) | (5 << 3) | 6, "hits": 6}, {"number": 1, "hits": 4}]]
+
+    counts, probabilities = QMwarePilot()._convert_qmware_measurements_to_qunicorn_measurements(job, results, registers)
+    assert counts == {"0x1 0x5 0x6": 6, "0x0 0x0 0x1": 4}
+    assert probabilities == {"0x1 0x5 0x6": 0.6, "0x0 0x0 0x1": 0.4}
+
+    registers = [{"name": "a", "size": 2}, {"name": "b", "size": 2}]
+    results = [[{"number": 0b1101, "hits": 10}]]
+    counts, _ = QMwarePilot()._convert_qmware_measurements_to_qunicorn_measurements(job, results, registers)
+    assert counts == {"0x3 0x1": 10}
+
+
+def test_measurements_of_separate_registers_are_combined():
+    job = SimpleNamespace(executed_on=SimpleNamespace(name="dev"), shots=8)
+    registers = [{"name": "a", "size": 1}, {"name": "b", "size": 2}]
+    results = [
+        [{"number": 0, "hits": 2}, {"number": 1, "hits": 6}],
+        [{"number": 3, "hits": 2}, {"number": 2, "hits": 6}],
+    ]
+
+    counts, probabilities = QMwarePilot()._convert_qmware_measurements_to_qunicorn_measurements(job, results, registers)
+    assert counts == {"0x0 0x3": 2, "0x1 0x2": 6}
+    assert probabilities == {"0x0 0x3": 0.25, "0x1 0x2": 0.75}
+
+    with pytest.raises(AssertionError):
+        results[1][0]["hits"] = 3
+        QMwarePilot()._convert_qmware_measurements_to_qunicorn_measurements(job, results, registers)
+
+
+def test_batches_are_limited_by_size_and_payload():
+    app = set_up_env()
+    app.config["QMWARE_MAX_BATCH_SIZE"] = 3
+    app.config["QMWARE_MAX_BATCH_PAYLOAD"] = 25
+    jobs = [PilotJob(circuit, None, None, None) for circuit in ["a" * 10, "b" * 10, "c", "d", "e", "f" * 30, "g"]]
+    with app.app_context():
+        batches = QMwarePilot._split_into_batches(jobs)
+    assert [[j.circuit[0] for j in batch] for batch in batches] == [["a", "b"], ["c", "d", "e"], ["f"], ["g"]]
@@ -0,0 +1,82 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the cache of pyquil quantum computers and compiled executables"""
+
+import pytest
+from pyquil import Program
+from pyquil.gates import CNOT, H, MEASURE
+from pyquil.quilbase import Declare
+
+from qunicorn_core.core.pilotmanager import quantum_computer_cache
+from qunicorn_core.core.pilotmanager.quantum_computer_cache import QuantumComputerCache
+
+
+class FakeQuantumComputer:
+    def __init__(self, name: str):
+        self.name = name
+        self.compiled: list[Program] = []
+
+    def compile(self, program: Program) -> Program:
+        self.compiled.append(program)
+        return program.copy()
+
+
+@pytest.fixture
+def quantum_computers(monkeypatch) -> list[FakeQuantumComputer]:
+    created = []
+
+    def get_qc(name: str) -> FakeQuantumComputer:
+        created.append(FakeQuantumComputer(name))
+        return created[-1]
+
+    monkeypatch.setattr(quantum_computer_cache, "get_qc", get_qc)
+    return created
+
+
+def _get_program() -> Program:
+    return Program(Declare("ro", "BIT", 2), H(0), CNOT(0, 1), MEASURE(0, ("ro", 0)), MEASURE(1, ("ro", 1)))
+
+
+def test_quantum_computers_are_reused(quantum_computers):
+    cache = QuantumComputerCache()
+    assert cache.get_quantum_computer("2q-qvm") is cache.get_quantum_computer("2q-qvm")
+    assert cache.get_quantum_computer("9q-square-qvm") is not cache.get_quantum_computer("2q-qvm")
+    assert [qc.name for qc in quantum_computers] == ["2q-qvm", "9q-square-qvm"]
+
+
+def test_executables_are_compiled_once(quantum_computers):
+    cache = QuantumComputerCache()
+    program = _get_program()
+
+    executable = cache.get_executable(program, "2q-qvm", 100)
+    assert executable.num_shots == 100
+    assert program.num_shots == 1, "the source program must not be modified"
+
+    assert cache.get_executable(_get_program(), "2q-qvm", 100).out() == executable.out()
+    assert cache.get_executable(program, "2q-qvm", 100) is not executable, "every run needs its own executable"
+    assert len(quantum_computers[0].compiled) == 1
+
+    assert cache.get_executable(program, "2q-qvm", 200).num_shots == 200
+    assert len(quantum_computers[0].compiled) == 2
+    assert len(cache) == 2
+
+
+def test_least_recently_used_executables_are_evicted(quantum_computers):
+    cache = QuantumComputerCache(max_executables=1)
+    cache.get_executable(_get_program(), "2q-qvm", 100)
+    cache.get_executable(_get_program(), "2q-qvm", 200)
+    cache.get_executable(_get_program(), "2q-qvm", 100)
+    assert len(quantum_computers[0].compiled) == 3
+    assert len(cache) == 1
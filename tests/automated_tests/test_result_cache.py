@@ -0,0 +1,106 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test reusing the results of identical simulator runs"""
+
+import pytest
+
+from qunicorn_core.api.api_models.job_dtos import JobRequestDto
+from qunicorn_core.core import job_service
+from qunicorn_core.core.pilotmanager.aws_pilot import AWSPilot
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.job_state import JobState
+from qunicorn_core.static.enums.provider_name import ProviderName
+from tests import test_utils
+from tests.conftest import set_up_env
+
+
+@pytest.fixture
+def executed_jobs(monkeypatch) -> list[int]:
+    """Record the ids of the jobs executed by the AWS pilot"""
+    job_ids: list[int] = []
+    execute = AWSPilot.execute
+
+    def recording_execute(pilot, jobs, *args, **kwargs):
+        job_ids.extend(sorted(set(j.job.id for j in jobs)))
+        return execute(pilot, jobs, *args, **kwargs)
+
+    monkeypatch.setattr(AWSPilot, "execute", recording_execute)
+    return job_ids
+
+
+def _run_aws_job(deployment_id: int, shots: int = 4000) -> JobDataclass:
+    job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.AWS)
+    job_request_dto.deployment_id = deployment_id
+    job_request_dto.shots = shots
+    return_dto = job_service.create_and_run_job(job_request_dto, is_asynchronous=False)
+
+    DB.session.expire_all()
+    return JobDataclass.get_by_id_or_404(return_dto.id)
+
+
+def _save_deployment() -> int:
+    job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.AWS)
+    test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM3])
+    return job_request_dto.deployment_id
+
+
+def test_identical_run_reuses_results(executed_jobs):
+    # GIVEN: The result cache is enabled and a job was executed
+    app = set_up_env()
+    app.config["RESULT_CACHE"] = True
+    with app.app_context():
+        deployment_id = _save_deployment()
+        first_job = _run_aws_job(deployment_id)
+
+        # WHEN: The same deployment is run again with the same shots
+        job = _run_aws_job(deployment_id)
+
+        # THEN: The second job is finished with the marked results of the first job without being executed
+        assert executed_jobs == [first_job.id]
+        assert job.state == JobState.FINISHED
+        assert job.progress == 100
+        test_utils.check_if_job_runner_result_correct(job)
+        first_results = {r.id: r for r in first_job.results}
+        assert len(job.results) == len(first_results)
+        for result in job.results:
+            reused = result.meta["result_cache"]
+            assert reused["job_id"] == first_job.id
+            assert result.get_data() == first_results[reused["result_id"]].get_data()
+            assert result.program_id == first_results[reused["result_id"]].program_id
+        assert all("result_cache" not in r.meta for r in first_job.results)
+
+
+def test_run_with_other_shots_is_executed(executed_jobs):
+    app = set_up_env()
+    app.config["RESULT_CACHE"] = True
+    with app.app_context():
+        deployment_id = _save_deployment()
+        first_job = _run_aws_job(deployment_id)
+        job = _run_aws_job(deployment_id, shots=2000)
+
+        assert executed_jobs == [first_job.id, job.id]
+        test_utils.check_if_job_runner_result_correct(job)
+        assert all("result_cache" not in r.meta for r in job.results)
+
+
+def test_result_cache_is_disabled_by_default(executed_jobs):
+    app = set_up_env()
+    with app.app_context():
+        deployment_id = _save_deployment()
+        jobs = [_run_aws_job(deployment_id) for _ in range(2)]
+
+        assert executed_jobs == [job.id for job in jobs]
@@ -0,0 +1,122 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the compact encoding of counts and probabilities"""
+
+import pytest
+
+from qunicorn_core.api.api_models.job_dtos import JobRequestDto
+from qunicorn_core.core import job_service
+from qunicorn_core.core.mapper import result_mapper
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.db.models.result import ResultDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.provider_name import ProviderName
+from qunicorn_core.static.enums.result_type import ResultType
+from qunicorn_core.util.result_encoding import (
+    COMPRESSED,
+    HEADER,
+    decode_result_data,
+    encode_result_data,
+)
+from tests import test_utils
+from tests.conftest import set_up_env
+
+
+def test_counts_round_trip():
+    counts = {"0x3": 2000, "0x0": 1990, "0xffffffffffffffff": 10}
+    encoded = encode_result_data(counts)
+
+    assert encoded is not None
+    assert len(encoded) == HEADER.size + 3 * (8 + 4)
+    decoded = decode_result_data(encoded)
+    assert decoded == counts
+    assert list(decoded) == ["0x0", "0x3", "0xffffffffffffffff"]
+    assert all(isinstance(v, int) for v in decoded.values())
+
+
+def test_probabilities_round_trip():
+    probabilities = {"0x1": 0.25, "0x0": 0.75, "0x2": 0}
+    decoded = decode_result_data(encode_result_data(probabilities, probabilities=True))
+
+    assert decoded == probabilities
+    assert all(isinstance(v, float) for v in decoded.values())
+
+
+def test_large_results_are_compressed():
+    counts = {hex(i): i % 7 for i in range(4096)}
+    uncompressed = encode_result_data(counts)
+    compressed = encode_result_data(counts, compression_level=6)
+
+    assert not HEADER.unpack_from(uncompressed)[1] & COMPRESSED
+    assert HEADER.unpack_from(compressed)[1] & COMPRESSED
+    assert len(compressed) < len(uncompressed)
+    assert decode_result_data(compressed) == counts
+
+
+@pytest.mark.parametrize(
+    "data, probabilities",
+    [
+        ({"0x2 0x1": 10}, False),  # multiple registers
+        ({"0xA": 10}, False),  # would be decoded as 0xa
+        ({"0x00": 10}, False),  # would be decoded as 0x0
+        ({"0x" + "f" * 17: 10}, False),  # more than 64 bits
+        ({"0x1": -1}, False),
+        ({"0x1": 2**32}, False),
+        ({"0x1": 0.5}, False),  # counts must be integers
+        ({"0x1": "0.5"}, True),
+        ({"0x1": True}, False),
+        ({}, False),
+        ({"exception_message": "error"}, False),
+        (None, False),
+    ],
+)
+def test_data_that_cannot_be_encoded(data, probabilities: bool):
+    assert encode_result_data(data, probabilities=probabilities) is None
+
+
+def test_results_are_stored_encoded():
+    app = set_up_env()
+    with app.app_context():
+        counts = ResultDataclass(data={"0x1": 5, "0x0": 3}, meta={}, result_type=ResultType.COUNTS)
+        error = ResultDataclass(data={"exception_message": "error"}, meta={}, result_type=ResultType.ERROR)
+
+        assert counts.data is None and counts.encoded_data is not None
+        assert counts.get_data() == {"0x0": 3, "0x1": 5}
+        assert error.encoded_data is None
+        assert error.get_data() == {"exception_message": "error"}
+
+        app.config["COMPACT_RESULTS"] = False
+        legacy = ResultDataclass(data={"0x1": 5}, meta={}, result_type=ResultType.COUNTS)
+        assert legacy.encoded_data is None
+        assert legacy.get_data() == {"0x1": 5}
+
+
+def test_job_results_are_decoded_for_the_api():
+    app = set_up_env()
+    with app.app_context():
+        job_request_dto: JobRequestDto = test_utils.get_test_job(ProviderName.AWS)
+        test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM3])
+        return_dto = job_service.create_and_run_job(job_request_dto, is_asynchronous=False)
+
+        DB.session.expire_all()
+        job = JobDataclass.get_by_id_or_404(return_dto.id)
+        assert all(r.data is None and r.encoded_data is not None for r in job.results)
+
+        for result in job.results:
+            dto = result_mapper.dataclass_to_dto(result)
+            assert isinstance(dto.data, dict)
+            assert dto.data == result.get_data()
+        test_utils.check_if_job_runner_result_correct(job)
@@ -0,0 +1,37 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the conversion of Rigetti readouts into counts"""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from qunicorn_core.core.pilotmanager.rigetti_pilot import RigettiPilot
+
+
+@pytest.mark.parametrize("width", [1, 2, 9, 70])
+def test_readout_is_counted_by_hex_value(width: int):
+    readout = np.random.default_rng(42).integers(0, 2, size=(500, width))
+
+    # the first bit of a readout row (ro[0]) is the least significant bit
+    expected = Counter(hex(int("".join(map(str, row[::-1])), 2)) for row in readout.tolist())
+    assert RigettiPilot.readout_to_hex_counts(readout) == dict(expected)
+
+
+def test_readout_counts_are_python_ints():
+    counts = RigettiPilot.readout_to_hex_counts(np.array([[1, 0], [1, 0], [0, 1]]))
+    assert counts == {"0x1": 2, "0x2": 1}
+    assert all(type(count) is int for count in counts.values())
@@ -0,0 +1,80 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the cache of authenticated IBM runtime services"""
+
+import pytest
+
+from qunicorn_core.core.pilotmanager import runtime_service_cache
+from qunicorn_core.core.pilotmanager.ibm_pilot import IBMPilot
+from qunicorn_core.core.pilotmanager.runtime_service_cache import RuntimeServiceCache
+from tests.conftest import set_up_env
+
+
+class FakeRuntimeService:
+    logins: list[str] = []
+
+    def __init__(self, channel: str, token: str):
+        if token == "invalid":
+            raise ValueError("Invalid token")
+        FakeRuntimeService.logins.append(token)
+        self.token = token
+
+
+@pytest.fixture(autouse=True)
+def fake_runtime_service(monkeypatch):
+    FakeRuntimeService.logins = []
+    monkeypatch.setattr(runtime_service_cache, "QiskitRuntimeService", FakeRuntimeService)
+
+
+def test_services_are_cached_by_token():
+    cache = RuntimeServiceCache(max_size=2)
+    service = cache.get_service("a")
+    assert cache.get_service("a") is service
+    assert cache.get_service("b") is not service
+    assert FakeRuntimeService.logins == ["a", "b"]
+
+    cache.get_service("a")  # "b" is now the least recently used service
+    cache.get_service("c")
+    assert len(cache) == 2
+    cache.get_service("b")
+    assert FakeRuntimeService.logins == ["a", "b", "c", "b"], "least recently used service should be evicted"
+
+
+def test_expired_services_are_replaced():
+    cache = RuntimeServiceCache(ttl=0)
+    assert cache.get_service("a") is not cache.get_service("a")
+
+    cache = RuntimeServiceCache()
+    service = cache.get_service("a")
+    cache.invalidate("a")
+    assert cache.get_service("a") is not service
+
+
+def test_failed_logins_are_not_cached():
+    cache = RuntimeServiceCache()
+    with pytest.raises(ValueError):
+        cache.get_service("invalid")
+    assert len(cache) == 0
+
+
+def test_login_does_not_write_account_file(tmp_path):
+    app = set_up_env()
+    app.instance_path = str(tmp_path)
+    with app.app_context():
+        runtime_service_cache.get_service_cache().clear()
+        service = IBMPilot.get_ibm_provider_and_login("token")
+        assert IBMPilot.get_ibm_provider_and_login("token") is service
+    assert FakeRuntimeService.logins == ["token"]
+    assert list(tmp_path.iterdir()) == []
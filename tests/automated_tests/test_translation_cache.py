@@ -0,0 +1,98 @@
+# Copyright 2023 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the translation cache shared between deployments"""
+
+from qunicorn_core.core import translation_cache
+from qunicorn_core.core.translation_cache import CachedTranslation, TranslationLRUCache
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.translation_cache import CachedTranslationDataclass
+from qunicorn_core.util.utils import get_default_qasm2_string
+from tests.conftest import set_up_env
+
+
+def test_lru_cache_evicts_by_size():
+    cache = TranslationLRUCache(max_size=10)
+    cache.put("a", CachedTranslation("aaaa", 1))
+    cache.put("b", CachedTranslation("bbbb", 1))
+    assert cache.get("a") is not None  # "a" is now the most recently used entry
+    cache.put("c", CachedTranslation("cccc", 1))
+
+    assert cache.get("b") is None, "least recently used entry should be evicted"
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size == 8
+
+    cache.put("d", CachedTranslation("d" * 11, 1))
+    assert cache.get("d") is None, "entries larger than the cache should not be cached"
+
+
+def test_translation_key_normalizes_circuit():
+    app = set_up_env()
+    with app.app_context():
+        key = translation_cache.get_translation_key("QASM2", "OPENQASM 2.0;\nqreg q[1];\n", "QASM3")
+        assert key == translation_cache.get_translation_key("QASM2", "OPENQASM 2.0;  \r\nqreg q[1];", "QASM3")
+        assert key != translation_cache.get_translation_key("QASM2", "OPENQASM 2.0;\nqreg q[1];\n", "QISKIT")
+
+
+def test_translation_cache_roundtrip():
+    app = set_up_env()
+    with app.app_context():
+        circuit = get_default_qasm2_string(3)
+        translation_cache.cache_translation("QASM2", circuit, "QASM3", "OPENQASM 3.0;", 2)
+        DB.session.commit()
+
+        translation_cache.get_lru_cache().clear()  # force database lookup
+
+        cached = translation_cache.get_cached_translations("QASM2", circuit)
+        assert cached == [("QASM3", "OPENQASM 3.0;", 2)]
+        assert translation_cache.get_cached_translations("QASM2", circuit, ["QASM3"]) == cached
+
+
+def test_translation_key_depends_on_exclusions():
+    app = set_up_env()
+    with app.app_context():
+        key = translation_cache.get_translation_key("QISKIT-PYTHON", "circuit = None", "QASM2")
+        app.config["EXCLUDE_UNSAFE_TRANSPILERS"] = True
+        assert key != translation_cache.get_translation_key("QISKIT-PYTHON", "circuit = None", "QASM2")
+
+
+def test_translation_cache_remembers_misses():
+    app = set_up_env()
+    with app.app_context():
+        circuit = get_default_qasm2_string(2)
+        assert translation_cache.get_cached_translations("QASM2", circuit) == []
+        assert "QISKIT" not in translation_cache.get_cacheable_formats()
+
+        key = translation_cache.get_translation_key("QASM2", circuit, "QASM3")
+        assert translation_cache.get_lru_cache().get(key) is translation_cache.NOT_CACHED
+
+        translation_cache.cache_translation("QASM2", circuit, "QASM3", "OPENQASM 3.0;", 2)
+        assert translation_cache.get_cached_translations("QASM2", circuit, ["QASM3"]) == [("QASM3", "OPENQASM 3.0;", 2)]
+
+
+def test_translation_cache_concurrent_insert(monkeypatch):
+    app = set_up_env()
+    with app.app_context():
+        circuit = get_default_qasm2_string(4)
+        translation_cache.cache_translation("QASM2", circuit, "QASM3", "OPENQASM 3.0;", 2)
+        DB.session.commit()
+
+        # simulate a second worker that did not see the committed translation yet
+        translation_cache.get_lru_cache().clear()
+        monkeypatch.setattr(CachedTranslationDataclass, "get_by_cache_key", classmethod(lambda cls, key: None))
+        translation_cache.cache_translation("QASM2", circuit, "QASM3", "OPENQASM 3.0;", 2)
+        DB.session.commit()
+
+        key = translation_cache.get_translation_key("QASM2", circuit, "QASM3")
+        assert len(CachedTranslationDataclass.get_by_cache_keys([key])) == 1
@@ -0,0 +1,128 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the runtime measured transpiler costs"""
+
+import pytest
+
+from qunicorn_core.core import job_service, transpiler_costs
+from qunicorn_core.core.transpiler import transpile_circuit
+from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler, MeasuredCost
+from qunicorn_core.core.transpiler.qiskit_transpiler import Qasm2ToQiskit, Qasm3ToQiskit, QiskitToQasm3
+from qunicorn_core.db.db import DB
+from qunicorn_core.db.models.job import JobDataclass
+from qunicorn_core.db.models.transpiler_cost import TranspilerCostDataclass
+from qunicorn_core.static.enums.assembler_languages import AssemblerLanguage
+from qunicorn_core.static.enums.provider_name import ProviderName
+from qunicorn_core.util.utils import get_default_qasm2_string
+from tests import test_utils
+from tests.conftest import set_up_env
+from tests.test_utils import IBM_LOCAL_SIMULATOR
+
+
+@pytest.fixture(autouse=True)
+def reset_measured_costs():
+    CircuitTranspiler.pop_measured_cost_samples()
+    CircuitTranspiler.set_measured_costs({})
+    yield
+    CircuitTranspiler.pop_measured_cost_samples()
+    CircuitTranspiler.set_measured_costs({})
+
+
+def test_measured_cost_update():
+    cost = MeasuredCost(cost=0.0, samples=0).update(1.0)
+    assert cost == (1.0, 1), "the first sample should initialize the moving average"
+    cost = cost.update(2.0)
+    assert cost.samples == 2
+    assert 1.0 < cost.cost < 2.0
+
+
+def test_transpile_circuit_records_costs():
+    transpile_circuit("QASM3", ("QASM2", get_default_qasm2_string(2), 0))
+
+    samples = CircuitTranspiler.pop_measured_cost_samples()
+    assert [name for name, _ in samples] == [Qasm2ToQiskit.get_qualified_name(), QiskitToQasm3.get_qualified_name()]
+    assert CircuitTranspiler.get_measured_costs()[Qasm2ToQiskit.get_qualified_name()].samples == 1
+
+
+def test_measured_cost_routing():
+    class Qasm2ToQasm3(CircuitTranspiler, source="QASM2", target="QASM3", cost=1):
+        def transpile_circuit(self, circuit):
+            return circuit
+
+    try:
+        assert CircuitTranspiler.get_transpilers_limit_measured_cost("QASM2", "QASM3") == (Qasm2ToQasm3(),)
+
+        CircuitTranspiler.set_measured_costs(
+            {
+                Qasm2ToQasm3.get_qualified_name(): MeasuredCost(cost=0.1, samples=10),
+                Qasm2ToQiskit.get_qualified_name(): MeasuredCost(cost=0.01, samples=10),
+                QiskitToQasm3.get_qualified_name(): MeasuredCost(cost=0.01, samples=10),
+            }
+        )
+        chain = CircuitTranspiler.get_transpilers_limit_measured_cost("QASM2", "QASM3")
+        assert chain == (Qasm2ToQiskit(), QiskitToQasm3()), "the faster chain should be chosen"
+        assert CircuitTranspiler.get_transpilers_limit_depth("QASM2", "QASM3") == (Qasm2ToQasm3(),)
+
+        # transpilers that were not measured are estimated with the average measured cost
+        assert CircuitTranspiler.get_measured_cost(Qasm3ToQiskit()) == pytest.approx(0.04)
+    finally:
+        CircuitTranspiler._CircuitTranspiler__transpilers["QASM2"].remove(Qasm2ToQasm3())
+        CircuitTranspiler.clear_chain_cache()
+
+
+def test_unknown_routing_mode():
+    with pytest.raises(ValueError):
+        transpile_circuit("QASM3", ("QASM2", get_default_qasm2_string(2), 0), routing="fastest")
+
+
+def test_publish_measured_costs():
+    app = set_up_env()
+    with app.app_context():
+        name = Qasm2ToQiskit.get_qualified_name()
+        CircuitTranspiler.record_measured_cost_sample(name, 1.0)
+        transpiler_costs.publish_measured_costs()
+        DB.session.commit()
+
+        CircuitTranspiler.record_measured_cost_sample(name, 2.0)
+        transpiler_costs.publish_measured_costs()
+        DB.session.commit()
+
+        stored = TranspilerCostDataclass.get_by_transpilers([name])
+        assert [(cost.cost, cost.samples) for cost in stored] == [(1.2, 2)]
+        assert CircuitTranspiler.get_measured_costs() == {name: (1.2, 2)}
+
+        response = app.test_client().get("/transpilers/costs/")
+        assert response.status_code == 200
+        costs = {cost["transpiler"]: cost for cost in response.json}
+        assert costs[name]["measuredCost"] == 1.2
+        assert costs[name]["samples"] == 2
+        assert costs[QiskitToQasm3.get_qualified_name()]["measuredCost"] is None
+
+
+def test_job_transpilation_shares_measured_costs():
+    app = set_up_env()
+    app.config["TRANSPILATION_POOL_SIZE"] = 2
+    app.config["TRANSPILER_ROUTING"] = "measured"
+    with app.app_context():
+        job_request_dto = test_utils.get_test_job(ProviderName.IBM)
+        job_request_dto.device_name = IBM_LOCAL_SIMULATOR
+        test_utils.save_deployment_and_add_id_to_job(job_request_dto, [AssemblerLanguage.QASM2])
+
+        return_dto = job_service.create_and_run_job(job_request_dto, False)
+
+        DB.session.expire_all()  # the job was updated by the celery task
+        test_utils.check_if_job_runner_result_correct(JobDataclass.get_by_id_or_404(return_dto.id))
+        stored = TranspilerCostDataclass.get_by_transpilers([Qasm2ToQiskit.get_qualified_name()])
+        assert len(stored) == 1 and stored[0].samples > 0, "costs measured in the pool should be stored"
@@ -0,0 +1,116 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""test the sandbox used by transpilers that execute user code"""
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+import pytest
+from braket.circuits import Circuit
+from pyquil import Program
+from qiskit import QuantumCircuit
+from qrisp import QuantumCircuit as QrispQC
+
+from qunicorn_core.core.transpiler.sandbox import SandboxConfig, SandboxError, TranspilerSandbox
+from qunicorn_core.core.transpiler.unsafe_transpilers import (
+    BraketPythonToBraket,
+    QiskitPythonToQiskit,
+    QrispPythonToQrisp,
+    QuilPythonToQuil,
+)
+
+QISKIT_PYTHON_CIRCUIT = (
+    "circuit = QuantumCircuit(2, 2)\ncircuit.h(0)\ncircuit.cx(0, 1)\ncircuit.measure([0, 1], [0, 1])"
+)
+
+
+def _loop_forever(argument):
+    while True:
+        pass
+
+
+def _sleep(seconds):
+    sleep(seconds)
+    return seconds
+
+
+def test_sandboxed_transpilation():
+    circuit = QiskitPythonToQiskit().transpile_circuit(QISKIT_PYTHON_CIRCUIT)
+
+    assert isinstance(circuit, QuantumCircuit)
+    assert circuit.num_qubits == 2
+    assert [instruction.operation.name for instruction in circuit.data] == ["h", "cx", "measure", "measure"]
+
+
+def test_sandboxed_transpilation_error():
+    with pytest.raises(ValueError):
+        QiskitPythonToQiskit().transpile_circuit("qc = QuantumCircuit(1)")
+
+
+def test_sandbox_time_limit():
+    sandbox = TranspilerSandbox(SandboxConfig(pool_size=1, cpu_time_limit=1, timeout=2, memory_limit=None))
+    try:
+        with pytest.raises(SandboxError):
+            sandbox.run(_loop_forever, None)
+        # the sandbox must still be usable after a call was aborted
+        assert sandbox.run(str, 42) == "42"
+    finally:
+        sandbox.shutdown()
+
+
+def test_sandbox_time_limit_does_not_affect_other_calls():
+    sandbox = TranspilerSandbox(SandboxConfig(pool_size=2, cpu_time_limit=2, timeout=2, memory_limit=None))
+    try:
+        sandbox.start()
+        with ThreadPoolExecutor(2) as executor:
+            runaway = executor.submit(sandbox.run, _loop_forever, None)
+            innocent = executor.submit(sandbox.run, _sleep, 1)
+            assert innocent.result() == 1
+            with pytest.raises(SandboxError):
+                runaway.result()
+    finally:
+        sandbox.shutdown()
+
+
+def test_sandboxed_braket_transpilation():
+    circuit = BraketPythonToBraket().transpile_circuit("Circuit().h(0).cnot(0, 1)")
+
+    assert isinstance(circuit, Circuit)
+    assert circuit == Circuit().h(0).cnot(0, 1)
+
+
+def test_sandboxed_qrisp_transpilation():
+    circuit = QrispPythonToQrisp().transpile_circuit(
+        "circuit = QuantumCircuit(2)\ncircuit.h(0)\ncircuit.cx(0, 1)\ncircuit.measure(circuit.qubits)"
+    )
+
+    assert isinstance(circuit, QrispQC)
+    assert len(circuit.qubits) == 2
+    assert [instruction.op.name for instruction in circuit.data] == ["h", "cx", "measure", "measure"]
+
+
+def test_sandboxed_quil_transpilation():
+    circuit = QuilPythonToQuil().transpile_circuit(
+        "from pyquil.gates import CNOT, H, MEASURE\n"
+        "circuit = Program()\n"
+        "ro = circuit.declare('ro', 'BIT', 2)\n"
+        "circuit += H(0)\n"
+        "circuit += CNOT(0, 1)\n"
+        "circuit += MEASURE(0, ro[0])\n"
+        "circuit += MEASURE(1, ro[1])"
+    )
+
+    assert isinstance(circuit, Program)
+    assert circuit.out() == "DECLARE ro BIT[2]\nH 0\nCNOT 0 1\nMEASURE 0 ro[0]\nMEASURE 1 ro[1]\n"
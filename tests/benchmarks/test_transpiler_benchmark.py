@@ -0,0 +1,54 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""run the transpiler benchmark and compare it with the stored baseline
+
+The results are written to the file given in the environment variable "BENCHMARK_RESULTS" (if set).
+The allowed slowdown can be set with the environment variable "BENCHMARK_THRESHOLD" (defaults to 1.0 = twice as slow).
+"""
+
+import json
+import os
+from pathlib import Path
+
+from tests.benchmarks import transpiler_benchmark
+
+
+def test_find_regressions():
+    baseline = {"edges": {"A": {"normalized": 1.0}}, "chains": {"X->Y": {"normalized": 2.0}}}
+    results = {"edges": {"A": {"normalized": 1.4}, "B": {"normalized": 9.0}}, "chains": {"X->Y": {"normalized": 3.2}}}
+
+    assert transpiler_benchmark.find_regressions(results, baseline, threshold=0.5) == [
+        "chain X->Y is 1.60x slower than the baseline"
+    ]
+    assert transpiler_benchmark.find_regressions(results, baseline, threshold=0.3) == [
+        "edge A is 1.40x slower than the baseline",
+        "chain X->Y is 1.60x slower than the baseline",
+    ]
+
+
+def test_transpiler_benchmark():
+    results = transpiler_benchmark.run_benchmark(repeat=3)
+
+    results_path = os.environ.get("BENCHMARK_RESULTS")
+    if results_path:
+        Path(results_path).write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    assert results["edges"], "at least one transpiler should have been timed"
+    assert all(timing["samples"] > 0 for timing in results["edges"].values())
+
+    baseline = json.loads(transpiler_benchmark.BASELINE_PATH.read_text())
+    threshold = float(os.environ.get("BENCHMARK_THRESHOLD", transpiler_benchmark.DEFAULT_THRESHOLD))
+    regressions = transpiler_benchmark.find_regressions(results, baseline, threshold)
+    assert not regressions, "\n".join(regressions)
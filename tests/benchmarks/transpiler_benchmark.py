@@ -0,0 +1,283 @@
+# Copyright 2024 University of Stuttgart
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark for the registered circuit transpilers.
+
+Times every (safe) transpiler edge and a set of transpiler chains over a generated corpus of circuits.
+All timings are normalized by a calibration workload, so that results of different machines are comparable.
+
+Run the benchmark from the project root:
+
+> python -m tests.benchmarks.transpiler_benchmark --output benchmark-results.json
+
+Compare against the stored baseline (exits with a non-zero exit code on regressions):
+
+> python -m tests.benchmarks.transpiler_benchmark --baseline tests/benchmarks/transpiler_baseline.json
+"""
+
+import json
+import platform
+import random
+import sys
+import warnings
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from qiskit import QuantumCircuit
+from qiskit.circuit.random import random_circuit
+
+from qunicorn_core.core.transpiler import transpile_circuit
+from qunicorn_core.core.transpiler.circuit_transpiler import CircuitTranspiler
+
+RESULTS_VERSION = 1
+
+BASELINE_PATH = Path(__file__).parent / "transpiler_baseline.json"
+
+# allowed slowdown relative to the baseline (1.0 = twice as slow), timings of fast edges are noisy
+DEFAULT_THRESHOLD = 1.0
+
+# (qubits, depth, gate mix) of the generated circuits
+DEFAULT_CORPUS = tuple(
+    (qubits, depth, gate_mix)
+    for qubits in (2, 5, 10)
+    for depth in (5, 20)
+    for gate_mix in ("clifford", "rotation", "random")
+)
+
+# formats the corpus is available in (the circuits are generated in the QISKIT format)
+CORPUS_FORMATS = ("QISKIT", "QASM2", "QASM3", "QPY", "BRAKET", "QRISP")
+
+# transpiler chains (source, target) timed end to end
+CHAINS = (
+    ("QASM2", "QASM3"),
+    ("QASM3", "BRAKET"),
+    ("QASM2", "BRAKET"),
+    ("BRAKET", "QASM2"),
+    ("QRISP", "QISKIT"),
+    ("QPY", "QRISP"),
+)
+
+
+@dataclass
+class CorpusCircuit:
+    name: str
+    qubits: int
+    depth: int
+    gate_mix: str
+    formats: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Timing:
+    source: str
+    target: str
+    seconds: float  # median over all circuits of the fastest repetition
+    normalized: float  # seconds divided by the calibration time
+    samples: int
+    errors: int
+
+
+def generate_circuit(qubits: int, depth: int, gate_mix: str, seed: int) -> QuantumCircuit:
+    """Generate a measured circuit with the given number of qubits, depth and gate mix."""
+    if gate_mix == "random":
+        circuit = random_circuit(qubits, depth, max_operands=2, seed=seed)
+        circuit.measure_all()
+        return circuit
+
+    rng = random.Random(seed)
+    circuit = QuantumCircuit(qubits)
+    for _ in range(depth):
+        for qubit in range(qubits):
+            if qubits > 1 and rng.random() < 0.3:
+                circuit.cx(qubit, rng.choice([q for q in range(qubits) if q != qubit]))
+            elif gate_mix == "clifford":
+                rng.choice((circuit.h, circuit.s, circuit.x, circuit.z))(qubit)
+            else:
+                rng.choice((circuit.rx, circuit.ry, circuit.rz))(rng.uniform(0, 6.28), qubit)
+    circuit.measure_all()
+    return circuit
+
+
+def generate_corpus(corpus: Iterable[Tuple[int, int, str]] = DEFAULT_CORPUS, seed: int = 42) -> List[CorpusCircuit]:
+    """Generate the benchmark corpus and convert every circuit into all corpus formats it can be converted to."""
+    circuits: List[CorpusCircuit] = []
+    for index, (qubits, depth, gate_mix) in enumerate(corpus):
+        circuit = generate_circuit(qubits, depth, gate_mix, seed + index)
+        entry = CorpusCircuit(f"{gate_mix}-q{qubits}-d{depth}", qubits, depth, gate_mix, {"QISKIT": circuit})
+        for circuit_format in CORPUS_FORMATS[1:]:
+            try:
+                entry.formats[circuit_format] = transpile_circuit(circuit_format, ("QISKIT", circuit, 0))
+            except Exception:
+                pass  # not all circuits can be represented in all formats
+        circuits.append(entry)
+    return circuits
+
+
+def _time(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Time a fixed pure python workload used to normalize the benchmark timings."""
+
+    def workload():
+        total = 0
+        for i in range(200_000):
+            total += i * i % 7
+        return total
+
+    return _time(workload, repeat)
+
+
+def _time_over_corpus(
+    source: str,
+    target: str,
+    func: Callable[[Any], Any],
+    corpus: Sequence[CorpusCircuit],
+    repeat: int,
+    calibration: float,
+) -> Optional[Timing]:
+    timings: List[float] = []
+    errors = 0
+    for entry in corpus:
+        if source not in entry.formats:
+            continue
+        circuit = entry.formats[source]
+        try:
+            func(circuit)  # warm up (e.g., lazy imports)
+            timings.append(_time(partial(func, circuit), repeat))
+        except Exception:
+            errors += 1
+    if not timings:
+        return None
+    seconds = median(timings)
+    return Timing(source, target, seconds, seconds / calibration, len(timings), errors)
+
+
+def benchmark_edges(corpus: Sequence[CorpusCircuit], repeat: int, calibration: float) -> Dict[str, Timing]:
+    """Time every registered transpiler that does not execute user code."""
+    results: Dict[str, Timing] = {}
+    for transpiler in sorted(CircuitTranspiler.get_all_transpilers()):
+        if transpiler.unsafe:
+            continue
+        timing = _time_over_corpus(
+            transpiler.source, transpiler.target, transpiler.transpile_circuit, corpus, repeat, calibration
+        )
+        if timing is not None:
+            results[transpiler.qualified_name.rsplit(".", 1)[-1]] = timing
+    return results
+
+
+def benchmark_chains(
+    corpus: Sequence[CorpusCircuit], repeat: int, calibration: float, chains: Iterable[Tuple[str, str]] = CHAINS
+) -> Dict[str, Timing]:
+    """Time complete transpilations from a source format to a target format."""
+    results: Dict[str, Timing] = {}
+    for source, target in chains:
+
+        def transpile(circuit, source=source, target=target):
+            return transpile_circuit(target, (source, circuit, 0))
+
+        timing = _time_over_corpus(source, target, transpile, corpus, repeat, calibration)
+        if timing is not None:
+            results[f"{source}->{target}"] = timing
+    return results
+
+
+def run_benchmark(
+    corpus: Iterable[Tuple[int, int, str]] = DEFAULT_CORPUS, repeat: int = 5, seed: int = 42
+) -> Dict[str, Any]:
+    """Run the complete benchmark and return the machine readable results."""
+    with warnings.catch_warnings():
+        # recording warnings (e.g., deprecation warnings of the SDKs) would distort the timings
+        warnings.simplefilter("ignore")
+        calibration = calibrate()
+        circuits = generate_corpus(corpus, seed)
+        edges = benchmark_edges(circuits, repeat, calibration)
+        chains = benchmark_chains(circuits, repeat, calibration)
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "calibration_seconds": calibration,
+        "corpus": [{"name": c.name, "formats": sorted(c.formats)} for c in circuits],
+        "edges": {name: asdict(timing) for name, timing in edges.items()},
+        "chains": {name: asdict(timing) for name, timing in chains.items()},
+    }
+
+
+def find_regressions(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """Compare normalized timings with the baseline.
+
+    Returns:
+        List[str]: a description of every edge or chain that is slower than the baseline by more than the threshold
+    """
+    regressions: List[str] = []
+    for kind in ("edges", "chains"):
+        for name, timing in results.get(kind, {}).items():
+            reference = baseline.get(kind, {}).get(name)
+            if reference is None or reference["normalized"] <= 0:
+                continue  # new edges have no baseline yet
+            ratio = timing["normalized"] / reference["normalized"]
+            if ratio > 1 + threshold:
+                regressions.append(f"{kind[:-1]} {name} is {ratio:.2f}x slower than the baseline")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(description="Benchmark the registered circuit transpilers.")
+    parser.add_argument("--output", type=Path, help="write the results to this json file")
+    parser.add_argument("--baseline", type=Path, help="compare the results with this baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (1.0 = twice as slow)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per circuit (the fastest is used)")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(repeat=args.repeat)
+    serialized = json.dumps(results, indent=2, sort_keys=True)
+
+    if args.output:
+        args.output.write_text(serialized)
+    else:
+        print(serialized)
+
+    regressions: List[str] = []
+    if args.baseline:
+        regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.threshold)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(serialized + "\n")
+        return 0
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
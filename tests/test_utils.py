@@ -174,7 +174,7 @@ def check_if_job_runner_result_correct(job: JobDataclass):
         program_index = program_id_to_index[result.program_id]
 
         shots: int = job.shots
-        data: dict = result.data
+        data: dict = result.get_data()
 
         if program_index == 0:
             # Check if the first result is distributed correctly: 50% for the qubit zero and 50% for the qubit three
@@ -234,7 +234,7 @@ def check_if_job_runner_result_correct_multiple_gates(job: JobDataclass):
         program_index = program_id_to_index[result.program_id]
 
         shots: int = job.shots
-        result_data: dict = result.data
+        result_data: dict = result.get_data()
         prob_tolerance: float = PROBABILITY_TOLERANCE * 2
         count_tolerance: float = COUNTS_TOLERANCE * 2
 